@@ -1,22 +1,31 @@
 import os
+import re
 import sys
 import yaml
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from src.utils import chrome_browser_options
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from src.utils import (chrome_browser_options, chromedriver_path, copy_chrome_profile, campaign_chrome_profile, chromeProfilePath,
+                       open_shared)
 from src.llm.llm_manager import GPTAnswerer, GPTResumeGenerator
 from src.authenticator import Authenticator
+from src.session_store import SessionStore
 from src.bot_facade import BotFacade
 from src.job_manager import JobManager
+from src.worker_pool import WorkerPool
+from src.search_url import FORM_ONLY_PARAMS, NAMED_PARAMS
+from src.taxonomy import get_taxonomy
 from loguru import logger
 from src.resume_builder.resume import Resume
 from src.resume_builder.manager_facade import FacadeManager
 from src.resume_builder.resume_generator import ResumeGenerator
 from src.resume_builder.style_manager import StyleManager
-from src.app_config import RESUME_MODE
+from src.app_config import (RESUME_MODE, APPLY_WORKERS_NUM, MAX_APPLIES_NUM, MINIMUM_WAIT_TIME_SEC, MAX_PARALLEL_CAMPAIGNS,
+                            SESSION_STORE_MODE, CHROME_DEBUGGER_ADDRESS, SEARCH_URL_MODE)
 
 log_file = "log/app_log.log"
 logger.add(log_file)
@@ -24,6 +33,12 @@ logger.add(log_file)
 # Не выводить stderr
 sys.stderr = open(os.devnull, 'w')
 
+# при запуске нескольких кампаний шаги, требующие участия пользователя
+# (выбор стиля резюме, вход на сайт, проверка настроек поиска), выполняются по очереди
+INTERACTIVE_LOCK = threading.Lock()
+# допустимые имена кампаний (имя кампании используется как имя папки профиля Chrome)
+CAMPAIGN_NAME_RE = re.compile(r"^[\w-]+$")
+
 class ConfigError(Exception):
     pass
 
@@ -129,6 +144,36 @@ class ConfigValidator:
             if key in parameters and not isinstance(parameters[key], expected_type):
                 raise ConfigError(f"Неверный тип ключа '{key}' в конфигурационном файле {config_yaml_path}. Ожидается {expected_type}.")
         
+        # Проверить названия регионов, метро, специализации и отрасли по локальному справочнику hh.ru.
+        # Станции метро ищутся в выбранных регионах, районы задаются только через форму поиска
+        taxonomy = get_taxonomy()
+        areas = []
+        # настройки, из-за которых поиск придется настраивать через форму
+        unresolved_keys = []
+        form_keys = [key for key in FORM_ONLY_PARAMS if parameters.get(key)]
+        for key, (_, kind) in NAMED_PARAMS.items():
+            names = parameters.get(key) or []
+            for name in [names] if isinstance(names, str) else names:
+                match = taxonomy.find(kind, name, areas)
+                if match is None:
+                    unresolved_keys.append(key)
+                    logger.warning(f"Значения '{key} -> {name}' нет в справочнике hh.ru, эта настройка будет задана через форму поиска")
+                elif match.typo:
+                    suggestion = "' или '".join(match.ambiguous) if match.ambiguous else match.name
+                    raise ConfigError(f"Значение '{key} -> {name}' не найдено в справочнике hh.ru, возможно, имелось в виду '{suggestion}' в конфигурационном файле {config_yaml_path}")
+                elif match.ambiguous:
+                    form_keys.append(key)
+                    logger.warning(f"Значению '{key} -> {name}' подходят несколько записей справочника hh.ru: {', '.join(match.ambiguous)}. "
+                                   f"Эта настройка будет задана через форму поиска, для выбора записи укажите ее идентификатор")
+                elif kind == "area":
+                    areas.append(match.id)
+        fallback_keys = list(dict.fromkeys(form_keys + unresolved_keys))
+        if SEARCH_URL_MODE and fallback_keys:
+            hint = (f" Если справочник hh.ru (версия '{taxonomy.version}') неполный, полный справочник можно скачать командой "
+                    f"python -m src.taxonomy --fetch" if unresolved_keys else "")
+            logger.warning(f"Из-за настроек {', '.join(fallback_keys)} поиск будет настроен через форму расширенного поиска, "
+                           f"а не открыт сразу по адресу страницы поиска.{hint}")
+
         # Проверить все поля и значения настройки "Искать только"
         search_only_list = ['vacancy_name', 'company_name', 'vacancy_description']
         for search in search_only_list:
@@ -241,6 +286,43 @@ class ConfigValidator:
 
         return parameters
     
+    def validate_campaigns(self, campaigns_yaml_path: Path, app_data_folder: Path) -> list:
+        """
+        Проверить правильность файла кампаний и файлов настроек поиска и резюме каждой кампании.
+        Пути к файлам кампаний задаются относительно папки данных
+        """
+        parameters = self.load_yaml_file(campaigns_yaml_path)
+        campaigns = parameters.get("campaigns") if isinstance(parameters, dict) else None
+        if not isinstance(campaigns, list) or not campaigns:
+            raise ConfigError(f"Поле 'campaigns' должно содержать непустой список кампаний в конфигурационном файле {campaigns_yaml_path}")
+
+        validated_campaigns = []
+        names, searches = set(), set()
+        for campaign in campaigns:
+            if not isinstance(campaign, dict):
+                raise ConfigError(f"Каждая кампания должна быть словарем в конфигурационном файле {campaigns_yaml_path}")
+            for key in ['name', 'search_config', 'structured_resume']:
+                if not isinstance(campaign.get(key), str) or not campaign[key]:
+                    raise ConfigError(f"Поле 'campaigns -> {key}' должно быть непустой строкой в конфигурационном файле {campaigns_yaml_path}")
+            name = campaign['name']
+            if not CAMPAIGN_NAME_RE.match(name):
+                raise ConfigError(f"Имя кампании '{name}' может содержать только буквы, цифры, '_' и '-' в конфигурационном файле {campaigns_yaml_path}")
+            if name in names:
+                raise ConfigError(f"Имя кампании '{name}' повторяется в конфигурационном файле {campaigns_yaml_path}")
+            names.add(name)
+
+            search_parameters = self.validate_search_config(app_data_folder / campaign['search_config'])
+            resume = self.validate_resume(app_data_folder / campaign['structured_resume'])
+            # журнал откликов ведется по логину и должности, поэтому у кампаний они не должны совпадать
+            search = (search_parameters['login'], search_parameters['job_title'])
+            if search in searches:
+                raise ConfigError(f"У кампании '{name}' такие же логин и должность, как у другой кампании в конфигурационном файле {campaigns_yaml_path}")
+            searches.add(search)
+            validated_campaigns.append({'name': name, 'parameters': search_parameters, 'resume': resume})
+
+        logger.debug(f"Проверка кампаний завершена успешно, кампаний: {len(validated_campaigns)}")
+        return validated_campaigns
+
     @staticmethod
     def validate_secrets(secrets_yaml_path: Path) -> tuple:
         """Проверить наличие секретных ключей для LLM API"""
@@ -273,6 +355,22 @@ class FileManager:
         output_folder = app_data_folder / 'output'
         output_folder.mkdir(exist_ok=True)
         return (app_data_folder / 'secrets.yaml', app_data_folder / 'search_config.yaml', app_data_folder / 'structured_resume.yaml')
+
+    @staticmethod
+    def validate_campaigns_data_folder(app_data_folder: Path) -> tuple:
+        """Проверить наличие файлов, необходимых для запуска кампаний из файла campaigns.yaml"""
+        if not app_data_folder.exists() or not app_data_folder.is_dir():
+            raise FileNotFoundError(f"Папка данных не найдена: {app_data_folder}")
+
+        required_files = ['secrets.yaml', 'campaigns.yaml']
+        missing_files = [file for file in required_files if not (app_data_folder / file).exists()]
+
+        if missing_files:
+            raise FileNotFoundError(f"Отсутствуют файлы в папке данных: {', '.join(missing_files)}")
+
+        output_folder = app_data_folder / 'output'
+        output_folder.mkdir(exist_ok=True)
+        return (app_data_folder / 'secrets.yaml', app_data_folder / 'campaigns.yaml')
     
     @staticmethod
     def file_paths_to_dict(structured_resume_file: Path) -> dict:
@@ -285,28 +383,59 @@ class FileManager:
         return result
 
 
-def init_driver() -> webdriver.Chrome:
-    """Инициализировать Selenium driver"""
+def init_driver(profile_path: str | None = None) -> webdriver.Chrome:
+    """
+    Инициализировать Selenium driver. Если задан CHROME_DEBUGGER_ADDRESS - основной браузер
+    не запускается, а подключаемся к уже запущенному Chrome
+    """
+    if CHROME_DEBUGGER_ADDRESS and profile_path is None:
+        try:
+            return attach_driver(CHROME_DEBUGGER_ADDRESS)
+        except WebDriverException as e:
+            logger.warning(f"Не удалось подключиться к Chrome по адресу {CHROME_DEBUGGER_ADDRESS}: {str(e)}. Запускаем новый браузер")
     try:
-        options = chrome_browser_options()
-        service = ChromeService(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
+        return start_chrome(chrome_browser_options(profile_path))
     except Exception as e:
         raise RuntimeError(f"Failed to initialize browser: {str(e)}")
 
 
-def create_and_run_bot(parameters, llm_api_key, resume):
-    """Запустить бот"""
+def attach_driver(debugger_address: str) -> webdriver.Chrome:
+    """Подключиться к запущенному Chrome (chrome --remote-debugging-port=...), сохраняя его кэш и вход на сайт"""
+    logger.debug(f"Подключаемся к запущенному Chrome по адресу {debugger_address}")
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option("debuggerAddress", debugger_address)
+    return start_chrome(options)
+
+
+def start_chrome(options: webdriver.ChromeOptions) -> webdriver.Chrome:
+    """Запустить chromedriver. Если сохраненный chromedriver не подходит к версии Chrome - загрузить подходящий"""
+    try:
+        return webdriver.Chrome(service=ChromeService(chromedriver_path()), options=options)
+    except SessionNotCreatedException:
+        logger.warning("Сохраненный chromedriver не подходит к версии Chrome, загружаем подходящий")
+        return webdriver.Chrome(service=ChromeService(chromedriver_path(refresh=True)), options=options)
+
+
+def get_session_store() -> SessionStore | None:
+    """Получить общее хранилище сессий hh.ru (None, если сессии не сохраняются)"""
+    if not SESSION_STORE_MODE:
+        return None
+    return open_shared(SessionStore, "data_folder/output/sessions.json")
+
+
+def create_and_run_bot(parameters, llm_api_key, resume, profile_path=None):
+    """Запустить бот. Если путь к профилю Chrome не задан - используется основной профиль"""
     style_manager = StyleManager()
     resume_generator = ResumeGenerator()
         
     resume_object = Resume(resume)
     resume_generator_manager = FacadeManager(llm_api_key, style_manager, resume_generator, resume_object, Path("data_folder/output"))
     if RESUME_MODE:
-        resume_generator_manager.choose_style()      
+        with INTERACTIVE_LOCK:
+            resume_generator_manager.choose_style()      
         
-    driver = init_driver()
-    login_component = Authenticator(driver)
+    driver = init_driver(profile_path)
+    login_component = Authenticator(driver, get_session_store())
     gpt_answerer_component = GPTAnswerer(parameters, llm_api_key)
     gpt_resume_genarator = GPTResumeGenerator(parameters, llm_api_key)
     apply_component = JobManager(driver)
@@ -315,17 +444,79 @@ def create_and_run_bot(parameters, llm_api_key, resume):
     bot.set_gpt_answerer(gpt_answerer_component)
     bot.set_resume_generator(resume_generator_manager, gpt_resume_genarator)
     bot.set_parameters(parameters)
-    bot.start_login()
-    bot.set_search_parameters()
+    with INTERACTIVE_LOCK:
+        bot.start_login()
+        bot.set_search_parameters()
+    if APPLY_WORKERS_NUM > 1:
+        worker_pool = WorkerPool(APPLY_WORKERS_NUM,
+                                 lambda worker_id: init_worker_driver(worker_id, parameters, profile_path or chromeProfilePath),
+                                 lambda worker: setup_worker(worker, parameters, llm_api_key, resume, resume_object, resume_generator_manager),
+                                 MAX_APPLIES_NUM, MINIMUM_WAIT_TIME_SEC)
+        apply_component.set_worker_pool(worker_pool)
     bot.start_apply()
 
 
+def init_worker_driver(worker_id: int, parameters: dict, profile_path: str) -> webdriver.Chrome:
+    """Запустить дополнительный браузер с копией профиля Chrome и войти в нем на сайт"""
+    driver = init_driver(copy_chrome_profile(worker_id, profile_path))
+    # сессия основного браузера восстанавливается в дополнительном без повторного входа
+    login_component = Authenticator(driver, get_session_store())
+    login_component.set_parameters(parameters)
+    login_component.start()
+    return driver
+
+
+def setup_worker(worker: JobManager, parameters: dict, llm_api_key: str, resume: dict, resume_object: Resume,
+                 main_resume_generator_manager: FacadeManager) -> None:
+    """
+    Задать LLM и генератор резюме для JobManager дополнительного браузера.
+    У каждого браузера они свои, так как хранят информацию о текущей вакансии
+    """
+    gpt_answerer_component = GPTAnswerer(parameters, llm_api_key)
+    gpt_answerer_component.set_resume(resume)
+    worker.set_gpt_answerer(gpt_answerer_component)
+    gpt_resume_genarator = GPTResumeGenerator(parameters, llm_api_key)
+    gpt_resume_genarator.set_resume(resume)
+    resume_generator_manager = FacadeManager(llm_api_key, main_resume_generator_manager.style_manager, ResumeGenerator(),
+                                             resume_object, Path("data_folder/output"))
+    # стиль резюме уже выбран в основном браузере
+    resume_generator_manager.selected_style = main_resume_generator_manager.selected_style
+    worker.set_resume_generator_manager(resume_generator_manager, gpt_resume_genarator)
+
+
+def run_campaigns(campaigns: list, llm_api_key: str) -> None:
+    """
+    Запустить несколько кампаний одновременно, каждую в своем браузере со своим профилем Chrome.
+    Клиент LLM API, кэш ответов LLM, журнал откликов и готовые ответы у всех кампаний общие
+    """
+    logger.info(f"Запускаем кампании: {', '.join(campaign['name'] for campaign in campaigns)}")
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CAMPAIGNS, thread_name_prefix="campaign") as executor:
+        futures = {executor.submit(create_and_run_bot, campaign['parameters'], llm_api_key, campaign['resume'],
+                                   campaign_chrome_profile(campaign['name'])): campaign['name']
+                   for campaign in campaigns}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                logger.info(f"Кампания {futures[future]} завершена")
+            except Exception:
+                tb_str = traceback.format_exc()
+                logger.error(f"Ошибка в кампании {futures[future]}: {tb_str}")
+
+
 def main():
     try:
         data_folder = Path("data_folder")
+        config_validator = ConfigValidator()
+        # если в папке данных есть файл кампаний - запускаем все кампании из него
+        if (data_folder / 'campaigns.yaml').exists():
+            secrets_file, campaigns_file = FileManager.validate_campaigns_data_folder(data_folder)
+            campaigns = config_validator.validate_campaigns(campaigns_file, data_folder)
+            llm_api_key = config_validator.validate_secrets(secrets_file)
+            run_campaigns(campaigns, llm_api_key)
+            return
+
         secrets_file, config_file, structured_resume_file = FileManager.validate_data_folder(data_folder)
         
-        config_validator = ConfigValidator()
         parameters = config_validator.validate_search_config(config_file)
         llm_api_key = config_validator.validate_secrets(secrets_file)
         resume = config_validator.validate_resume(structured_resume_file)
@@ -0,0 +1,110 @@
+"""
+Хранилище готовых ответов на текстовые вопросы работодателей.
+
+Ответы хранятся в словаре по очищенному тексту вопроса отдельно для каждой пары
+(логин, резюме), поэтому поиск ответа не зависит от размера базы ответов.
+Новые ответы дописываются в конец JSONL файла, без перезаписи всего файла.
+Ответы из старого файла answers.json переносятся однократно для каждой пары (логин, резюме):
+после переноса в JSONL файл дописывается отметка об импорте.
+"""
+
+import os
+import json
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from src.utils import sanitize_text
+
+
+class AnswerStore:
+    """Класс для хранения и поиска готовых ответов на текстовые вопросы"""
+    def __init__(self, store_path: str):
+        self.store_path = store_path
+        self._lock = threading.Lock()
+        self._answers: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # (логин, резюме, имя файла), для которых уже импортирован старый файл с ответами
+        self._imported: Set[Tuple[str, str, str]] = set()
+        self._load()
+
+    def __len__(self) -> int:
+        return sum(len(answers) for answers in self._answers.values())
+
+    def _load(self) -> None:
+        """Загрузить все сохраненные ответы из JSONL файла"""
+        if not os.path.isfile(self.store_path):
+            logger.debug(f"Файл с ответами {self.store_path} не найден, начинаем с пустого хранилища")
+            return
+        with open(self.store_path, "r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    key = (record["login"], record["job_title"])
+                    if "imported_from" in record:
+                        self._imported.add((*key, record["imported_from"]))
+                        continue
+                    self._answers.setdefault(key, {})[sanitize_text(record["question"])] = record["answer"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(f"Пропускаем поврежденную строку {line_num} в файле {self.store_path}")
+        logger.debug(f"Загружено {len(self)} готовых ответов из файла {self.store_path}")
+
+    def items(self) -> List[Tuple[str, str, str, str]]:
+        """Получить все ответы в виде списка (логин, резюме, очищенный вопрос, ответ)"""
+        return [(login, job_title, question, answer)
+                for (login, job_title), answers in self._answers.items()
+                for question, answer in answers.items()]
+
+    def get(self, login: str, job_title: str, question: str) -> Optional[str]:
+        """Найти готовый ответ на вопрос для заданного логина и резюме"""
+        return self._answers.get((login, job_title), {}).get(sanitize_text(question))
+
+    def add(self, login: str, job_title: str, question: str, answer: str) -> None:
+        """Сохранить новый ответ и дописать его в конец файла"""
+        self.import_answers(login, job_title, [{"question": question, "answer": answer}])
+
+    def import_answers(self, login: str, job_title: str, answers: List[Dict[str, str]]) -> int:
+        """
+        Добавить список ответов формата [{'question': ..., 'answer': ...}, ...]
+        (например, из файла answers.json старого формата). Возвращает число добавленных ответов.
+        """
+        if not answers:
+            return 0
+        with self._lock:
+            self._append(login, job_title, answers)
+        return len(answers)
+
+    def import_file(self, login: str, job_title: str, filename: str,
+                    answers: List[Dict[str, str]]) -> List[Tuple[str, str, str, str]]:
+        """
+        Однократно для пары (логин, резюме) импортировать ответы из старого файла filename.
+        Вопросы, на которые уже есть ответ, не перезаписываются.
+        Возвращает добавленные ответы в виде списка (логин, резюме, очищенный вопрос, ответ)
+        """
+        with self._lock:
+            if (login, job_title, filename) in self._imported:
+                return []
+            namespace = self._answers.get((login, job_title), {})
+            new_answers = [a for a in answers if sanitize_text(a["question"]) not in namespace]
+            self._append(login, job_title, new_answers, imported_from=filename)
+        if new_answers:
+            logger.info(f"Импортировано {len(new_answers)} ответов из файла {filename} для резюме {job_title}")
+        return [(login, job_title, sanitize_text(a["question"]), a["answer"]) for a in new_answers]
+
+    def _append(self, login: str, job_title: str, answers: List[Dict[str, str]], imported_from: str | None = None) -> None:
+        """Дописать ответы (и отметку об импорте) в конец файла. Вызывается под блокировкой"""
+        records = [{"login": login, "job_title": job_title, "question": a["question"], "answer": a["answer"]}
+                   for a in answers]
+        if imported_from is not None:
+            records.append({"login": login, "job_title": job_title, "imported_from": imported_from})
+        os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+        with open(self.store_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        namespace = self._answers.setdefault((login, job_title), {})
+        for a in answers:
+            namespace[sanitize_text(a["question"])] = a["answer"]
+        if imported_from is not None:
+            self._imported.add((login, job_title, imported_from))
@@ -16,7 +16,7 @@ RESUME_MODE = True
 """
 Этот режим нужен для проверки качества генерации сопроводительных писем.
 Если режим активирован - не откликаемся на вакансии, а только сохраняем сгенерированные
-сопроводительные письма в файл data_folder/output/llm_api_calls.json
+сопроводительные письма в файл data_folder/output/llm_api_calls.jsonl
 """
 COVER_LETTER_MODE = False
 
@@ -33,6 +33,42 @@ FIXED_COVER_LETTER = False
 """
 JOB_IS_INTERESTING_THRESH = 7
 
+"""
+Пороги локальной оценки сходства вакансии с резюме (от 0 до 1), которая выполняется до обращения к LLM.
+Вакансии с оценкой ниже JOB_PREFILTER_REJECT_THRESH отклоняются без LLM, а с оценкой не ниже
+JOB_PREFILTER_ACCEPT_THRESH принимаются без LLM. None - не использовать соответствующий порог.
+Локальная оценка пишется в лог рядом со степенью 'интересности' от LLM, по ней можно подобрать пороги.
+По умолчанию пороги не заданы: вакансия с подходящим стеком, упомянутым вскользь, может получить
+низкую оценку, поэтому задавайте пороги только после проверки оценок на своих вакансиях
+"""
+JOB_PREFILTER_REJECT_THRESH = None
+JOB_PREFILTER_ACCEPT_THRESH = None
+
+"""
+Сколько вакансий оценивать в LLM за один запрос. Резюме, навыки и интересы
+передаются один раз на весь пакет, что сильно экономит входные токены. 1 - оценивать по одной
+"""
+JOB_SCORING_BATCH_SIZE = 5
+
+"""
+Тема (раздел резюме) текстового вопроса сначала определяется локально: по ключевым словам
+или классификатором, обученным на ранее сделанных запросах к LLM. Если уверенность
+классификатора (от 0 до 1) ниже этого порога - тема определяется с помощью LLM.
+None - всегда определять тему вопроса с помощью LLM
+"""
+QUESTION_CLASSIFIER_THRESH = 0.95
+
+"""
+Если для текстового вопроса не нашлось готового ответа с точно таким же текстом - ищем ответ
+на самый похожий из ранее заданных вопросов. Если сходство вопросов (от 0 до 1) не ниже этого порога - 
+используем готовый ответ вместо вызова LLM. Слишком низкий порог может привести к тому, 
+что на разные вопросы (например, про опыт в Python и опыт в Java) будет дан один и тот же ответ:
+такие вопросы отличаются несколькими буквами и получают сходство 0.9-0.95. Поэтому вопросы,
+в которых различаются названия технологий или числа, похожими не считаются при любом пороге.
+Чтобы отключить поиск похожих вопросов, установите значение None.
+"""
+SEMANTIC_CACHE_THRESH = 0.97
+
 """
 Уровень логирования
 Возможные значения:
@@ -51,6 +87,110 @@ MAX_APPLIES_NUM = 200
 # Минимальное время, затрачиваемое на один отклик на вакансию
 MINIMUM_WAIT_TIME_SEC = 10
 
+"""
+Пауза после каждого действия на странице (клик, ввод текста, открытие вакансии) для имитации
+пользовательского поведения: случайное время от первого до второго числа в секундах.
+Загрузка страницы после действия дожидается отдельно и входит в паузу. (0, 0) - не делать пауз,
+только дожидаться загрузки страницы
+"""
+HUMAN_PACING_SEC = (1, 2)
+
+# Пауза при переходе на следующую страницу результатов поиска, от первого до второго числа в секундах
+SEARCH_PAGE_PACING_SEC = (5, 10)
+
+"""
+Если True - сначала обходим все страницы результатов поиска по ссылкам и складываем найденные вакансии
+в очередь (data_folder/output/vacancy_queue.db), а затем откликаемся на вакансии из очереди.
+Обработанные вакансии отмечаются в очереди, поэтому после перезапуска отклики продолжаются с того же места.
+Если False - откликаемся на вакансии прямо со страниц поиска, переключая страницы кнопками
+"""
+SERP_HARVEST_MODE = False
+
+"""
+Открывать результаты поиска сразу по адресу, собранному из настроек search_config.yaml,
+вместо заполнения формы расширенного поиска. Если какую-то настройку (например, регион)
+не удалось перевести в параметр адреса - форма заполняется, как раньше
+"""
+SEARCH_URL_MODE = True
+
+# Справочник hh.ru (регионы, специализации, отрасли, метро), собранный из выгрузок API hh.ru командой
+# python -m src.taxonomy <файлы выгрузки>. Если файла нет - используется справочник src/hh_taxonomy.json
+TAXONOMY_PATH = "data_folder/hh_taxonomy.json"
+
+"""
+Число браузеров, в которых параллельно рассылаются отклики. Если больше 1 - сначала все страницы
+результатов поиска собираются в очередь вакансий (как при SERP_HARVEST_MODE = True), затем
+дополнительные браузеры запускаются с копиями профиля Chrome (папка chrome_profile_workers)
+и берут вакансии из общей очереди. MAX_APPLIES_NUM и MINIMUM_WAIT_TIME_SEC (минимальный интервал
+между откликами с одного аккаунта) соблюдаются для всех браузеров вместе
+"""
+APPLY_WORKERS_NUM = 1
+
+"""
+Адрес уже запущенного Chrome для подключения вместо запуска нового браузера, например "127.0.0.1:9222".
+Chrome запускается заранее командой chrome --remote-debugging-port=9222 --user-data-dir=<папка chrome_profile>
+и остается открытым между запусками приложения, сохраняя кэш и вход на сайт. None - запускать новый браузер
+"""
+CHROME_DEBUGGER_ADDRESS = None
+
+# Путь к chromedriver, который подходит к установленному Chrome. None - chromedriver загружается
+# через webdriver_manager при первом запуске, а найденный путь используется при следующих запусках без обращения к сети
+CHROMEDRIVER_PATH = None
+
+"""
+Сохранять cookies и localStorage hh.ru после входа на сайт (data_folder/output/sessions.json)
+и восстанавливать их при запуске, в том числе в дополнительных браузерах и профилях кампаний с тем же логином.
+Вход проверяется одним легким запросом, без загрузки главной страницы
+"""
+SESSION_STORE_MODE = True
+
+"""
+Сколько кампаний из файла data_folder/campaigns.yaml запускать одновременно.
+Каждая кампания работает в своем браузере со своим профилем Chrome (папка chrome_profile_campaigns)
+"""
+MAX_PARALLEL_CAMPAIGNS = 4
+
+"""
+Создание резюме при RESUME_MODE = True идет в фоне, пока браузер переходит к следующим вакансиям.
+RESUME_WORKERS_NUM - сколько резюме создавать одновременно,
+RESUME_QUEUE_MAX_PENDING - сколько резюме может ждать в очереди (если очередь заполнена - браузер ждет),
+RESUME_MAX_ATTEMPTS - сколько раз пытаться создать резюме при временных ошибках (превышение лимита запросов к LLM, таймаут)
+"""
+RESUME_WORKERS_NUM = 2
+RESUME_QUEUE_MAX_PENDING = 10
+RESUME_MAX_ATTEMPTS = 3
+
+"""
+Сколько браузеров без окна держать запущенными для печати резюме в PDF (при RESUME_MODE = True).
+Браузеры запускаются при первом резюме и используются повторно, несколько резюме
+(например, в разных кампаниях) печатаются одновременно в разных браузерах
+"""
+PDF_RENDERER_BROWSERS_NUM = 1
+
+"""
+Способ создания PDF резюме:
+'chrome' - HTML резюме печатается в браузере без окна (точно повторяет выбранный стиль),
+'reportlab' - PDF строится на Python без браузера (быстрее, оформление стиля повторяется приближенно)
+"""
+PDF_BACKEND = "chrome"
+
+# Путь к TrueType шрифту с кириллицей для PDF_BACKEND = 'reportlab'.
+# None - искать DejaVu Sans, Liberation Sans или Arial среди системных шрифтов
+PDF_FONT_PATH = None
+
+"""
+Способ сбора информации со страницы вакансии:
+'js' - все поля собираются одним вызовом JavaScript в браузере,
+'html' - HTML страницы загружается из браузера один раз и разбирается локально (lxml),
+'webdriver' - каждое поле запрашивается у браузера отдельно (самый медленный способ).
+Если выбранный способ не сработал - используется 'webdriver'
+"""
+SCRAPING_BACKEND = "js"
+
+# Сколько следующих вакансий открывать и отправлять на оценку в LLM заранее,
+# пока идет отклик на текущую вакансию. 0 - обрабатывать вакансии строго по одной
+PREFETCH_DEPTH = 3
+
 """
 Тип LLM
 Возможные значения:
@@ -70,6 +210,14 @@ LLM_MODEL = "gpt-4o-mini"
 # чем она ниже, тем строже модель следует промпту и меньше выдумывает
 TEMPERATURE = 0.4
 
+# Максимальное число ответов LLM, хранящихся в кэше (data_folder/output/llm_cache.db).
+# Если такой же запрос уже отправлялся в LLM - ответ берется из кэша. 0 - не использовать кэш
+LLM_CACHE_MAX_ENTRIES = 10000
+
+# Если True - сопроводительные письма тоже берутся из кэша ответов LLM,
+# иначе для каждой вакансии сопроводительное письмо пишется заново
+LLM_CACHE_COVER_LETTER = False
+
 # Если True - подавать в каждую компанию не более чем одну вакансию
 APPLY_ONCE_AT_COMPANY = True
 
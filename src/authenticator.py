@@ -2,18 +2,41 @@ from typing import Dict, Any
 
 import time
 
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, TimeoutException, WebDriverException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from loguru import logger
 
 
+# легкая страница hh.ru (без отрисовки главной страницы), с которой проверяется вход и доступен localStorage сайта
+SESSION_CHECK_URL = "https://hh.ru/robots.txt"
+# проверка входа одним запросом: страница резюме без входа перенаправляет на страницу входа.
+# Возвращает true (страница открылась), false (перенаправление на вход) или null, если проверить не удалось:
+# ошибки сервера, ограничение числа запросов и защита от ботов не означают, что сессия недействительна
+SESSION_CHECK_JS = """
+const done = arguments[arguments.length - 1];
+fetch('/applicant/resumes', {credentials: 'include', redirect: 'manual'})
+    .then((response) => done(response.type === 'opaqueredirect' ? false : (response.ok ? true : null)),
+          () => done(null));
+"""
+GET_LOCAL_STORAGE_JS = "return Object.assign({}, window.localStorage);"
+SET_LOCAL_STORAGE_JS = """
+for (const [key, value] of Object.entries(arguments[0])) {
+    window.localStorage.setItem(key, value);
+}
+"""
+# поля cookie, которые принимает Network.setCookies
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
 class Authenticator:
     """Класс для входа и получения данных для входа на сайт"""
-    def __init__(self, driver=None):
+    def __init__(self, driver=None, session_store=None):
         self.driver = driver
         self.login = None
+        # хранилище cookies и localStorage после входа на сайт (None - не сохранять сессию)
+        self.session_store = session_store
         logger.debug(f"Аутентификатор проинициализирован драйвером: {driver}")
 
     def set_parameters(self, parameters: Dict[str, Any]) -> None:
@@ -22,12 +45,80 @@ class Authenticator:
     
     def start(self) -> bool:
         logger.info("Запускаем Chrome для захода на сайт.")
+        if self.check_session() is True:
+            logger.info("Пользователь уже вошел на сайт, пропускаем процесс входа.")
+            self.save_session()
+            return True
+        if self.restore_session():
+            logger.info("Сохраненная сессия восстановлена, пропускаем процесс входа.")
+            return True
         if self.is_logged_in():
             logger.info("Пользователь уже вошел на сайт, пропускаем процесс входа.")
+            self.save_session()
             return True
         else:
             logger.info("Пользователь не вошел на сайт. Запускаем процесс входа.")
-            return self.handle_login()
+            logged_in = self.handle_login()
+            if logged_in:
+                self.save_session()
+            return logged_in
+
+    def check_session(self) -> bool | None:
+        """
+        Быстрая проверка того, что пользователь вошел на сайт, без загрузки главной страницы.
+        Возвращает None, если проверить не удалось
+        """
+        try:
+            self.driver.get(SESSION_CHECK_URL)
+            logged_in = self.driver.execute_async_script(SESSION_CHECK_JS)
+        except WebDriverException as e:
+            logger.warning(f"Не удалось быстро проверить вход на сайт: {str(e)}")
+            return None
+        return logged_in if isinstance(logged_in, bool) else None
+
+    def restore_session(self) -> bool:
+        """Восстановить сохраненную сессию в браузере. Возвращает True, если после этого пользователь вошел на сайт"""
+        if self.session_store is None:
+            return False
+        session = self.session_store.get(self.login)
+        if session is None:
+            return False
+        logger.debug(f"Восстанавливаем сохраненную сессию для {self.login}")
+        try:
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": session["cookies"]})
+            self.driver.get(SESSION_CHECK_URL)
+            self.driver.execute_script(SET_LOCAL_STORAGE_JS, session["local_storage"])
+        except WebDriverException as e:
+            logger.warning(f"Не удалось восстановить сессию: {str(e)}")
+            return False
+        logged_in = self.check_session()
+        if logged_in is True:
+            return True
+        if logged_in is False:
+            logger.info("Сохраненная сессия больше не действует")
+            self.session_store.delete(self.login)
+        else:
+            # сессия могла остаться действительной - не удаляем ее, вход проверяется полной загрузкой страницы
+            logger.debug("Не удалось проверить восстановленную сессию")
+        return False
+
+    def save_session(self) -> None:
+        """Сохранить cookies и localStorage hh.ru после входа на сайт"""
+        if self.session_store is None:
+            return
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+            if not self.driver.current_url.startswith(SESSION_CHECK_URL):
+                self.driver.get(SESSION_CHECK_URL)
+            local_storage = self.driver.execute_script(GET_LOCAL_STORAGE_JS) or {}
+        except WebDriverException as e:
+            logger.warning(f"Не удалось сохранить сессию: {str(e)}")
+            return
+        # у cookies сессии браузера expires = -1, такое значение в Network.setCookies не передается
+        cookies = [{field: cookie[field] for field in COOKIE_FIELDS
+                    if field in cookie and not (field == "expires" and cookie[field] <= 0)}
+                   for cookie in cookies if cookie.get("domain", "").lstrip(".").endswith("hh.ru")]
+        self.session_store.save(self.login, cookies, local_storage)
 
     
     def handle_login(self) -> bool:
@@ -48,8 +139,8 @@ class Authenticator:
         try:
             logger.debug("Ввод данных пользователя...")
             
-            # С каким интервалом пытаться зайти на сайт
-            check_interval = 20  
+            # С каким интервалом проверять, вошел ли пользователь на сайт
+            check_interval = 2
             self.driver.find_element("css selector", '[data-qa="login"]').click()
             
             login_field = ("name", 'login')
@@ -1,35 +1,146 @@
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Callable
 
 import os
 import re
+import copy
 import json
 import random
 import base64
 import time
 import traceback
+from collections import deque
+from functools import partial
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
-from httpx import HTTPStatusError
 from inputimeout import inputimeout, TimeoutOccurred
 
 from selenium import webdriver
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
+from selenium.common.exceptions import (NoSuchElementException, TimeoutException, StaleElementReferenceException,
+                                        WebDriverException)
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
-from src.app_config import MONKEY_MODE, COVER_LETTER_MODE, RESUME_MODE, MINIMUM_WAIT_TIME_SEC, APPLY_ONCE_AT_COMPANY, MAX_APPLIES_NUM
+from src.ledger import ApplicationLedger, LEDGER_RESULTS
+from src.vacancy_queue import VacancyQueue
+from src.resume_queue import ResumeQueue
+from src.page_wait import PageWait
+from src.search_url import SearchUrlError, build_search_url
+from src.taxonomy import get_taxonomy
+from src.answer_store import AnswerStore
+from src.semantic_answer_cache import SemanticAnswerCache
+from src.vacancy_parser import VACANCY_FIELDS, VACANCY_SKILLS_DATA_QA, parse_vacancy_html
+from src.llm.prefetch import LLMPrefetcher
+from src.utils import sanitize_text, open_shared
+from src.app_config import (MONKEY_MODE, COVER_LETTER_MODE, RESUME_MODE, MINIMUM_WAIT_TIME_SEC, APPLY_ONCE_AT_COMPANY, MAX_APPLIES_NUM,
+                            SEMANTIC_CACHE_THRESH, PREFETCH_DEPTH, SCRAPING_BACKEND,
+                            SERP_HARVEST_MODE, SEARCH_URL_MODE, RESUME_WORKERS_NUM, RESUME_QUEUE_MAX_PENDING, RESUME_MAX_ATTEMPTS,
+                            HUMAN_PACING_SEC, SEARCH_PAGE_PACING_SEC)
 from loguru import logger
 
 
+# сбор всех полей вакансии за один вызов WebDriver, текст элементов берется так же, как в WebElement.text
+SCRAPE_VACANCY_JS = """
+const [fields, skillsDataQa] = arguments;
+const getText = (element) => element.innerText.replace(/\\u00a0/g, ' ').trim();
+const job = {};
+for (const [key, dataQas] of fields) {
+    job[key] = null;
+    for (const dataQa of dataQas) {
+        const element = document.querySelector(`[data-qa="${dataQa}"]`);
+        if (element !== null) {
+            job[key] = getText(element);
+            break;
+        }
+    }
+}
+job.skills = Array.from(document.querySelectorAll(`[data-qa="${skillsDataQa}"]`), getText).join(', ');
+return job;
+"""
+
+
+# плавная прокрутка страницы до элемента за заданное время (в мс) с ускорением в начале и замедлением в конце,
+# скрипт завершается, когда элемент оказывается в верхней части экрана.
+# Вместо requestAnimationFrame используется setTimeout, чтобы анимация завершалась и в фоновой вкладке
+SCROLL_SLOW_JS = """
+const [element, duration, done] = arguments;
+const start = window.pageYOffset;
+const target = element.getBoundingClientRect().top + start;
+// как и раньше, не докручиваем последние 30 пикселей
+if (Math.abs(target - start) <= 30) {
+    done(Math.round(start));
+    return;
+}
+const end = target > start ? target - 30 : target + 30;
+const startTime = performance.now();
+const step = () => {
+    const progress = Math.min((performance.now() - startTime) / duration, 1);
+    const eased = progress < 0.5 ? 2 * progress * progress : 1 - Math.pow(-2 * progress + 2, 2) / 2;
+    window.scrollTo(0, start + (end - start) * eased);
+    if (progress < 1) {
+        setTimeout(step, 10);
+    } else {
+        done(Math.round(window.pageYOffset));
+    }
+};
+step();
+"""
+
+
+# чтение карточек всех вакансий на странице поиска за один вызов WebDriver.
+# Вместе с данными карточки возвращается элемент с названием вакансии, по которому можно кликнуть,
+# и признак того, что на вакансию уже был отправлен отклик (плашка "Вы откликнулись")
+SEARCH_CARDS_JS = """
+const respondedRe = /Вы откликнулись|Вас пригласили|Вам отказали/;
+const cards = [];
+for (const titleElement of document.querySelectorAll('[data-qa^="serp-item__title-text"]')) {
+    const link = titleElement.closest('a');
+    const url = link ? link.href : '';
+    const match = url.match(/\\/vacancy\\/(\\d+)/);
+    // карточка вакансии - блок vacancy-serp__vacancy, а если его нет -
+    // ближайший общий предок названия вакансии и названия компании
+    let card = titleElement.closest('[data-qa~="vacancy-serp__vacancy"]');
+    if (card === null) {
+        card = titleElement.parentElement;
+        while (card && !card.querySelector('[data-qa^="vacancy-serp__vacancy-employer"]')) {
+            card = card.parentElement;
+        }
+    }
+    const company = card ? card.querySelector('[data-qa^="vacancy-serp__vacancy-employer"]') : null;
+    const responded = card !== null && (
+        card.querySelector('[data-qa*="vacancy-serp__vacancy_responded"]') !== null
+        || respondedRe.test(card.innerText));
+    cards.push({
+        element: titleElement,
+        vacancy_id: match ? match[1] : '',
+        url: match ? `${location.origin}/vacancy/${match[1]}` : url,
+        title: titleElement.innerText.trim(),
+        company: company ? company.innerText.replace(/\\u00a0/g, ' ').trim() : '',
+        responded: responded,
+    });
+}
+return cards;
+"""
+
+
+# ссылки на резюме соискателя и их названия на странице "Мои резюме"
+RESUME_LINKS_JS = """
+return Array.from(document.querySelectorAll('a[href*="/resume/"]'),
+                  (link) => ({title: link.innerText.trim(), href: link.href}));
+"""
+
+
 class JobManager:
     """Класс для поиска и рассылки откликов работодателям"""
     def __init__(self, driver: webdriver.Chrome):
         logger.debug("Инициализация JobManager")
         self.driver = driver
         self.gpt_answerer = None
-        self.wait = WebDriverWait(driver, 4, poll_frequency=1)
+        self.llm_prefetcher = None
+        self.apply_coordinator = None
+        self.worker_pool = None
+        self.wait = PageWait(driver, 4)
         self.vacancy_num = 0
         self.page_num = 1
         logger.debug("JobManager успешно инициализирован")
@@ -38,6 +149,8 @@ class JobManager:
     def set_parameters(self, parameters: Dict[str, Any]):
         """Установка параметрок поиска"""
         logger.debug("Установка параметров JobManager")
+        # настройки поиска целиком - для сборки адреса страницы поиска
+        self.search_parameters = parameters
         # загрузка обязательных параметров
         self.job_title = parameters['job_title']
         self.login = parameters['login']
@@ -63,19 +176,52 @@ class JobManager:
         # загрузить черный список компаний
         self.job_blacklist = parameters.get('job_blacklist', [])
         self.job_blacklist = [self._sanitize_text(j_b) for j_b in self.job_blacklist]
+        # открыть журнал откликов и однократно перенести в него данные из старых JSON файлов
+        self.ledger = open_shared(ApplicationLedger, self._define_answers_output_file("applications.db"))
+        # очередь вакансий, найденных на страницах поиска
+        self.vacancy_queue = open_shared(VacancyQueue, self._define_answers_output_file("vacancy_queue.db"))
+        for result in LEDGER_RESULTS:
+            filename = f"{result}.json"
+            self.ledger.import_companies(result, filename, self._load_companies_from_json(filename))
         # загрузить компании, в которые были успешно отправлены заявки
-        self.succes_companies = self._load_companies_from_json("success.json")
+        self.succes_companies = self._load_companies_from_ledger("success")
         # загрузить компании, в которые заявки отправлены не были 
-        self.skipped_companies = self._load_companies_from_json("skipped.json")
+        self.skipped_companies = self._load_companies_from_ledger("skipped")
         # загрузить компании, в которые заявки отправлены не были по причине программной ошибки
-        self.failed_companies = self._load_companies_from_json("failed.json")
-        # загрузить список вопросов, на которые уже были даны ответы
-        self.seen_answers = self._load_questions_from_json()
+        self.failed_companies = self._load_companies_from_ledger("failed")
+        # построить индекс компаний и вакансий, на которые уже были отправлены отклики
+        self._build_applied_index()
+        # загрузить готовые ответы на вопросы, при первом запуске с этим логином и резюме перенести их из answers.json
+        self.answer_store = open_shared(AnswerStore, self._define_answers_output_file("answers.jsonl"))
+        imported_answers = self.answer_store.import_file(self.login, self.job_title, "answers.json",
+                                                         self._load_questions_from_json())
+        # загрузить индекс похожих вопросов, при первом запуске заполнить его готовыми ответами
+        self.semantic_answers = None
+        if SEMANTIC_CACHE_THRESH is not None:
+            self.semantic_answers = open_shared(SemanticAnswerCache, self._define_answers_output_file("answers_faiss.vectors"),
+                                                self._define_answers_output_file("answers_faiss.jsonl"),
+                                                SEMANTIC_CACHE_THRESH)
+            if len(self.semantic_answers) == 0:
+                self.semantic_answers.add_many(self.answer_store.items())
+            else:
+                self.semantic_answers.add_many(imported_answers)
         logger.debug("Параметры успешно установлены") 
     
 
     def set_advanced_search_params(self) -> None:
-        """Задать дополнительные параметры поиска в hh.ru"""
+        """
+        Задать дополнительные параметры поиска в hh.ru. Если настройки поиска можно перевести
+        в адрес страницы поиска - сразу открываем результаты поиска, иначе заполняем форму расширенного поиска
+        """
+        if SEARCH_URL_MODE:
+            try:
+                search_url = build_search_url(self.search_parameters, self._find_resume_id(), get_taxonomy().resolve)
+            except SearchUrlError as e:
+                logger.warning(f"{e}. Задаем настройки через форму расширенного поиска")
+            else:
+                logger.debug(f"Открываем результаты поиска: {search_url}")
+                self.driver.get(search_url)
+                return
         self._enter_advanced_search_menu()
         logger.debug("Задаем настройки расширенного поиска")
         keywords_element = ("xpath", "//*[@data-qa='vacancysearch__keywords-input']")
@@ -124,8 +270,58 @@ class JobManager:
         self.gpt_resume_generator = gpt_resume_generator
     
 
+    def set_worker_pool(self, worker_pool: Any) -> None:
+        """Задать пул браузеров для параллельной рассылки откликов"""
+        self.worker_pool = worker_pool
+
+
+    def set_apply_coordinator(self, apply_coordinator: Any) -> None:
+        """
+        Задать общие для нескольких браузеров ограничения
+        на число откликов и темп откликов с одного аккаунта
+        """
+        self.apply_coordinator = apply_coordinator
+
+
+    def create_worker(self, driver: webdriver.Chrome) -> "JobManager":
+        """
+        Создать JobManager для дополнительного браузера. Журнал откликов, очередь вакансий,
+        готовые ответы на вопросы и индекс откликов у него общие с исходным JobManager
+        """
+        worker = copy.copy(self)
+        worker.driver = driver
+        worker.wait = PageWait(driver, 4)
+        worker.gpt_answerer = None
+        worker.llm_prefetcher = None
+        worker.apply_coordinator = None
+        worker.worker_pool = None
+        worker.vacancy_num = 0
+        worker.page_num = 1
+        return worker
+
+
     def start_applying(self) -> None:
         """Разослать отклики всем работодателям на всех страницах"""
+        if self.worker_pool is not None:
+            # собираем вакансии со всех страниц поиска и откликаемся на них в нескольких браузерах
+            self._harvest_search_results()
+            self.worker_pool.run(self)
+        elif SERP_HARVEST_MODE:
+            # сначала собираем вакансии со всех страниц поиска, затем откликаемся на них
+            self._harvest_search_results()
+            self._apply_from_queue()
+        else:
+            self._apply_from_search_pages()
+        logger.debug("Достигнуто максимально допустимое число откликов либо закончились вакансии. Завершаем работу.")
+        if RESUME_MODE:
+            self._get_resume_queue().wait()
+        if self.llm_prefetcher is not None:
+            self.llm_prefetcher.close()
+        self._export_ledger_to_json()
+
+
+    def _apply_from_search_pages(self) -> None:
+        """Разослать отклики, переходя по страницам поиска с помощью кнопок"""
         # продолжаем пока не достигнем максимально допустимого числа откликов
         while self.vacancy_num < MAX_APPLIES_NUM:
             try:
@@ -137,8 +333,8 @@ class JobManager:
                         self._scroll_slow(next_page)
                         self._click_button(next_page)
                         # делаем случайную паузу на каждой странице
-                        logger.debug("Страница обработана, ждем от 5-10 секунд.")
-                        self._pause(5, 10)
+                        logger.debug(f"Страница обработана, ждем от {SEARCH_PAGE_PACING_SEC[0]} до {SEARCH_PAGE_PACING_SEC[1]} секунд.")
+                        self._pause(*SEARCH_PAGE_PACING_SEC)
                     except NoSuchElementException:
                         break
                 self._send_repsonses()
@@ -148,18 +344,21 @@ class JobManager:
                 tb_str = traceback.format_exc()
                 logger.error(f"Неизвестная ошибка: {tb_str}")
                 continue
-        logger.debug("Достигнуто максимально допустимое число откликов либо закончились вакансии. Завершаем работу.")
     
 
-    def apply_job(self, company_name: str, job_title: str, job: dict) -> Tuple[str, str]:
-        """Откликнусться на вакансию"""
+    def apply_job(self, company_name: str, job_title: str, job: dict, cover_letter_text: str | None = None) -> Tuple[str, str]:
+        """
+        Откликнусться на вакансию. Если сопроводительное письмо
+        не было написано заранее - пишем его во время отклика
+        """
         try:
             # найти кнопку отклика
             respnose_buttons = self.driver.find_elements("xpath", f"//*[@data-qa='vacancy-response-link-top']")
             if len(respnose_buttons) == 0:
                 logger.debug(f"Не нашли кнопку отклика, видимо вы уже откликались на вакансию {company_name}")
             else:
-                cover_letter_text = self.gpt_answerer.write_cover_letter()
+                if cover_letter_text is None:
+                    cover_letter_text = self.gpt_answerer.write_cover_letter()
                 self._save_cover_letter(company_name, cover_letter_text)
                 if COVER_LETTER_MODE:
                     # если находимся в режиме отладки - не откликаемся на вакансии,
@@ -197,126 +396,487 @@ class JobManager:
 
 
     def _scroll_slow(self, element: WebElement, time_to_scroll_sec: float = 1.5) -> int:
-        """Медленно скроллить страницу, пока не дойдем до элемента"""
-        current_position = self.driver.execute_script("""return window.pageYOffset;""")
-                            
-        # Get the element's position on the page
-        element_position = element.location['y']
-
-        # определить размер шага, необходимый для того, чтобы
-        # доскроллить до элемента за время time_to_scroll_sec
-        sleep_time = 0.01
-        distance = abs(current_position - element_position)
-        step_num = time_to_scroll_sec // sleep_time + 1
-        step = distance // step_num + 1
-        
-        # медленно скроллим до нужного нам элемента
-        if current_position < element_position:
-            while current_position < element_position - 30:
-                current_position += step
-                self.driver.execute_script(f"window.scrollTo(0, {current_position});")
-                time.sleep(sleep_time)
-        else:
-            while current_position > element_position + 30:
-                current_position -= step
-                self.driver.execute_script(f"window.scrollTo(0, {current_position});")
-                time.sleep(sleep_time) 
-        
-        time.sleep(0.5)
-        return current_position
+        """
+        Медленно скроллить страницу, пока не дойдем до элемента.
+        Анимация выполняется внутри страницы одним асинхронным скриптом
+        """
+        try:
+            current_position = self.driver.execute_async_script(SCROLL_SLOW_JS, element, time_to_scroll_sec * 1000)
+        except WebDriverException as e:
+            # если анимация не удалась - просто прокручиваем страницу до элемента
+            logger.warning(f"Не удалось плавно прокрутить страницу: {str(e)}")
+            current_position = element.location['y']
+            self.driver.execute_script(f"window.scrollTo(0, {current_position});")
+        return int(current_position)
     
 
     def _send_repsonses(self) -> None:
-        """Разослать отклики всем работодателям на странице"""
-        employer_elements = ("xpath", "//*[starts-with(@data-qa, 'serp-item__title-text')]")
-        employers = self.driver.find_elements(*employer_elements)
-        for employer in employers:
-            minimum_job_time = time.time() + MINIMUM_WAIT_TIME_SEC
-            # зайти на страницу к работодателю
-            self._scroll_slow(employer)
-            employer.click()
-            self._pause()
-            window_handles = self.driver.window_handles
-            self.driver.switch_to.window(window_handles[-1])
-            
-            # собрать описание вакансии
-            job = self._scrape_employer_page()
-            company_name = job["company_name"]
-            company_job_title = job["title"]
-            logger.debug(f"Найдена вакансия {company_job_title}")
-            # если вакансия еще не встречалась и компания не в черном списке 
-            # - начать процесс отклика на вакансию
-            if self._is_blacklisted(self._sanitize_text(company_name)):
-                apply_result = "Skip", "Вакансия в черном списке"
-                logger.warning("Вакансия в черном списке, пропускаем")
+        """
+        Разослать отклики всем работодателям на странице.
+        Следующие PREFETCH_DEPTH вакансий открываются в отдельных вкладках заранее
+        и отправляются на оценку в LLM, пока идет отклик на текущую вакансию.
+        Вакансии, которые можно пропустить по карточке на странице поиска, не открываются
+        """
+        cards = self._read_search_cards()
+        if cards:
+            employers = [card["element"] for card in self._filter_search_cards(cards)]
+        else:
+            # если карточки прочитать не удалось - открываем все вакансии на странице
+            employer_elements = ("xpath", "//*[starts-with(@data-qa, 'serp-item__title-text')]")
+            employers = self.driver.find_elements(*employer_elements)
+        search_window = self.driver.window_handles[0]
+        openers = [partial(self._open_from_search_page, employer, search_window) for employer in employers]
+        self._process_vacancies(openers, search_window)
+
+
+    def _process_vacancies(self, openers: List[Callable[[], Any]], search_window: Any,
+                           queued: List[Dict[str, str]] | None = None) -> None:
+        """
+        Откликнуться на вакансии, которые открываются в новых вкладках функциями openers.
+        Если заданы вакансии из очереди queued - отмечать обработанные вакансии в очереди вакансий.
+        Вакансия, которую не удалось открыть или прочитать (например, удаленная), отмечается
+        как ошибочная, и обработка продолжается со следующей вакансии
+        """
+        prefetched = deque()
+        try:
+            next_vacancy = 0
+            while (next_vacancy < len(openers) or prefetched) and not self._apply_limit_reached():
+                # когда половина открытых заранее вакансий обработана - открываем следующие,
+                # чтобы LLM оценила их одним пакетом
+                if len(prefetched) <= PREFETCH_DEPTH // 2:
+                    new_vacancies = []
+                    while next_vacancy < len(openers) and len(prefetched) + len(new_vacancies) <= PREFETCH_DEPTH:
+                        queued_vacancy = queued[next_vacancy] if queued else None
+                        opener = openers[next_vacancy]
+                        next_vacancy += 1
+                        try:
+                            vacancy = self._prefetch_vacancy(opener)
+                        except Exception as e:
+                            opened_windows = [v["window"] for v in list(prefetched) + new_vacancies]
+                            self._skip_unopened_vacancy(e, search_window, opened_windows, queued_vacancy)
+                            continue
+                        vacancy["queue_id"] = queued_vacancy["vacancy_id"] if queued_vacancy else None
+                        new_vacancies.append(vacancy)
+                    self._submit_to_llm(new_vacancies)
+                    prefetched.extend(new_vacancies)
+                    if not prefetched:
+                        # ни одну из оставшихся вакансий не удалось открыть
+                        continue
+                # место под отклик занимается до начала обработки вакансии,
+                # чтобы несколько браузеров вместе не превысили максимальное число откликов
+                if not self._acquire_apply_slot():
+                    break
+                minimum_job_time = time.time() + MINIMUM_WAIT_TIME_SEC
+                vacancy = prefetched.popleft()
+                apply_result = ("Error", "")
+                try:
+                    self.driver.switch_to.window(vacancy["window"])
+                    apply_result = self._process_vacancy(vacancy)
+                except Exception as e:
+                    tb_str = traceback.format_exc()
+                    logger.error(f"Ошибка при обработке вакансии {vacancy['job']['title']}: {tb_str}")
+                    apply_result = ("Error", str(e))
+                finally:
+                    # увеличиваем счетчик вакансий, если отклик был успешен
+                    self._release_apply_slot(apply_result[0] == "Success")
+                self.save_company(vacancy["job"]["company_name"], vacancy["job"]["title"], apply_result)
+                if vacancy["queue_id"] is not None:
+                    self.vacancy_queue.mark_done(self.login, self.job_title, vacancy["queue_id"], apply_result[0])
+                # вернуться обратно на страницу поиска
+                self._close_vacancy_window(search_window)
+                # если страница была обработана быстрее, чем за минимальное время - 
+                # подождать, пока это время не закончится       
+                time_left = int(minimum_job_time - time.time())
+                if time_left > 0 and self.apply_coordinator is not None:
+                    # в нескольких браузерах ждем без запроса ввода: ввод из консоли один на все браузеры,
+                    # а темп откликов с аккаунта соблюдает wait_turn
+                    time.sleep(random.randint(time_left, time_left + 5))
+                elif time_left > 0:
+                    self._sleep((time_left, time_left + 5))
+        finally:
+            # при ошибке закрываем вкладки с вакансиями, до которых не дошла очередь
+            self._close_prefetched(prefetched, search_window)
+
+
+    def _skip_unopened_vacancy(self, error: Exception, search_window: Any, opened_windows: List[Any],
+                               queued_vacancy: Dict[str, str] | None) -> None:
+        """
+        Пропустить вакансию, которую не удалось открыть или прочитать: закрыть ее вкладку
+        и отметить вакансию как ошибочную, чтобы не открывать ее снова
+        """
+        tb_str = traceback.format_exc()
+        logger.error(f"Не удалось открыть вакансию, переходим к следующей: {tb_str}")
+        try:
+            if self.driver.current_window_handle not in [search_window, *opened_windows]:
+                self._close_vacancy_window(search_window)
             else:
-                is_applied, reason = self._is_already_applied_to_job_or_company(self._sanitize_text(company_name), 
-                                                                                self._sanitize_text(company_job_title))
-                if is_applied:
-                    apply_result = "Skip", reason
-                    logger.warning(f"Пропускаем вакансию по причине: {reason}")
-                else:
-                    self.gpt_answerer.set_job(job)
-                    if MONKEY_MODE:
-                        # в 'режиме обезьяны' любая вакансия считается интересной
-                        job_is_interesting = True
-                    else:
-                        # иначе просить LLM оценить, является ли вакансия интересной или нет
-                        job_is_interesting = self.gpt_answerer.job_is_interesting()
-                    # откликнуться на вакансию только если она интересна
-                    if job_is_interesting:
-                        apply_result = self.apply_job(company_name, company_job_title, job)
-                    elif job_is_interesting is None:
-                        apply_result = "Error", "Ошибка при вызове LLM."
-                    else:
-                        apply_result = "Skip", "Вакансия не интересна"
-                        logger.debug("Вакансия не интересна, пропускаем")
-            # увеличиваем счетчик вакансий, если отклик был успешен
-            if apply_result == "Success":
-                self.vacancy_num += 1
-            self.save_company(company_name, company_job_title, apply_result)
-            # вернуться обратно на страницу поиска
+                self.driver.switch_to.window(search_window)
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть вкладку с вакансией: {str(e)}")
+        if queued_vacancy is not None:
+            self.save_company(queued_vacancy["company"], queued_vacancy["title"], ("Error", str(error)),
+                              link=queued_vacancy["url"])
+            self.vacancy_queue.mark_done(self.login, self.job_title, queued_vacancy["vacancy_id"], "Error")
+
+
+    def _close_vacancy_window(self, search_window: Any) -> None:
+        """Закрыть текущую вкладку с вакансией и вернуться на страницу поиска"""
+        try:
             self.driver.close()
             self._pause()
-            self.driver.switch_to.window(window_handles[0])
-            # если страница была обработана быстрее, чем за минимальное время - 
-            # подождать, пока это время не закончится       
-            time_left = int(minimum_job_time - time.time())
-            if time_left > 0:
-                self._sleep((time_left, time_left + 5))
+        except WebDriverException as e:
+            logger.warning(f"Не удалось закрыть вкладку с вакансией: {str(e)}")
+        self.driver.switch_to.window(search_window)
+
+
+    def _apply_limit_reached(self) -> bool:
+        """Проверить, достигнуто ли максимальное число откликов"""
+        if self.apply_coordinator is not None:
+            return self.apply_coordinator.limit_reached()
+        return self.vacancy_num >= MAX_APPLIES_NUM
+
+
+    def _acquire_apply_slot(self) -> bool:
+        """Занять место под отклик. Возвращает False, если достигнуто максимальное число откликов"""
+        if self.apply_coordinator is not None:
+            return self.apply_coordinator.acquire()
+        return self.vacancy_num < MAX_APPLIES_NUM
+
+
+    def _release_apply_slot(self, success: bool) -> None:
+        """Освободить место под отклик после обработки вакансии"""
+        if success:
+            self.vacancy_num += 1
+        if self.apply_coordinator is not None:
+            self.apply_coordinator.release(success)
+
+
+    def _open_from_search_page(self, employer: WebElement, search_window: Any) -> Any:
+        """Открыть вакансию в новой вкладке, кликнув по ней на странице поиска"""
+        self.driver.switch_to.window(search_window)
+        # зайти на страницу к работодателю
+        self._scroll_slow(employer)
+        # порядок вкладок WebDriver не гарантирует, поэтому новая вкладка - та, которой не было до клика
+        old_windows = set(self.driver.window_handles)
+        employer.click()
+        self.wait.until(EC.new_window_is_opened(list(old_windows)), "Вакансия не открылась в новой вкладке")
+        window = next(window for window in self.driver.window_handles if window not in old_windows)
+        self.driver.switch_to.window(window)
+        self._pause()
+        return window
+
+
+    def _open_by_url(self, url: str) -> Any:
+        """Открыть вакансию в новой вкладке по ссылке"""
+        self.driver.switch_to.new_window("tab")
+        self.driver.get(url)
+        self._pause()
+        return self.driver.current_window_handle
+
+
+    def _harvest_search_results(self) -> int:
+        """
+        Обойти все страницы результатов поиска по URL и сложить найденные вакансии
+        в очередь вакансий. Возвращает число новых вакансий
+        """
+        search_url = self.driver.current_url
+        seen_ids = set()
+        added_num = 0
+        page = 0
+        while True:
+            try:
+                self.driver.get(self._get_search_page_url(search_url, page))
+            except WebDriverException as e:
+                logger.error(f"Не удалось открыть страницу поиска {page + 1}: {str(e)}")
+                break
+            cards = self._read_search_cards()
+            new_cards = [card for card in cards if card["vacancy_id"] and card["vacancy_id"] not in seen_ids]
+            # на странице нет вакансий или hh.ru повторно вернул последнюю страницу - вакансии закончились
+            if not new_cards:
+                break
+            seen_ids.update(card["vacancy_id"] for card in new_cards)
+            added_num += self.vacancy_queue.add_many(self.login, self.job_title, self._filter_search_cards(new_cards))
+            logger.debug(f"Страница поиска {page + 1}: найдено вакансий {len(new_cards)}")
+            page += 1
+            self._pause(2, 4)
+        logger.info(f"Найдено вакансий: {len(seen_ids)}, из них новых: {added_num}")
+        return added_num
+
+
+    @staticmethod
+    def _get_search_page_url(search_url: str, page: int) -> str:
+        """Получить ссылку на заданную страницу результатов поиска (нумерация с нуля)"""
+        parts = urlsplit(search_url)
+        query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "page"]
+        query.append(("page", str(page)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+    def _read_search_cards(self) -> List[Dict[str, str]]:
+        """Прочитать карточки всех вакансий на странице поиска одним вызовом JavaScript"""
+        try:
+            cards = self.driver.execute_script(SEARCH_CARDS_JS)
+        except WebDriverException as e:
+            logger.warning(f"Не удалось прочитать карточки вакансий на странице поиска: {str(e)}")
+            return []
+        return cards if isinstance(cards, list) else []
+
+
+    def _filter_search_cards(self, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Отобрать вакансии, которые нужно открыть, по их карточкам на странице поиска.
+        Вакансии из черного списка, вакансии, на которые мы уже откликались,
+        и вакансии с плашкой об отклике пропускаются без загрузки их страниц
+        """
+        to_open = []
+        for card in cards:
+            skip_reason = self._get_card_skip_reason(card)
+            if skip_reason is None:
+                to_open.append(card)
+            else:
+                self.save_company(card["company"], card["title"], ("Skip", skip_reason), link=card["url"])
+        if len(to_open) < len(cards):
+            logger.debug(f"По карточкам на странице поиска пропущено вакансий: {len(cards) - len(to_open)}")
+        return to_open
+
+
+    def _get_card_skip_reason(self, card: Dict[str, Any]) -> str | None:
+        """Проверить по карточке на странице поиска, нужно ли пропустить вакансию"""
+        if card.get("responded"):
+            logger.warning(f"Вы уже откликались на вакансию {card['title']} компании {card['company']}, пропускаем")
+            return "Отклик на вакансию уже был отправлен"
+        return self._get_skip_reason({"company_name": card["company"], "title": card["title"]})
+
+
+    def _apply_from_queue(self, max_attempts: int = 3) -> None:
+        """Разослать отклики на вакансии из очереди вакансий"""
+        search_window = self.driver.window_handles[0]
+        # вакансии, взятые браузерами прерванной параллельной рассылки, но так и не обработанные
+        released_num = self.vacancy_queue.release(self.login, self.job_title)
+        if released_num:
+            logger.debug(f"В очередь вакансий возвращено {released_num} необработанных вакансий")
+        for _ in range(max_attempts):
+            pending = self.vacancy_queue.pending(self.login, self.job_title)
+            if not pending or self._apply_limit_reached():
+                break
+            pending = self._skip_queued_vacancies(pending)
+            if not pending:
+                break
+            logger.info(f"В очереди вакансий {len(pending)} необработанных вакансий")
+            openers = [partial(self._open_by_url, vacancy["url"]) for vacancy in pending]
+            try:
+                self._process_vacancies(openers, search_window, pending)
+            except Exception:
+                # продолжаем с первой необработанной вакансии
+                tb_str = traceback.format_exc()
+                logger.error(f"Неизвестная ошибка: {tb_str}")
+
+
+    def apply_as_worker(self, worker: str, max_errors: int = 3) -> None:
+        """
+        Откликаться на вакансии из общей для нескольких браузеров очереди вакансий,
+        пока очередь не закончится или не будет достигнуто максимальное число откликов
+        """
+        search_window = self.driver.window_handles[0]
+        errors_num = 0
+        while not self._apply_limit_reached() and errors_num < max_errors:
+            claimed = self.vacancy_queue.claim(self.login, self.job_title, worker, PREFETCH_DEPTH + 1)
+            if not claimed:
+                break
+            vacancies = self._skip_queued_vacancies(claimed)
+            openers = [partial(self._open_by_url, vacancy["url"]) for vacancy in vacancies]
+            try:
+                self._process_vacancies(openers, search_window, vacancies)
+                errors_num = 0
+            except Exception:
+                errors_num += 1
+                tb_str = traceback.format_exc()
+                logger.error(f"Неизвестная ошибка в браузере {worker}: {tb_str}")
+            finally:
+                # вакансии, до которых не дошла очередь, возвращаем другим браузерам. Вакансии, которые
+                # браузер пытался открыть или обработать, уже отмечены как обработанные (в том числе с ошибкой)
+                self.vacancy_queue.release(self.login, self.job_title, worker)
+        logger.debug(f"Браузер {worker} завершил работу, отправлено откликов: {self.vacancy_num}")
+
+
+    def _skip_queued_vacancies(self, vacancies: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Отметить в очереди как обработанные вакансии, которые нужно пропустить,
+        и вернуть остальные. Пока вакансия ждала в очереди, мы могли откликнуться
+        на другую вакансию этой компании
+        """
+        to_apply = self._filter_search_cards(vacancies)
+        to_apply_ids = {vacancy["vacancy_id"] for vacancy in to_apply}
+        for vacancy in vacancies:
+            if vacancy["vacancy_id"] not in to_apply_ids:
+                self.vacancy_queue.mark_done(self.login, self.job_title, vacancy["vacancy_id"], "Skip")
+        return to_apply
+
+
+    def _prefetch_vacancy(self, open_vacancy: Callable[[], Any]) -> Dict[str, Any]:
+        """Открыть вакансию в новой вкладке и собрать ее описание"""
+        window = open_vacancy()
+        # собрать описание вакансии
+        job = self._scrape_employer_page()
+        logger.debug(f"Найдена вакансия {job['title']}")
+        return {"window": window, "job": job, "skip_reason": self._get_skip_reason(job), "llm_result": None}
+
+
+    def _submit_to_llm(self, vacancies: List[Dict[str, Any]]) -> None:
+        """Отправить на оценку в LLM все вакансии, на которые можно откликнуться"""
+        vacancies = [vacancy for vacancy in vacancies if vacancy["skip_reason"] is None]
+        if not vacancies:
+            return
+        # в 'режиме обезьяны' любая вакансия считается интересной,
+        # иначе просим LLM оценить, является ли вакансия интересной или нет
+        llm_results = self._get_llm_prefetcher().submit_many([vacancy["job"] for vacancy in vacancies],
+                                                             check_interest=not MONKEY_MODE)
+        for vacancy, llm_result in zip(vacancies, llm_results):
+            vacancy["llm_result"] = llm_result
+
+
+    def _get_skip_reason(self, job: Dict[str, str]) -> str | None:
+        """Проверить, нужно ли пропустить вакансию, не отправляя ее в LLM"""
+        company_name = self._sanitize_text(job["company_name"])
+        if self._is_blacklisted(company_name):
+            logger.warning("Вакансия в черном списке, пропускаем")
+            return "Вакансия в черном списке"
+        is_applied, reason = self._is_already_applied_to_job_or_company(company_name, self._sanitize_text(job["title"]))
+        if is_applied:
+            logger.warning(f"Пропускаем вакансию по причине: {reason}")
+            return reason
+        return None
+
+
+    def _process_vacancy(self, vacancy: Dict[str, Any]) -> Tuple[str, str]:
+        """Дождаться оценки вакансии от LLM и откликнуться на нее, если она интересна"""
+        job = vacancy["job"]
+        # пока вакансия ждала своей очереди, мы могли откликнуться на другую вакансию этой компании
+        skip_reason = vacancy["skip_reason"] or self._get_skip_reason(job)
+        if skip_reason is not None:
+            return "Skip", skip_reason
+        try:
+            job_is_interesting, cover_letter_text = vacancy["llm_result"].result()
+        except Exception:
+            tb_str = traceback.format_exc()
+            logger.error(f"Ошибка при вызове LLM: \nTraceback:\n{tb_str}")
+            job_is_interesting, cover_letter_text = None, None
+        # откликнуться на вакансию только если она интересна
+        if job_is_interesting:
+            if self.apply_coordinator is not None:
+                return self._apply_job_reserved(job, cover_letter_text)
+            self.gpt_answerer.set_job(job)
+            return self.apply_job(job["company_name"], job["title"], job, cover_letter_text)
+        if job_is_interesting is None:
+            return "Error", "Ошибка при вызове LLM."
+        logger.debug("Вакансия не интересна, пропускаем")
+        return "Skip", "Вакансия не интересна"
+
+
+    def _apply_job_reserved(self, job: Dict[str, str], cover_letter_text: str | None) -> Tuple[str, str]:
+        """
+        Откликнуться на вакансию, заняв ее компанию в общем для всех браузеров индексе откликов,
+        чтобы два браузера не откликнулись одновременно на вакансии одной компании
+        """
+        company, title = self._sanitize_text(job["company_name"]), self._sanitize_text(job["title"])
+        if not self.apply_coordinator.reserve(company, title, APPLY_ONCE_AT_COMPANY):
+            logger.warning("На эту вакансию или в эту компанию уже откликается другой браузер, пропускаем")
+            return "Skip", "На эту вакансию или в эту компанию уже откликается другой браузер"
+        apply_result = ("Error", "")
+        try:
+            # с одного аккаунта откликаемся не чаще, чем раз в MINIMUM_WAIT_TIME_SEC во всех браузерах
+            self.apply_coordinator.wait_turn(self.login)
+            self.gpt_answerer.set_job(job)
+            apply_result = self.apply_job(job["company_name"], job["title"], job, cover_letter_text)
+            return apply_result
+        finally:
+            if apply_result[0] != "Success":
+                self.apply_coordinator.unreserve(company, title)
+
+
+    def _close_prefetched(self, prefetched: deque, search_window: Any) -> None:
+        """Закрыть вкладки с необработанными вакансиями и вернуться на страницу поиска"""
+        if not prefetched:
+            return
+        logger.debug(f"Закрываем {len(prefetched)} необработанных вакансий")
+        while prefetched:
+            vacancy = prefetched.popleft()
+            if vacancy["llm_result"] is not None:
+                vacancy["llm_result"].cancel()
+            try:
+                self.driver.switch_to.window(vacancy["window"])
+                self.driver.close()
+            except Exception as e:
+                logger.warning(f"Не удалось закрыть вкладку с вакансией: {str(e)}")
+        self.driver.switch_to.window(search_window)
+
+
+    def _get_llm_prefetcher(self) -> LLMPrefetcher:
+        """Получить обработчик вакансий LLM, создав его при первом вызове"""
+        if self.llm_prefetcher is None or self.llm_prefetcher.gpt_answerer is not self.gpt_answerer:
+            if self.llm_prefetcher is not None:
+                self.llm_prefetcher.close()
+            self.llm_prefetcher = LLMPrefetcher(self.gpt_answerer)
+        return self.llm_prefetcher
 
      
     def _scrape_employer_page(self) -> Dict[str, str]:
         """
         Собрать всю информацию о работодателе со страницы
-        для дальнейшей передачи в LLM
+        для дальнейшей передачи в LLM. В зависимости от SCRAPING_BACKEND все поля собираются
+        одним вызовом JavaScript ('js') или разбором HTML страницы ('html'),
+        если это не удалось - собираем их по одному через WebDriver
         """
-        job = {}
-
-        description_keys = [
-            "title", "salary", "experience", "job_type", "company_name", 
-            "company_address", "company_address", "description",
-            "description", "skills"
-            ]
-        data_qas = [
-            "vacancy-title", "vacancy-salary-compensation-type-net", "vacancy-experience",
-            "vacancy-view-employment-mode", "vacancy-company-name",
-            "vacancy-view-raw-address", "vacancy-view-location", "vacancy-branded", 
-            "vacancy-description", "skills-element"
-            ]
         self.wait.until(EC.visibility_of_element_located(("xpath", "//*[@data-qa='vacancy-title']")))
-        for key, data_qa in zip(description_keys, data_qas):
-            if key == "skills":
-                skill_list = self.driver.find_elements("xpath", f"//*[@data-qa='{data_qa}']")
-                skill_list = [skill.text for skill in skill_list]
-                job["skills"] = ', '.join(skill_list)
-                continue
-            if key in ["company_address", "description"] and job.get(key) is not None:
-                continue
-            try:
-                job[key] = self.driver.find_element("xpath", f"//*[@data-qa='{data_qa}']").text
-            except NoSuchElementException:
-                job[key] = None
+        if SCRAPING_BACKEND == "html":
+            job = self._scrape_employer_page_from_html()
+        elif SCRAPING_BACKEND == "js":
+            job = self._scrape_employer_page_by_script()
+        else:
+            job = None
+        if job is None:
+            return self._scrape_employer_page_by_elements()
+        logger.debug("Информация со страницы работодателя успешно собрана")
+        return job
+
+
+    def _scrape_employer_page_by_script(self) -> Dict[str, str] | None:
+        """Собрать информацию о работодателе со страницы одним вызовом JavaScript"""
+        try:
+            job = self.driver.execute_script(SCRAPE_VACANCY_JS, VACANCY_FIELDS, VACANCY_SKILLS_DATA_QA)
+        except Exception as e:
+            logger.warning(f"Не удалось собрать информацию о вакансии через JavaScript: {str(e)}")
+            return None
+        return job if isinstance(job, dict) else None
+
+
+    def _scrape_employer_page_from_html(self) -> Dict[str, str] | None:
+        """Собрать информацию о работодателе, разобрав HTML страницы без обращений к элементам"""
+        try:
+            job = parse_vacancy_html(self.driver.page_source)
+        except Exception as e:
+            logger.warning(f"Не удалось разобрать HTML страницы вакансии: {str(e)}")
+            return None
+        if job["title"] is None:
+            logger.warning("В HTML страницы вакансии не найдено название вакансии")
+            return None
+        return job
+
+
+    def _scrape_employer_page_by_elements(self) -> Dict[str, str]:
+        """Собрать информацию о работодателе со страницы, запрашивая каждое поле отдельно"""
+        job = {}
+        for key, data_qas in VACANCY_FIELDS:
+            job[key] = None
+            # берем первое найденное поле из списка
+            for data_qa in data_qas:
+                try:
+                    job[key] = self.driver.find_element("xpath", f"//*[@data-qa='{data_qa}']").text
+                    break
+                except NoSuchElementException:
+                    continue
+        skill_list = self.driver.find_elements("xpath", f"//*[@data-qa='{VACANCY_SKILLS_DATA_QA}']")
+        job["skills"] = ', '.join(skill.text for skill in skill_list)
         logger.debug("Информация со страницы работодателя успешно собрана")
         return job
 
@@ -334,28 +894,30 @@ class JobManager:
         return output_file
     
 
-    def save_company(self, company_name: str, company_job_title: str, apply_result: Tuple[str, str]) -> None:
+    def save_company(self, company_name: str, company_job_title: str, apply_result: Tuple[str, str],
+                     link: str | None = None) -> None:
         """
         Определить, в какую категорию сохранять компанию и информацию о ней,
-        а затем сохранить в соответствующий JSON файл
+        а затем сохранить в журнал откликов. Если ссылка на вакансию не задана -
+        берется адрес текущей страницы
         """
         result, reason = apply_result
         
         if result == "Success":
             companies = self.succes_companies
-            filename = "success.json"
+            ledger_result = "success"
         elif result == "Skip":
             companies = self.skipped_companies
-            filename = "skipped.json"
+            ledger_result = "skipped"
         else:
             companies = self.failed_companies
-            filename = "failed.json"
+            ledger_result = "failed"
         
         seen_companies = companies[self.login][self.job_title]
 
         job_info = {
                 "job_title": company_job_title,
-                "link": self.driver.current_url,
+                "link": link or self.driver.current_url,
                 "reason": reason,
                 }
         
@@ -364,35 +926,41 @@ class JobManager:
         else:
             seen_companies[company_name] = [job_info]
 
-        self._save_company_to_json(filename, companies)
+        if ledger_result == "success":
+            self._add_to_applied_index(company_name, company_job_title)
+        self._save_company_to_ledger(ledger_result, company_name, job_info)
     
     
-    def _save_company_to_json(self, filename: str, companies: List[Dict[str, str]]) -> None:
-        """Сохранить уже просмотренные компании и их вакансии в файл"""
-        output_file = self._define_answers_output_file(filename)
-        logger.debug(f"Сохраняем данные о вакансии в JSON")
+    def _save_company_to_ledger(self, ledger_result: str, company_name: str, job_info: Dict[str, str]) -> None:
+        """Сохранить информацию о просмотренной вакансии в журнал откликов"""
+        logger.debug(f"Сохраняем данные о вакансии в журнал откликов")
         try:
-            try:
-                with open(output_file, 'r', encoding="utf-8") as f:
-                    try:
-                        data = json.load(f)
-                        if not isinstance(data, dict):
-                            raise ValueError("Формат файла JSON неверный, ожидаем словарь")
-                    except json.JSONDecodeError:
-                        logger.error("Декодирование JSON файла завершено с ошибкой")
-            except FileNotFoundError:
-                logger.warning("JSON файл не найден, создаем новый словарь")
-            with open(output_file, 'w', encoding="utf-8") as f:
-                json.dump(companies, f, ensure_ascii=False, indent=4)
-            logger.debug("Данные о компании и ее вакансии успешно сохранены в JSON файл")
+            self.ledger.record(ledger_result, self.login, self.job_title, company_name, job_info)
+            logger.debug("Данные о компании и ее вакансии успешно сохранены в журнал откликов")
         except Exception:
             tb_str = traceback.format_exc()
-            logger.error(f"Ошибка при сохранении информации о просмотренных компаниях в JSON файл")
-            raise Exception(f"Ошибка при сохранении информации о просмотренных компаниях в JSON файл: \nTraceback:\n{tb_str}")
+            logger.error(f"Ошибка при сохранении информации о просмотренных компаниях в журнал откликов")
+            raise Exception(f"Ошибка при сохранении информации о просмотренных компаниях в журнал откликов: \nTraceback:\n{tb_str}")
+
+
+    def _load_companies_from_ledger(self, ledger_result: str) -> Dict[str, Dict[str, Dict[str, List[Dict[str, str]]]]]:
+        """Загрузить из журнала откликов уже просмотренные компании и их вакансии"""
+        logger.debug(f"Загружаем компании категории {ledger_result} из журнала откликов")
+        companies = self.ledger.load(ledger_result, self.login, self.job_title)
+        return {self.login: {self.job_title: companies}}
+
+
+    def _export_ledger_to_json(self) -> None:
+        """Выгрузить журнал откликов в JSON файлы старого формата для совместимости"""
+        for ledger_result in LEDGER_RESULTS:
+            try:
+                self.ledger.export_json(ledger_result, self._define_answers_output_file(f"{ledger_result}.json"))
+            except Exception as e:
+                logger.error(f"Ошибка при выгрузке журнала откликов в JSON файл: {str(e)}")
 
  
     def _load_companies_from_json(self, filename: str) -> List[dict]:
-        """Загрузить файл c уже просмотренными компаниями и их вакансиями"""
+        """Загрузить файл старого формата c уже просмотренными компаниями и их вакансиями"""
         output_file = self._define_answers_output_file(filename)
         logger.debug(f"Загружаем компании из JSON-файла: {output_file}")
         try:
@@ -421,22 +989,8 @@ class JobManager:
             raise Exception(f"Ошибка при загрузке информации о просмотренных компаниях в JSON файл: \nTraceback:\n{tb_str}")
     
 
-    def _save_questions_to_json(self, question_data: dict) -> None:
-        """Сохранить вопрос в файл"""
-        output_file = self._define_answers_output_file("answers.json")
-        logger.debug(f"Сохраняем новый вопрос JSON-файл")
-        try:
-            with open(output_file, 'w', encoding="utf-8") as f:
-                json.dump(question_data, f, ensure_ascii=False, indent=4)
-            logger.debug("Новый вопрос успешно сохранен в JSON файл")
-        except Exception:
-            tb_str = traceback.format_exc()
-            logger.error(f"Ошибка при сохранении списка вопросов в JSON файл")
-            raise Exception(f"Ошибка при сохранении списка вопросов в JSON файл: \nTraceback:\n{tb_str}")
-        
-
     def _load_questions_from_json(self) -> List[dict]:
-        """Загрузить файл с уже готовыми ответами на вопросы"""
+        """Загрузить файл старого формата с уже готовыми ответами на вопросы"""
         output_file = self._define_answers_output_file("answers.json")
         logger.debug(f"Загружаем вопросы из JSON-файла: {output_file}")
         try:
@@ -517,11 +1071,13 @@ class JobManager:
 
 
     def _write_and_upload_resume(self, job):
-        """Метод для создания резюме и сохранения его в файл"""
+        """
+        Поставить в очередь создание резюме под вакансию. Резюме создается в фоне,
+        а браузер сразу переходит к следующей вакансии
+        """
         company_name = job["company_name"]
         job_title = job["title"]
         job_link = self.driver.current_url
-        logger.debug("Starting the process of creating and uploading resume.")
         folder_path = f'data_folder/generated_cv/{company_name}'
 
         try:
@@ -535,72 +1091,30 @@ class JobManager:
         # сохраняем ссылку на вакансию в отдельный файл
         with open(folder_path + f"/{job_title}_link.txt", "w") as f:
             f.write(job_link)
-        
-        while True:
-            try:
-                file_path_pdf = os.path.join(folder_path, f"CV_{company_name}_{job_title}.pdf")
-                logger.debug(f"Generated file path for resume: {file_path_pdf}")
-                logger.debug(f"Generating resume for job: {job_title} at {job['company_name']}")
-                resume_pdf_base64 = self.resume_generator_manager.pdf_base64(self.gpt_resume_generator, job)
-                with open(file_path_pdf, "wb") as f:
-                    f.write(base64.b64decode(resume_pdf_base64))
-                logger.debug(f"Resume successfully generated and saved to: {file_path_pdf}")
 
-                break
-            except HTTPStatusError as e:
-                if e.response.status_code == 429:
-
-                    retry_after = e.response.headers.get('retry-after')
-                    retry_after_ms = e.response.headers.get('retry-after-ms')
-
-                    if retry_after:
-                        wait_time = int(retry_after)
-                        logger.warning(f"Rate limit exceeded, waiting {wait_time} seconds before retrying...")
-                    elif retry_after_ms:
-                        wait_time = int(retry_after_ms) / 1000.0
-                        logger.warning(f"Rate limit exceeded, waiting {wait_time} milliseconds before retrying...")
-                    else:
-                        wait_time = 20
-                        logger.warning(f"Rate limit exceeded, waiting {wait_time} seconds before retrying...")
-
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"HTTP error: {e}")
-                    raise
+        file_path_pdf = os.path.join(folder_path, f"CV_{company_name}_{job_title}.pdf")
+        # у каждого резюме в очереди свое краткое описание вакансии, поэтому генератор копируется
+        create_resume = partial(self._write_resume, copy.copy(self.gpt_resume_generator), dict(job), file_path_pdf)
+        job["resume_path"] = os.path.abspath(file_path_pdf)
+        self._get_resume_queue().submit(job_link, file_path_pdf, create_resume, company_name, job_title)
 
-            except Exception as e:
-                logger.error(f"Failed to generate resume: {e}")
-                tb_str = traceback.format_exc()
-                logger.error(f"Traceback: {tb_str}")
-                if "RateLimitError" in str(e):
-                    logger.warning("Rate limit error encountered, retrying...")
-                    time.sleep(20)
-                else:
-                    raise
 
-        file_size = os.path.getsize(file_path_pdf)
+    def _write_resume(self, gpt_resume_generator: Any, job: Dict[str, str], file_path_pdf: str) -> None:
+        """Создать резюме под вакансию и сохранить его в PDF файл"""
+        logger.debug(f"Generating resume for job: {job['title']} at {job['company_name']}")
+        resume_pdf = base64.b64decode(self.resume_generator_manager.pdf_base64(gpt_resume_generator, job))
         max_file_size = 2 * 1024 * 1024  # 2 MB
-        logger.debug(f"Resume file size: {file_size} bytes")
-        if file_size > max_file_size:
-            logger.error(f"Resume file size exceeds 2 MB: {file_size} bytes")
-            raise ValueError("Resume file size exceeds the maximum limit of 2 MB.")
-
-        allowed_extensions = {'.pdf', '.doc', '.docx'}
-        file_extension = os.path.splitext(file_path_pdf)[1].lower()
-        logger.debug(f"Resume file extension: {file_extension}")
-        if file_extension not in allowed_extensions:
-            logger.error(f"Invalid resume file format: {file_extension}")
-            raise ValueError("Resume file format is not allowed. Only PDF, DOC, and DOCX formats are supported.")
+        logger.debug(f"Resume file size: {len(resume_pdf)} bytes")
+        if len(resume_pdf) > max_file_size:
+            raise ValueError(f"Resume file size exceeds the maximum limit of 2 MB: {len(resume_pdf)} bytes")
+        with open(file_path_pdf, "wb") as f:
+            f.write(resume_pdf)
 
-        try:
-            logger.debug(f"Uploading resume from path: {file_path_pdf}")
-            job["resume_path"] = os.path.abspath(file_path_pdf)
-            time.sleep(2)
-            logger.debug(f"Resume created and uploaded successfully: {file_path_pdf}")
-        except Exception as e:
-            tb_str = traceback.format_exc()
-            logger.error(f"Resume upload failed: {tb_str}")
-            raise Exception(f"Upload failed: \nTraceback:\n{tb_str}")
+
+    def _get_resume_queue(self) -> ResumeQueue:
+        """Получить общую для всех браузеров и кампаний очередь создания резюме"""
+        return open_shared(ResumeQueue, self._define_answers_output_file("resume_jobs.db"),
+                           RESUME_WORKERS_NUM, RESUME_QUEUE_MAX_PENDING, RESUME_MAX_ATTEMPTS)
     
 
     def _write_and_send_cover_letter(self, cover_letter_text: str) -> None:
@@ -747,13 +1261,10 @@ class JobManager:
         logger.debug(f"Нашли текстовый вопрос: {question_text}")
 
         # поискать ответ в файле сохраненных предыдущих ответов
-        existing_answer = None
-        sanitized_question = self._sanitize_text(question_text)
-        for answer in self.seen_answers:
-            if self._sanitize_text(answer['question']) == sanitized_question:
-                existing_answer = answer['answer']
-                logger.debug(f"Найден готовый ответ: {existing_answer}")
-                break
+        existing_answer = self.answer_store.get(self.login, self.job_title, question_text)
+        # если точного совпадения нет - поискать ответ на похожий вопрос
+        if existing_answer is None and self.semantic_answers is not None:
+            existing_answer = self.semantic_answers.find(self.login, self.job_title, question_text)
 
         if existing_answer:
             answer = existing_answer
@@ -765,10 +1276,11 @@ class JobManager:
                 logger.warning(output)
                 return False, output
             logger.debug(f"Сгенерирован ответ: {answer}")
-            self.seen_answers.append({'question': question_text, 'answer': answer})
             # сохранить новый ответ в файл
-            self._save_questions_to_json(self.seen_answers)
-            logger.debug("Тестовый вопрос сохранен в JSON.")
+            self.answer_store.add(self.login, self.job_title, question_text, answer)
+            if self.semantic_answers is not None:
+                self.semantic_answers.add(self.login, self.job_title, question_text, answer)
+            logger.debug("Текстовый вопрос сохранен в хранилище ответов.")
 
         time.sleep(1)
         self._enter_text(text_field, answer)
@@ -784,19 +1296,38 @@ class JobManager:
         return False
     
 
+    def _build_applied_index(self) -> None:
+        """
+        Построить индекс очищенных названий компаний и пар (компания, вакансия),
+        в которые уже были успешно отправлены отклики
+        """
+        self.applied_companies = set()
+        self.applied_jobs = set()
+        for company, job_infos in self.succes_companies[self.login][self.job_title].items():
+            for job_info in job_infos:
+                self._add_to_applied_index(company, job_info["job_title"])
+            if not job_infos:
+                self.applied_companies.add(self._sanitize_text(company))
+        logger.debug(f"Индекс откликов построен: {len(self.applied_companies)} компаний, {len(self.applied_jobs)} вакансий")
+
+
+    def _add_to_applied_index(self, company: str, job: str) -> None:
+        """Добавить компанию и вакансию в индекс откликов"""
+        company = self._sanitize_text(company)
+        self.applied_companies.add(company)
+        self.applied_jobs.add((company, self._sanitize_text(job)))
+
+
     def _is_already_applied_to_job_or_company(self, company: str, job: str) -> Tuple[bool, str]:
         """Проверить, откликались ли мы уже на эту вакансию"""
-        my_companies = self.succes_companies[self.login][self.job_title]
-        for comp in my_companies:
-            if company == self._sanitize_text(comp):
-                if APPLY_ONCE_AT_COMPANY:
-                    logger.debug("Компания уже встречалась и задана настройка не подаваться "
-                                 "повторно в ту же компанию, пропускаем")
-                    return True, "Компания уже встречалась и задана настройка не подаваться повторно в ту же компанию"
-                for job_info in my_companies[comp]:
-                    if job == self._sanitize_text(job_info["job_title"]):
-                        logger.debug("Вакансия уже встречалась, пропускаем")
-                        return True, "Вакансия уже встречалась"
+        if company in self.applied_companies:
+            if APPLY_ONCE_AT_COMPANY:
+                logger.debug("Компания уже встречалась и задана настройка не подаваться "
+                             "повторно в ту же компанию, пропускаем")
+                return True, "Компания уже встречалась и задана настройка не подаваться повторно в ту же компанию"
+            if (company, job) in self.applied_jobs:
+                logger.debug("Вакансия уже встречалась, пропускаем")
+                return True, "Вакансия уже встречалась"
         return False, ""
     
 
@@ -806,15 +1337,20 @@ class JobManager:
         element.send_keys(text)
     
 
-    @staticmethod
-    def _pause(low: int = 1, high: int = 2) -> None:
+    def _pause(self, low: float | None = None, high: float | None = None) -> None:
         """
-        Выдержать случайную паузу в диапазоне от 
-        low секунд до high секунд. 
-        Используется для имитации пользовательского поведения.
+        Дождаться, пока страница успокоится после действия, и выдержать случайную паузу
+        в диапазоне от low секунд до high секунд (по умолчанию HUMAN_PACING_SEC).
+        Пауза используется для имитации пользовательского поведения,
+        время ожидания страницы входит в нее.
         """
-        pause = round(random.uniform(low, high), 1)
-        time.sleep(pause)
+        if low is None:
+            low, high = HUMAN_PACING_SEC
+        pause_end = time.monotonic() + random.uniform(low, high)
+        self.wait.settle()
+        time_left = pause_end - time.monotonic()
+        if time_left > 0:
+            time.sleep(time_left)
 
 
     @staticmethod
@@ -849,6 +1385,17 @@ class JobManager:
         element.click()
     
 
+    def _find_resume_id(self) -> str | None:
+        """Найти идентификатор резюме с названием job_title, чтобы искать вакансии для этого резюме"""
+        self.driver.get("https://hh.ru/applicant/resumes")
+        for resume in self.driver.execute_script(RESUME_LINKS_JS) or []:
+            match = re.search(r"/resume/([0-9a-f]+)", resume["href"])
+            if resume["title"] == self.job_title and match:
+                return match.group(1)
+        logger.warning(f"Не смогли найти среди ваших резюме нужное с именем `{self.job_title}`, ищем вакансии без резюме")
+        return None
+
+
     def _enter_advanced_search_menu(self) -> None:
         """Зайти на страницу с резюме, выбрать нужное и перейти через него к поиску вакансий"""
         logger.debug(f"Выбираем нужное резюме с именем `{self.job_title}`")
@@ -878,7 +1425,7 @@ class JobManager:
         for _ in range(10):
             # дождаться пока кнопка станет кликабельной
             try:
-                wait = WebDriverWait(self.driver, 2, poll_frequency=1)
+                wait = PageWait(self.driver, 2)
                 advanced_search_element = ("xpath", "//*[@data-qa='advanced-search']")
                 element = wait.until(EC.element_to_be_clickable(advanced_search_element))
             except (TimeoutException, StaleElementReferenceException):
@@ -1166,7 +1713,6 @@ class JobManager:
 
     def _sanitize_text(self, text: str) -> str:
         """Очистить текст вопроса/ответа"""
-        sanitized_text = text.lower().strip().replace('"', '').replace('\\', '')
-        sanitized_text = re.sub(r'[\x00-\x1F\x7F]', '', sanitized_text).replace('\n', ' ').replace('\r', '').rstrip(',')
+        sanitized_text = sanitize_text(text)
         logger.debug(f"Очищенный текст: {sanitized_text}")
         return sanitized_text
@@ -0,0 +1,97 @@
+"""
+Локальная предварительная оценка вакансий.
+
+Перед тем как отправлять вакансию на оценку в LLM, считаем TF-IDF сходство между
+резюме (навыки, опыт, интересы, желаемая должность, проекты) и вакансией (название, описание, навыки).
+Явно неподходящие вакансии отклоняются без обращения к LLM, а при заданном верхнем пороге
+явно подходящие вакансии принимаются сразу.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+
+# слова (в т.ч. c++, c#, 1c), из которых состоят тексты резюме и вакансии
+TOKEN_RE = re.compile(r"[a-zа-я0-9][a-zа-я0-9+#]*")
+# слова обрезаются до этой длины - грубая замена стемминга для русского языка
+STEM_LEN = 6
+# разделы резюме, по которым оценивается сходство с вакансией
+RESUME_SECTIONS = ("work_preferences", "skills", "interests", "experience_details", "projects")
+# поля вакансии, по которым оценивается сходство с резюме
+JOB_FIELDS = ("title", "skills", "description")
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """Разбить текст на слова и привести их к общей основе"""
+    for word in TOKEN_RE.findall(text.lower().replace("ё", "е")):
+        if len(word) > 1:
+            yield word[:STEM_LEN]
+
+
+def flatten_text(data: Any) -> str:
+    """Собрать все строки из вложенных словарей и списков в один текст"""
+    if isinstance(data, dict):
+        return " ".join(flatten_text(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return " ".join(flatten_text(value) for value in data)
+    return "" if data is None else str(data)
+
+
+def resume_documents(resume: Dict[str, Any]) -> List[str]:
+    """Разбить разделы резюме на отдельные тексты: каждый навык, место работы, проект и т.д."""
+    documents = []
+    for section in RESUME_SECTIONS:
+        data = resume.get(section)
+        items = data.values() if isinstance(data, dict) else data if isinstance(data, (list, tuple)) else [data]
+        documents.extend(text for text in map(flatten_text, items) if text.strip())
+    return documents
+
+
+class JobPrefilter:
+    """
+    Класс для локальной оценки сходства вакансии с резюме.
+    IDF слов считается один раз по частям резюме, поэтому оценка вакансии не зависит от того,
+    какие вакансии и в каком порядке оценивались до нее. Слова, которые встречаются во многих частях
+    резюме (например, основной язык программирования), весят меньше редких навыков
+    """
+    def __init__(self, resume: Dict[str, Any], reject_thresh: Optional[float], accept_thresh: Optional[float]):
+        self.reject_thresh = reject_thresh
+        self.accept_thresh = accept_thresh
+        documents = resume_documents(resume)
+        doc_freq = Counter(word for document in documents for word in set(tokenize(document)))
+        self._idf = {word: math.log((1 + len(documents)) / (1 + freq)) + 1 for word, freq in doc_freq.items()}
+        # IDF слов, которых нет в резюме
+        self._unknown_idf = math.log(1 + len(documents)) + 1
+        resume_tf = Counter(tokenize(" ".join(documents)))
+        self._resume_vec = {word: (1 + math.log(tf)) * self._idf[word] for word, tf in resume_tf.items()}
+        self._resume_norm = math.sqrt(sum(w * w for w in self._resume_vec.values()))
+        logger.debug(f"JobPrefilter инициализирован, слов в резюме: {len(self._resume_vec)}")
+
+    def score(self, job: Dict[str, str]) -> float:
+        """Оценить сходство вакансии с резюме (от 0 до 1)"""
+        job_tf = Counter(tokenize(" ".join(job.get(field) or "" for field in JOB_FIELDS)))
+        job_vec = {word: (1 + math.log(tf)) * self._idf.get(word, self._unknown_idf) for word, tf in job_tf.items()}
+        dot = sum(weight * self._resume_vec[word] for word, weight in job_vec.items() if word in self._resume_vec)
+        norm = self._resume_norm * math.sqrt(sum(w * w for w in job_vec.values()))
+        return dot / norm if norm > 0 else 0.0
+
+    def decide(self, job: Dict[str, str]) -> Tuple[Optional[bool], float]:
+        """
+        Принять решение по вакансии без LLM.
+        Возвращает (False - отклонить, True - принять, None - нужна оценка LLM; локальная оценка)
+        """
+        score = self.score(job)
+        if self.reject_thresh is not None and score < self.reject_thresh:
+            logger.info(f"Локальная оценка схожести вакансии с резюме: {score:.3f} "
+                        f"ниже порога {self.reject_thresh}, вакансия отклонена без обращения к LLM")
+            return False, score
+        if self.accept_thresh is not None and score >= self.accept_thresh:
+            logger.info(f"Локальная оценка схожести вакансии с резюме: {score:.3f} "
+                        f"не ниже порога {self.accept_thresh}, вакансия принята без обращения к LLM")
+            return True, score
+        logger.debug(f"Локальная оценка схожести вакансии с резюме: {score:.3f}, отправляем вакансию на оценку в LLM")
+        return None, score
@@ -0,0 +1,136 @@
+"""
+Журнал откликов на вакансии на базе SQLite.
+
+Заменяет файлы success.json, skipped.json и failed.json: каждая обработанная вакансия
+сохраняется одной вставкой строки в индексированную таблицу, вместо перезаписи всего файла.
+Для совместимости старые JSON файлы импортируются один раз, а данные можно выгрузить обратно в JSON.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+
+# категории журнала, совпадают с именами старых JSON файлов
+LEDGER_RESULTS = ("success", "skipped", "failed")
+
+
+class ApplicationLedger:
+    """Класс для хранения информации о просмотренных вакансиях в базе SQLite"""
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+        logger.debug(f"Журнал откликов открыт: {db_path}")
+
+    def _create_tables(self) -> None:
+        """Создать таблицы и индексы, если их еще нет"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS applications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    result TEXT NOT NULL,
+                    login TEXT NOT NULL,
+                    job_title TEXT NOT NULL,
+                    company TEXT NOT NULL,
+                    vacancy_id TEXT NOT NULL DEFAULT '',
+                    vacancy_title TEXT,
+                    link TEXT,
+                    reason TEXT,
+                    created_at TEXT
+                )""")
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_applications_key
+                ON applications (login, job_title, company, vacancy_id)""")
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_applications_result
+                ON applications (result, login, job_title)""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS imported_files (
+                    filename TEXT PRIMARY KEY,
+                    imported_at TEXT
+                )""")
+
+    @staticmethod
+    def get_vacancy_id(link: Optional[str]) -> str:
+        """Получить id вакансии из ссылки на нее"""
+        match = re.search(r"/vacancy/(\d+)", link or "")
+        return match.group(1) if match else ""
+
+    def record(self, result: str, login: str, job_title: str, company: str, job_info: Dict[str, str]) -> None:
+        """Сохранить информацию об одной обработанной вакансии"""
+        link = job_info.get("link", "")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO applications (result, login, job_title, company, vacancy_id, vacancy_title, link, reason, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result, login, job_title, company, self.get_vacancy_id(link), job_info.get("job_title"),
+                 link, job_info.get("reason"), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+    def load(self, result: str, login: str, job_title: str) -> Dict[str, List[Dict[str, str]]]:
+        """Загрузить компании и их вакансии для заданного логина и должности"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT company, vacancy_title, link, reason FROM applications "
+                "WHERE result = ? AND login = ? AND job_title = ? ORDER BY id",
+                (result, login, job_title)).fetchall()
+        companies = {}
+        for company, vacancy_title, link, reason in rows:
+            companies.setdefault(company, []).append(
+                {"job_title": vacancy_title, "link": link, "reason": reason})
+        return companies
+
+    def import_companies(self, result: str, filename: str, data: Dict) -> int:
+        """
+        Однократно импортировать данные из старого JSON файла формата
+        {логин: {должность: {компания: [информация о вакансии, ...]}}}.
+        Возвращает число импортированных записей.
+        """
+        with self._lock, self._conn:
+            if self._conn.execute("SELECT 1 FROM imported_files WHERE filename = ?", (filename,)).fetchone():
+                return 0
+            rows = []
+            for login, job_titles in data.items():
+                for job_title, companies in job_titles.items():
+                    for company, job_infos in companies.items():
+                        for job_info in job_infos:
+                            link = job_info.get("link", "")
+                            rows.append((result, login, job_title, company, self.get_vacancy_id(link),
+                                         job_info.get("job_title"), link, job_info.get("reason"), None))
+            self._conn.executemany(
+                "INSERT INTO applications (result, login, job_title, company, vacancy_id, vacancy_title, link, reason, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT INTO imported_files (filename, imported_at) VALUES (?, ?)",
+                               (filename, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        if rows:
+            logger.info(f"Импортировано {len(rows)} записей из файла {filename} в журнал откликов")
+        return len(rows)
+
+    def export_json(self, result: str, json_path: str) -> None:
+        """Выгрузить все записи категории в JSON файл старого формата"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT login, job_title, company, vacancy_title, link, reason FROM applications "
+                "WHERE result = ? ORDER BY id", (result,)).fetchall()
+        data = {}
+        for login, job_title, company, vacancy_title, link, reason in rows:
+            companies = data.setdefault(login, {}).setdefault(job_title, {})
+            companies.setdefault(company, []).append(
+                {"job_title": vacancy_title, "link": link, "reason": reason})
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        logger.debug(f"Журнал откликов категории {result} выгружен в файл {json_path}")
+
+    def close(self) -> None:
+        """Закрыть соединение с базой"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,168 @@
+"""
+Лог запросов к LLM в формате JSON Lines (одна запись - одна строка).
+
+Все записи попадают в очередь и дописываются в конец файла одним фоновым потоком,
+поэтому стоимость записи не зависит от размера лога, а параллельные вызовы LLM
+(например, при генерации резюме) не теряют записи.
+"""
+
+import os
+import json
+import queue
+import atexit
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from loguru import logger
+
+
+LLM_LOG_FILE = os.path.join(Path("data_folder/output"), "llm_api_calls.jsonl")
+# лог в старом формате (один JSON массив), переносится в новый формат при первом запуске
+LEGACY_LLM_LOG_FILE = os.path.join(Path("data_folder/output"), "llm_api_calls.json")
+
+
+class LLMLogWriter:
+    """Класс для записи лога LLM в JSONL файл из одного фонового потока"""
+    _STOP = object()
+
+    def __init__(self, log_path: str = LLM_LOG_FILE):
+        self.log_path = log_path
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="llm-log-writer", daemon=True)
+        self._thread.start()
+        logger.debug(f"LLMLogWriter запущен, пишем лог в файл: {log_path}")
+
+    def write(self, entry: Dict) -> None:
+        """Поставить запись в очередь на запись в файл"""
+        self._queue.put(entry)
+
+    def flush(self) -> None:
+        """Дождаться, пока все записи из очереди будут сохранены в файл"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Сохранить оставшиеся записи и остановить фоновый поток"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Цикл фонового потока: забираем записи из очереди и дописываем их в конец файла"""
+        stop = False
+        while not stop:
+            # если в очереди накопились записи - пишем их все за одно открытие файла
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop_num = sum(entry is self._STOP for entry in batch)
+            if stop_num:
+                stop = True
+                batch = [entry for entry in batch if entry is not self._STOP]
+            try:
+                if batch:
+                    os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                    lines = [json.dumps(entry, ensure_ascii=False) + "\n" for entry in batch]
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.writelines(lines)
+            except Exception as e:
+                logger.error(f"Ошибка при сохранении записи лога в файл {self.log_path}: {str(e)}")
+            finally:
+                for _ in range(len(batch) + stop_num):
+                    self._queue.task_done()
+
+
+_writer: Optional[LLMLogWriter] = None
+_writer_lock = threading.Lock()
+_migrate_lock = threading.Lock()
+
+
+def get_llm_log_writer() -> LLMLogWriter:
+    """
+    Получить общий для всего приложения LLMLogWriter.
+    При первом вызове переносим в новый формат лог, сохраненный в старом формате.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            migrate_llm_log(LEGACY_LLM_LOG_FILE, LLM_LOG_FILE)
+            _writer = LLMLogWriter(LLM_LOG_FILE)
+            atexit.register(_writer.close)
+        return _writer
+
+
+def migrate_llm_log(legacy_path: str = LEGACY_LLM_LOG_FILE, log_path: str = LLM_LOG_FILE) -> int:
+    """
+    Перенести записи из лога в старом формате (JSON массив) в JSONL лог.
+    После переноса старый файл переименовывается в *.bak, чтобы не перенести его повторно.
+    Возвращает число перенесенных записей.
+    """
+    with _migrate_lock:
+        try:
+            return _migrate_llm_log(legacy_path, log_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Не удалось перенести лог LLM из файла {legacy_path}: {str(e)}")
+            return 0
+
+
+def _migrate_llm_log(legacy_path: str, log_path: str) -> int:
+    """
+    Перенос лога без обработки ошибок. До переноса размер JSONL лога сохраняется в файл-отметку *.migrating:
+    если перенос прервался, при следующем запуске лог обрезается до этого размера, и записи не дублируются
+    """
+    marker_path = legacy_path + ".migrating"
+    if not os.path.isfile(legacy_path):
+        # перенос прервался после переименования старого лога - осталось удалить отметку
+        if os.path.isfile(marker_path):
+            os.remove(marker_path)
+        return 0
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            json_list = json.load(f)
+        if not isinstance(json_list, list):
+            raise ValueError("Формат файла JSON неверный, ожидаем список")
+    except (json.JSONDecodeError, ValueError) as e:
+        logger.error(f"Не удалось перенести лог LLM из файла {legacy_path}: {str(e)}")
+        return 0
+
+    if os.path.isfile(marker_path):
+        with open(marker_path, "r", encoding="utf-8") as f:
+            log_size = int(f.read())
+        if os.path.isfile(log_path):
+            logger.warning(f"Прошлый перенос лога LLM из {legacy_path} прерван, повторяем его")
+            with open(log_path, "r+b") as f:
+                f.truncate(log_size)
+    else:
+        log_size = os.path.getsize(log_path) if os.path.isfile(log_path) else 0
+        with open(marker_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(str(log_size))
+        os.replace(marker_path + ".tmp", marker_path)
+
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as f:
+        for entry in json_list:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(legacy_path, legacy_path + ".bak")
+    os.remove(marker_path)
+    logger.info(f"Перенесено {len(json_list)} записей лога LLM из {legacy_path} в {log_path}")
+    return len(json_list)
+
+
+def read_llm_log(log_path: str = LLM_LOG_FILE) -> Iterator[Dict]:
+    """Построчно прочитать записи JSONL лога, пропуская поврежденные строки"""
+    if not os.path.isfile(log_path):
+        return
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Пропускаем поврежденную строку {line_num} в логе {log_path}")
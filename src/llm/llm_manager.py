@@ -4,11 +4,12 @@ import traceback
 import textwrap
 import time
 import json
+import threading
 from json.decoder import JSONDecodeError
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 from typing import Union
 
 import httpx
@@ -27,9 +28,15 @@ from langchain_text_splitters import TokenTextSplitter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import src.llm.prompts as prompts
+from src.llm.llm_log import get_llm_log_writer, migrate_llm_log, LEGACY_LLM_LOG_FILE, LLM_LOG_FILE
+from src.llm.question_classifier import QuestionSectionClassifier, section_name_from_reply
+from src.llm.response_cache import get_llm_response_cache
+from src.job_prefilter import JobPrefilter
 from loguru import logger
 
-from src.app_config import JOB_IS_INTERESTING_THRESH, LLM_MODEL_TYPE, LLM_MODEL, FIXED_COVER_LETTER, PRICE_DICT, TEMPERATURE
+from src.app_config import (JOB_IS_INTERESTING_THRESH, LLM_MODEL_TYPE, LLM_MODEL, FIXED_COVER_LETTER, PRICE_DICT, TEMPERATURE,
+                            LLM_CACHE_COVER_LETTER, JOB_SCORING_BATCH_SIZE, JOB_PREFILTER_REJECT_THRESH,
+                            JOB_PREFILTER_ACCEPT_THRESH, QUESTION_CLASSIFIER_THRESH)
 
 load_dotenv()
 
@@ -146,6 +153,23 @@ class AIAdapter:
         return self.model.invoke(prompt)
 
 
+# общие для всего приложения клиенты LLM API по типу модели, модели, ключу и адресу API
+_ai_adapters: Dict[Tuple[str, str, str, str], AIAdapter] = {}
+_ai_adapters_lock = threading.Lock()
+
+
+def get_ai_adapter(config: dict, api_key: str) -> AIAdapter:
+    """
+    Получить общий клиент LLM API. Все браузеры и кампании, запущенные в одном процессе,
+    используют один клиент и его пул соединений
+    """
+    key = (LLM_MODEL_TYPE, LLM_MODEL, api_key, config.get('llm_api_url', ""))
+    with _ai_adapters_lock:
+        if key not in _ai_adapters:
+            _ai_adapters[key] = AIAdapter(config, api_key)
+        return _ai_adapters[key]
+
+
 class LLMLogger:
     """Класс для логирования всех событий, происходящих при работе с LLM"""
     def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
@@ -159,14 +183,6 @@ class LLMLogger:
         logger.debug(f"Получены промпты")
         logger.debug(f"Получен распарсенный ответ")
 
-        try:
-            calls_log = os.path.join(
-                Path("data_folder/output"), "llm_api_calls.json")
-            logger.debug(f"Определен путь к лог-файлу: {calls_log}")
-        except Exception as e:
-            logger.error(f"Ошибка при определении пути к лог-файлу: {str(e)}")
-            raise
-
         if isinstance(prompts, StringPromptValue):
             logger.debug("Промпты имеют тип StringPromptValue")
             prompts = prompts.text
@@ -247,25 +263,9 @@ class LLMLogger:
             logger.error(f"Ошибка при создании записи лога: отсутствует ключ {str(e)} в parsed_reply")
             raise
 
-        # загружаем лог из лог-файла
-        try:
-            with open(calls_log, "r", encoding="utf-8") as f:
-                json_list = json.load(f)
-        except (FileNotFoundError, JSONDecodeError):
-            json_list = []
-        except Exception as e:
-            logger.error(f"Ошибка при загрузке лога из файла: {str(e)}")
-            raise e
-        
-        # дописываем новую запись в конец лога и сохраняем в файл
-        try:
-            with open(calls_log, "w", encoding="utf-8") as f:
-                json_list.append(log_entry)
-                json.dump(json_list, f, ensure_ascii=False, indent=4)
-                logger.debug(f"Запись лога успешно сохранена в файл: {calls_log}")
-        except Exception as e:
-            logger.error(f"Ошибка при сохранении записи лога в файл: {str(e)}")
-            raise e
+        # ставим запись в очередь, фоновый поток допишет ее в конец лог-файла
+        get_llm_log_writer().write(log_entry)
+        logger.debug("Запись лога передана на сохранение в лог-файл")
 
 
 class LoggerChatModel:
@@ -274,15 +274,25 @@ class LoggerChatModel:
     Этот класс обрабатывает запросы к языковой модели, логирует ответы, а также обрабатывает
     возможные ошибки, такие как превышение лимита запросов или сетевые ошибки.
     """
-    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
+    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel], use_cache: bool = True):
         self.llm = llm
-        logger.debug(f"LoggerChatModel успешно инициализирован, LLM: {llm}")
+        # кэш ответов LLM, общий для всех цепочек (None - кэш не используется)
+        self.cache = get_llm_response_cache() if use_cache else None
+        logger.debug(f"LoggerChatModel успешно инициализирован, LLM: {llm}, кэш: {self.cache is not None}")
 
     def __call__(self, messages: List[Dict[str, str]]) -> str:
         """
         Выполняем вызов LLM, обрабатываем ответ и логируем весь процесс.
+        Если такой же промпт уже отправлялся в LLM - возвращаем ответ из кэша.
         """
         logger.debug(f"Вход в метод __call__ с сообщениями: {messages}")
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(f"{LLM_MODEL_TYPE}/{LLM_MODEL}", TEMPERATURE, messages)
+            cached_reply = self.cache.get(cache_key)
+            if cached_reply is not None:
+                logger.debug(f"Ответ LLM взят из кэша ({self.cache.stats()})")
+                return cached_reply
         while True:
             try:
                 logger.debug("Попытка вызова LLM")
@@ -297,6 +307,9 @@ class LoggerChatModel:
                     prompts=messages, parsed_reply=parsed_reply)
                 logger.debug("Запрос успешно записан в лог-файл")
 
+                if cache_key is not None:
+                    self.cache.put(cache_key, reply)
+
                 return reply
 
             except httpx.HTTPStatusError as e:
@@ -399,8 +412,12 @@ class GPTAnswerer:
     """
     def __init__(self, config, llm_api_key):
         self.job = None
-        self.ai_adapter = AIAdapter(config, llm_api_key)
+        # локальная предварительная оценка вакансий, создается вместе с резюме
+        self.job_prefilter = None
+        self.ai_adapter = get_ai_adapter(config, llm_api_key)
         self.llm_cheap = LoggerChatModel(self.ai_adapter)
+        # модель без кэша ответов для цепочек, которые должны каждый раз генерировать новый ответ
+        self.llm_uncached = LoggerChatModel(self.ai_adapter, use_cache=False)
         self.chains = {
             "personal_information": self._create_chain(prompts.personal_information_template),
             "legal_authorization": self._create_chain(prompts.legal_authorization_template),
@@ -415,9 +432,18 @@ class GPTAnswerer:
             "interests": self._create_chain(prompts.interests_template),
             "previous_job_details": self._create_chain(prompts.previous_job_template),
             "general_knowledge_questions": self._create_chain(prompts.general_knowledge_template),
-            "cover_letter": self._create_chain(prompts.coverletter_template),
+            "cover_letter": self._create_chain(prompts.coverletter_template, use_cache=LLM_CACHE_COVER_LETTER),
             "job_is_interesting": self._create_chain(prompts.job_is_interesting),
+            "job_is_interesting_batch": self._create_chain(prompts.job_is_interesting_batch),
+            "question_section": self._create_chain(prompts.question_section_template),
         }
+        # локальный классификатор тем вопросов, обучается на ранее сделанных запросах к LLM
+        self.question_classifier = None
+        if QUESTION_CLASSIFIER_THRESH is not None:
+            self.question_classifier = QuestionSectionClassifier()
+            # лог в старом формате переносится до обучения, иначе после обновления классификатор не увидит историю запросов
+            migrate_llm_log(LEGACY_LLM_LOG_FILE, LLM_LOG_FILE)
+            self.question_classifier.train_from_llm_log(LLM_LOG_FILE)
 
 
     @property
@@ -459,6 +485,8 @@ class GPTAnswerer:
         """Добавляем резюме для анализа."""
         logger.debug(f"Добавляем резюме: {resume}")
         self.resume = resume
+        # без порогов локальная оценка только пишется в лог рядом с оценкой LLM
+        self.job_prefilter = JobPrefilter(resume, JOB_PREFILTER_REJECT_THRESH, JOB_PREFILTER_ACCEPT_THRESH)
 
 
     def set_job(self, job) -> None:
@@ -481,124 +509,18 @@ class GPTAnswerer:
         return output
 
 
-    def _create_chain(self, template: str) -> ChatPromptTemplate:
+    def _create_chain(self, template: str, use_cache: bool = True) -> ChatPromptTemplate:
         """Создаем цепочку обработки для конкретного раздела резюме."""
         logger.debug(f"Создание цепочки с шаблоном: '{template}'")
         prompt = ChatPromptTemplate.from_template(template)
-        return prompt | self.llm_cheap | StrOutputParser()
+        llm = self.llm_cheap if use_cache else self.llm_uncached
+        return prompt | llm | StrOutputParser()
 
 
     def answer_question_textual_wide_range(self, question: str) -> str:
         """Определить тему заданного вопроса и ответить на него"""
         logger.debug(f"Отвечаем на текстовый вопрос: '{question}'")
-        # промпт модели для определение темы вопроса и ответа на него
-        section_prompt = """You are assisting a bot designed to automatically apply for jobs on AIHawk. The bot receives various questions about job applications and needs to determine the most relevant section of the resume to provide an accurate response.
-
-        For the following question: '{question}', determine which section of the resume is most relevant. 
-        Respond with exactly one of the following options:
-        - Personal information
-        - Legal Authorization
-        - Work Preferences
-        - Education Details
-        - Experience Details
-        - Projects
-        - Availability
-        - Salary Expectations
-        - Certifications
-        - Languages
-        - Interests
-        - Previous Job Details
-        - General Knowledge Questions
-        - Other
-
-        Here are detailed guidelines to help you choose the correct section:
-
-        1. **Personal Information**:
-            - **Purpose**: Contains your basic contact details and online profiles.
-            - **Use When**: The question is about how to contact you or requests links to your professional online presence.
-            - **Examples**: Email address, phone number, AIHawk profile, GitHub repository, personal website.
-
-        2. **Legal Authorization**:
-            - **Purpose**: Details your work authorization status and visa requirements.
-            - **Use When**: The question asks about your ability to work in specific countries or if you need sponsorship or visas.
-            - **Examples**: Work authorization in EU and US, visa requirements, legally allowed to work.
-
-        3. **Work Preferences**:
-            - **Purpose**: Specifies your preferences regarding work conditions and job roles.
-            - **Use When**: The question is about your preferences for remote work, relocation, and willingness to undergo assessments or background checks.
-            - **Examples**: Remote work, in-person work, open to relocation.
-
-        4. **Education Details**:
-            - **Purpose**: Contains information about your academic qualifications and courses.
-            - **Use When**: The question concerns your degrees, universities attended, and relevant coursework.
-            - **Examples**: Degree, university, field of study.
-
-        5. **Experience Details**:
-            - **Purpose**: Details your professional work history and key responsibilities.
-            - **Use When**: The question pertains to your job roles, responsibilities, achievements and technoligies that you used in previous positions.
-            - **Examples**: Job positions, company names, key responsibilities, skills acquired.
-
-        6. **Projects**:
-            - **Purpose**: Highlights specific projects you have worked on.
-            - **Use When**: The question asks about particular projects, their descriptions, or links to project repositories.
-            - **Examples**: Project names, descriptions, links to project repositories.
-
-        7. **Availability**:
-            - **Purpose**: Provides information on your availability for new roles.
-            - **Use When**: The question is about how soon you can start a new job or your notice period.
-            - **Examples**: Notice period, availability to start.
-
-        8. **Salary Expectations**:
-            - **Purpose**: Covers your expected salary range.
-            - **Use When**: The question pertains to your salary expectations or compensation requirements.
-            - **Examples**: Desired salary range.
-
-        9. **Certifications**:
-            - **Purpose**: Lists your professional certifications or licenses.
-            - **Use When**: The question involves your certifications or qualifications from recognized organizations.
-            - **Examples**: Certification names, issuing bodies, dates of validity.
-
-        10. **Languages**:
-            - **Purpose**: Describes the languages you can speak and your proficiency levels.
-            - **Use When**: The question asks about your language skills or proficiency in specific languages.
-            - **Examples**: Languages spoken, proficiency levels.
-
-        11. **Interests**:
-            - **Purpose**: Details your personal or professional interests.
-            - **Use When**: The question is about your hobbies, interests, or activities outside of work.
-            - **Examples**: Personal hobbies, professional interests.
-
-        12. **Previous Job Details**:
-            - **Purpose**: Provides information on your previous job.
-            - **Use When**: The question is about your attitude to your previous job.
-            - **Example**: Why do you leave your previous job? Why do you seek a job? Was there a friendly team at your previous job? What do you think about your boss from previous job.
-
-        13 **General Knowledge Questions**:
-            - **Purpose**: Provides information on your knowledge about things you will face in your job.
-            - **Use When**: A question about your general knowledge of things you will encounter in your work.
-            - **Example**: What REST API is? What HTTP methods do you know? What is GIL and why is it needed?
-        
-        14. **Other**:
-            If you think that question doesn't belong to previous categories, than it belongs to this category.
-            For example, if you are asked to click the link and take a survey on a third-party resource like Google Docs,
-            it's definitely **Other** question category.
-
-        Provide only the exact name of the section from the list above with no additional text.
-        """
-        prompt = ChatPromptTemplate.from_template(section_prompt)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"question": question})
-
-        match = re.search(
-            r"(Personal information|Legal Authorization|Work Preferences|Education Details|"
-            r"Experience Details|Projects|Availability|Salary Expectations|Certifications|Languages|"
-            r"Interests|Previous Job Details|General Knowledge Questions|Other)",
-            output, re.IGNORECASE)
-        if not match:
-            raise ValueError(
-                "Не смогли определить тему вопроса.")
-        
-        section_name = match.group(1).lower().replace(" ", "_")
+        section_name = self._define_question_section(question)
         if section_name == "other":
             output = f"Вопрос не принадлежит ни к одной из известных тем, возвращаем пустой ответ. Текст вопроса: '{question}'"
             logger.warning(output)
@@ -620,6 +542,29 @@ class GPTAnswerer:
         return output
     
 
+    def _define_question_section(self, question: str) -> str:
+        """
+        Определить, к какому разделу резюме относится вопрос. Сначала пробуем
+        локальный классификатор, а если он не уверен в ответе - спрашиваем LLM
+        """
+        if self.question_classifier is not None:
+            section_name, confidence = self.question_classifier.predict(question)
+            if section_name is not None and confidence >= QUESTION_CLASSIFIER_THRESH:
+                logger.debug(f"Тема вопроса определена локально: {section_name} (уверенность {confidence:.2f})")
+                return section_name
+
+        output = self.chains["question_section"].invoke({"question": question})
+        section_name = section_name_from_reply(output)
+        if section_name is None:
+            raise ValueError(
+                "Не смогли определить тему вопроса.")
+        logger.debug(f"Тема вопроса определена LLM: {section_name}")
+        # дообучаем локальный классификатор на ответе LLM
+        if self.question_classifier is not None:
+            self.question_classifier.learn(question, section_name)
+        return section_name
+
+
     def select_one_answer_from_options(self, question: str, options: list[str]) -> str:
         """
         Спрашиваем у LLM ответ на вопрос с несколькими 
@@ -663,39 +608,199 @@ class GPTAnswerer:
         return best_options
     
 
-    def job_is_interesting(self) -> bool|None:
+    def job_is_interesting(self, job: Dict[str, str] | None = None) -> bool|None:
         """
         Спрашиваем у LLM, может ли быть интересна 
-        данная вакансия с учетом нашего резюме, навыков и интересов
+        данная вакансия с учетом нашего резюме, навыков и интересов.
+        Явно неподходящие (или явно подходящие) вакансии оцениваются локально, без LLM
+        """
+        job = job or self.job
+        local_decision, local_score = self._prefilter_job(job)
+        if local_decision is not None:
+            return local_decision
+        return self._llm_job_is_interesting(job, local_score)
+
+
+    async def ajob_is_interesting(self, job: Dict[str, str]) -> bool|None:
+        """
+        Асинхронный вариант job_is_interesting для заданной вакансии,
+        позволяет оценивать следующие вакансии, пока браузер занят текущей
         """
+        local_decision, local_score = self._prefilter_job(job)
+        if local_decision is not None:
+            return local_decision
+        return await self._allm_job_is_interesting(job, local_score)
+
+
+    def _prefilter_job(self, job: Dict[str, str]) -> Tuple[bool|None, float|None]:
+        """Локально оцениваем сходство вакансии с резюме"""
+        if self.job_prefilter is None:
+            return None, None
+        return self.job_prefilter.decide(job)
+
+
+    def _llm_job_is_interesting(self, job: Dict[str, str], local_score: float | None = None) -> bool|None:
+        """Оцениваем вакансию отдельным запросом к LLM"""
         logger.debug("Проверяем, насколько вакансия может быть интересна.")
-        skills = self.resume.get("skills")
-        interests = self.resume.get("interests")
         chain = self.chains.get("job_is_interesting")
         try:
-            output = chain.invoke(
-                {"resume": self.resume, "job_description": self.job_description, 
-                "skills": skills, "interests": interests})
+            output = chain.invoke(self._job_is_interesting_inputs(job))
         except Exception:
             tb_str = traceback.format_exc()
             logger.error(f"Ошибка при вызове LLM: \nTraceback:\n{tb_str}")
             return None
+        return self._parse_job_is_interesting(output, local_score)
+
+
+    async def _allm_job_is_interesting(self, job: Dict[str, str], local_score: float | None = None) -> bool|None:
+        """Асинхронный вариант _llm_job_is_interesting"""
+        logger.debug(f"Асинхронно проверяем, насколько вакансия '{job.get('title')}' может быть интересна.")
+        chain = self.chains.get("job_is_interesting")
+        try:
+            output = await chain.ainvoke(self._job_is_interesting_inputs(job))
+        except Exception:
+            tb_str = traceback.format_exc()
+            logger.error(f"Ошибка при вызове LLM: \nTraceback:\n{tb_str}")
+            return None
+        return self._parse_job_is_interesting(output, local_score)
+
+
+    def _job_is_interesting_inputs(self, job: Dict[str, str]) -> Dict[str, Any]:
+        """Собираем входные данные для цепочки оценки вакансии"""
+        return {"resume": self.resume, "job_description": job["description"],
+                "skills": self.resume.get("skills"), "interests": self.resume.get("interests")}
+
+
+    def jobs_are_interesting(self, jobs: List[Dict[str, str]]) -> List[bool|None]:
+        """
+        Оцениваем сразу несколько вакансий: резюме, навыки и интересы передаются в LLM
+        один раз на JOB_SCORING_BATCH_SIZE вакансий. Вакансии, для которых не удалось
+        разобрать ответ LLM, оцениваются по одной
+        """
+        results, local_scores, undecided = self._prefilter_jobs(jobs)
+        for batch in self._split_jobs_to_batches(undecided):
+            if len(batch) == 1:
+                results[batch[0]] = self._llm_job_is_interesting(jobs[batch[0]], local_scores[batch[0]])
+                continue
+            chain = self.chains.get("job_is_interesting_batch")
+            try:
+                output = chain.invoke(self._jobs_are_interesting_inputs([jobs[num] for num in batch]))
+                batch_results = self._parse_jobs_are_interesting(output, [local_scores[num] for num in batch])
+            except Exception:
+                tb_str = traceback.format_exc()
+                logger.error(f"Ошибка при пакетной оценке вакансий: \nTraceback:\n{tb_str}")
+                batch_results = [None] * len(batch)
+            for num, result in zip(batch, batch_results):
+                if result is None:
+                    result = self._llm_job_is_interesting(jobs[num], local_scores[num])
+                results[num] = result
+        return results
+
+
+    async def ajobs_are_interesting(self, jobs: List[Dict[str, str]]) -> List[bool|None]:
+        """Асинхронный вариант jobs_are_interesting"""
+        results, local_scores, undecided = self._prefilter_jobs(jobs)
+        for batch in self._split_jobs_to_batches(undecided):
+            if len(batch) == 1:
+                results[batch[0]] = await self._allm_job_is_interesting(jobs[batch[0]], local_scores[batch[0]])
+                continue
+            chain = self.chains.get("job_is_interesting_batch")
+            try:
+                output = await chain.ainvoke(self._jobs_are_interesting_inputs([jobs[num] for num in batch]))
+                batch_results = self._parse_jobs_are_interesting(output, [local_scores[num] for num in batch])
+            except Exception:
+                tb_str = traceback.format_exc()
+                logger.error(f"Ошибка при пакетной оценке вакансий: \nTraceback:\n{tb_str}")
+                batch_results = [None] * len(batch)
+            for num, result in zip(batch, batch_results):
+                if result is None:
+                    result = await self._allm_job_is_interesting(jobs[num], local_scores[num])
+                results[num] = result
+        return results
+
+
+    def _prefilter_jobs(self, jobs: List[Dict[str, str]]) -> Tuple[List[bool|None], List[float|None], List[int]]:
+        """
+        Локально оцениваем вакансии. Возвращаем локальные решения, локальные оценки
+        и номера вакансий, которые нужно отправить на оценку в LLM
+        """
+        results, local_scores, undecided = [], [], []
+        for num, job in enumerate(jobs):
+            local_decision, local_score = self._prefilter_job(job)
+            results.append(local_decision)
+            local_scores.append(local_score)
+            if local_decision is None:
+                undecided.append(num)
+        return results, local_scores, undecided
+
+
+    @staticmethod
+    def _split_jobs_to_batches(jobs: List[Any]) -> List[List[Any]]:
+        """Разбиваем вакансии на пакеты для оценки за один вызов LLM"""
+        batch_size = max(JOB_SCORING_BATCH_SIZE, 1)
+        return [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+
+
+    def _jobs_are_interesting_inputs(self, jobs: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Собираем входные данные для цепочки пакетной оценки вакансий"""
+        job_descriptions = "\n".join(
+            f"### Job {num}:\n```\n{job['description']}\n```" for num, job in enumerate(jobs, 1))
+        return {"resume": self.resume, "job_descriptions": job_descriptions,
+                "skills": self.resume.get("skills"), "interests": self.resume.get("interests")}
+
+
+    @classmethod
+    def _parse_jobs_are_interesting(cls, output: str, local_scores: List[float|None]) -> List[bool|None]:
+        """
+        Парсим ответ LLM с оценками нескольких вакансий.
+        Для вакансий, оценку которых найти не удалось, возвращаем None
+        """
+        logger.debug(f"Ответ LLM: '{output}'")
+        results = [None] * len(local_scores)
+        try:
+            scores = json.loads(output[output.index("["):output.rindex("]") + 1])
+        except (ValueError, JSONDecodeError):
+            logger.error("LLM вернула некорректный ответ при пакетной оценке вакансий")
+            return results
+        for item in scores if isinstance(scores, list) else []:
+            try:
+                num = int(item["job"])
+                score = int(item["score"])
+            except (TypeError, KeyError, ValueError):
+                continue
+            if 1 <= num <= len(results):
+                results[num - 1] = cls._is_interesting_score(score, item.get("reasoning", ""), local_scores[num - 1])
+        return results
+
+
+    @classmethod
+    def _parse_job_is_interesting(cls, output: str, local_score: float | None = None) -> bool:
+        """Парсим ответ LLM с оценкой вакансии"""
         logger.debug(f"Ответ LLM: '{output}'")
-        # парсим ответ LLM
         try:
             score = re.search(r'Score: (\d+)', output).group(1)
             reasoning = re.search(r'Reasoning: (.+)', output, re.DOTALL).group(1)
         except AttributeError:
             logger.error("LLM вернула некорректный ответ")
             return False
-        logger.info(f"Степень 'интересности' вакансии: {score}")
-        if int(score) < JOB_IS_INTERESTING_THRESH :
+        return cls._is_interesting_score(int(score), reasoning, local_score)
+
+
+    @staticmethod
+    def _is_interesting_score(score: int, reasoning: str, local_score: float | None = None) -> bool:
+        """Сравниваем оценку вакансии с порогом"""
+        if local_score is None:
+            logger.info(f"Степень 'интересности' вакансии: {score}")
+        else:
+            # локальная оценка выводится рядом, чтобы по логам можно было подобрать ее пороги
+            logger.info(f"Степень 'интересности' вакансии: {score}, локальная оценка схожести с резюме: {local_score:.3f}")
+        if score < JOB_IS_INTERESTING_THRESH :
             logger.debug(f"Работа не интересна: {reasoning}")
             return False
         return True
     
 
-    def write_cover_letter(self) -> str:
+    def write_cover_letter(self, job: Dict[str, str] | None = None) -> str:
         """
         В зависимости от настроек создаем сопроводительное письмо на основе резюме и описания вакансии.
         или же берем и возвращаем готовое.
@@ -705,15 +810,29 @@ class GPTAnswerer:
             logger.debug(f"Берем готовое сопроводительное письмо '{output}'")
             return output
         chain = self.chains.get("cover_letter")
-        sex = self.resume.get("personal_information").get("sex")
-        output = chain.invoke(
-            {"resume": self.resume, "job_description": self.job_description, "sex": sex})
+        output = chain.invoke(self._cover_letter_inputs(job or self.job))
         logger.debug(f"Сопроводительное письмо сгенерировано: '{output}'")
         return output
 
+
+    async def awrite_cover_letter(self, job: Dict[str, str]) -> str:
+        """Асинхронный вариант write_cover_letter для заданной вакансии"""
+        if FIXED_COVER_LETTER:
+            return prompts.fixed_cover_letter
+        chain = self.chains.get("cover_letter")
+        output = await chain.ainvoke(self._cover_letter_inputs(job))
+        logger.debug(f"Сопроводительное письмо для вакансии '{job.get('title')}' сгенерировано: '{output}'")
+        return output
+
+
+    def _cover_letter_inputs(self, job: Dict[str, str]) -> Dict[str, Any]:
+        """Собираем входные данные для цепочки написания сопроводительного письма"""
+        sex = self.resume.get("personal_information").get("sex")
+        return {"resume": self.resume, "job_description": job["description"], "sex": sex}
+
 class GPTResumeGenerator:
     def __init__(self, config, llm_api_key):
-        self.ai_adapter = AIAdapter(config, llm_api_key)
+        self.ai_adapter = get_ai_adapter(config, llm_api_key)
         self.llm_cheap = LoggerChatModel(self.ai_adapter)
         self.llm_embeddings = OpenAIEmbeddings(openai_api_key=llm_api_key)
 
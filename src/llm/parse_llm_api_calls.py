@@ -4,10 +4,11 @@
 их в терминал.
 """
 
-import json
+from src.llm.llm_log import LLM_LOG_FILE, LEGACY_LLM_LOG_FILE, migrate_llm_log, read_llm_log
 
-with open("data_folder/output/llm_api_calls.json", "r", encoding="utf-8") as f:
-    json_list = json.load(f)
+# если лог еще в старом формате (JSON массив) - переносим его в JSONL
+migrate_llm_log(LEGACY_LLM_LOG_FILE, LLM_LOG_FILE)
+json_list = list(read_llm_log(LLM_LOG_FILE))
 
 def get_job_description(json_list: list, idx: int = 0):
     prompt = json_list[idx]["prompts"]["prompt_1"]
@@ -0,0 +1,67 @@
+"""
+Предварительная обработка вакансий с помощью LLM.
+
+Пока браузер занят откликом на текущую вакансию, оценка следующих вакансий (пакетами)
+и написание сопроводительных писем к ним выполняются асинхронно (через ainvoke цепочек LangChain)
+в отдельном потоке с собственным циклом событий asyncio.
+"""
+
+import asyncio
+import threading
+import traceback
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+class LLMPrefetcher:
+    """Класс для асинхронной оценки вакансий и написания сопроводительных писем заранее"""
+    def __init__(self, gpt_answerer: Any):
+        self.gpt_answerer = gpt_answerer
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-prefetch", daemon=True)
+        self._thread.start()
+        logger.debug("LLMPrefetcher запущен")
+
+    def submit(self, job: Dict[str, str], check_interest: bool = True) -> Future:
+        """
+        Поставить вакансию в очередь на обработку LLM.
+        Результат - кортеж (интересна ли вакансия, текст сопроводительного письма или None).
+        """
+        return self.submit_many([job], check_interest)[0]
+
+    def submit_many(self, jobs: List[Dict[str, str]], check_interest: bool = True) -> List[Future]:
+        """
+        Поставить несколько вакансий в очередь на обработку LLM.
+        Вакансии оцениваются пакетно, а сопроводительные письма пишутся параллельно.
+        """
+        scores = asyncio.run_coroutine_threadsafe(self._score(jobs, check_interest), self._loop)
+        return [asyncio.run_coroutine_threadsafe(self._process(job, scores, num), self._loop)
+                for num, job in enumerate(jobs)]
+
+    async def _score(self, jobs: List[Dict[str, str]], check_interest: bool) -> List[Optional[bool]]:
+        """Оценить, интересны ли вакансии"""
+        if not check_interest:
+            return [True] * len(jobs)
+        return await self.gpt_answerer.ajobs_are_interesting(jobs)
+
+    async def _process(self, job: Dict[str, str], scores: Future, num: int) -> Tuple[Optional[bool], Optional[str]]:
+        """Дождаться оценки вакансии и, если она интересна, написать к ней сопроводительное письмо"""
+        job_is_interesting = (await asyncio.wrap_future(scores))[num]
+        cover_letter_text = None
+        if job_is_interesting:
+            try:
+                cover_letter_text = await self.gpt_answerer.awrite_cover_letter(job)
+            except Exception:
+                # письмо будет написано заново при отклике на вакансию
+                tb_str = traceback.format_exc()
+                logger.error(f"Не удалось заранее написать сопроводительное письмо: \nTraceback:\n{tb_str}")
+        return job_is_interesting, cover_letter_text
+
+    def close(self) -> None:
+        """Остановить цикл событий и фоновый поток"""
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
@@ -1,5 +1,100 @@
 from src.resume_builder.template_base import *
 
+# Question Section Template
+question_section_template = """You are assisting a bot designed to automatically apply for jobs on AIHawk. The bot receives various questions about job applications and needs to determine the most relevant section of the resume to provide an accurate response.
+
+For the following question: '{question}', determine which section of the resume is most relevant. 
+Respond with exactly one of the following options:
+- Personal information
+- Legal Authorization
+- Work Preferences
+- Education Details
+- Experience Details
+- Projects
+- Availability
+- Salary Expectations
+- Certifications
+- Languages
+- Interests
+- Previous Job Details
+- General Knowledge Questions
+- Other
+
+Here are detailed guidelines to help you choose the correct section:
+
+1. **Personal Information**:
+    - **Purpose**: Contains your basic contact details and online profiles.
+    - **Use When**: The question is about how to contact you or requests links to your professional online presence.
+    - **Examples**: Email address, phone number, AIHawk profile, GitHub repository, personal website.
+
+2. **Legal Authorization**:
+    - **Purpose**: Details your work authorization status and visa requirements.
+    - **Use When**: The question asks about your ability to work in specific countries or if you need sponsorship or visas.
+    - **Examples**: Work authorization in EU and US, visa requirements, legally allowed to work.
+
+3. **Work Preferences**:
+    - **Purpose**: Specifies your preferences regarding work conditions and job roles.
+    - **Use When**: The question is about your preferences for remote work, relocation, and willingness to undergo assessments or background checks.
+    - **Examples**: Remote work, in-person work, open to relocation.
+
+4. **Education Details**:
+    - **Purpose**: Contains information about your academic qualifications and courses.
+    - **Use When**: The question concerns your degrees, universities attended, and relevant coursework.
+    - **Examples**: Degree, university, field of study.
+
+5. **Experience Details**:
+    - **Purpose**: Details your professional work history and key responsibilities.
+    - **Use When**: The question pertains to your job roles, responsibilities, achievements and technoligies that you used in previous positions.
+    - **Examples**: Job positions, company names, key responsibilities, skills acquired.
+
+6. **Projects**:
+    - **Purpose**: Highlights specific projects you have worked on.
+    - **Use When**: The question asks about particular projects, their descriptions, or links to project repositories.
+    - **Examples**: Project names, descriptions, links to project repositories.
+
+7. **Availability**:
+    - **Purpose**: Provides information on your availability for new roles.
+    - **Use When**: The question is about how soon you can start a new job or your notice period.
+    - **Examples**: Notice period, availability to start.
+
+8. **Salary Expectations**:
+    - **Purpose**: Covers your expected salary range.
+    - **Use When**: The question pertains to your salary expectations or compensation requirements.
+    - **Examples**: Desired salary range.
+
+9. **Certifications**:
+    - **Purpose**: Lists your professional certifications or licenses.
+    - **Use When**: The question involves your certifications or qualifications from recognized organizations.
+    - **Examples**: Certification names, issuing bodies, dates of validity.
+
+10. **Languages**:
+    - **Purpose**: Describes the languages you can speak and your proficiency levels.
+    - **Use When**: The question asks about your language skills or proficiency in specific languages.
+    - **Examples**: Languages spoken, proficiency levels.
+
+11. **Interests**:
+    - **Purpose**: Details your personal or professional interests.
+    - **Use When**: The question is about your hobbies, interests, or activities outside of work.
+    - **Examples**: Personal hobbies, professional interests.
+
+12. **Previous Job Details**:
+    - **Purpose**: Provides information on your previous job.
+    - **Use When**: The question is about your attitude to your previous job.
+    - **Example**: Why do you leave your previous job? Why do you seek a job? Was there a friendly team at your previous job? What do you think about your boss from previous job.
+
+13 **General Knowledge Questions**:
+    - **Purpose**: Provides information on your knowledge about things you will face in your job.
+    - **Use When**: A question about your general knowledge of things you will encounter in your work.
+    - **Example**: What REST API is? What HTTP methods do you know? What is GIL and why is it needed?
+
+14. **Other**:
+    If you think that question doesn't belong to previous categories, than it belongs to this category.
+    For example, if you are asked to click the link and take a survey on a third-party resource like Google Docs,
+    it's definitely **Other** question category.
+
+Provide only the exact name of the section from the list above with no additional text.
+"""
+
 # Personal Information Template
 personal_information_template = """
 Answer the following question based on the provided personal information.
@@ -436,6 +531,39 @@ Reasoning: [brief explanation]
 Do not output anything else in the response other than the score and reasoning.
 """
 
+job_is_interesting_batch = """
+   Evaluate whether the provided resume meets the requirements outlined in each of the job descriptions below. Determine for every job if the candidate is suitable for it based on the information provided.
+
+## Resume:
+```
+{resume}
+```
+## Your skills:
+```
+{skills}
+```
+## Your interests:
+```
+{interests}
+```
+## Job Descriptions:
+{job_descriptions}
+
+Instructions (apply to every job separately):
+1. Extract the key requirements from the job description, identifying hard requirements (must-haves) and soft requirements (nice-to-haves).
+2. Identify the relevant qualifications from the resume and skill list.
+3. Compare the qualifications against the requirements, ensuring all hard requirements are met. Allow for a 1-year experience gap if applicable, as experience is usually a hard requirement.
+4. Provide a suitability score from 1 to 10. where 1 indicates the candidate does not meet any requirements and 10 indicates the candidate meets all requirements.
+5. If the job matches one or more of canditate's interests - add 1 point to the overall score.
+6. Provide a brief reasoning for the score, highlighting which requirements are met and which are not.
+7. If job description language is Russian - answer in Russian. Else answer in English.
+
+Output Format (Strictly follow this format):
+A JSON list with one object per job, in the same order as the jobs:
+[{{"job": [job number], "score": [numerical score], "reasoning": "[brief explanation]"}}]
+Do not output anything else in the response other than the JSON list.
+"""
+
 prompt_header = """
 Ты эксперт по подбору персонала и составлению резюме, совместимых с системами ATS (система отслеживания кандидатов). 
 Твоя задача — создать профессиональный и аккуратный заголовок для резюме. 
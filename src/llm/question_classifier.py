@@ -0,0 +1,157 @@
+"""
+Локальное определение темы (раздела резюме) вопроса работодателя.
+
+Чтобы ответить на текстовый вопрос, сначала нужно понять, к какому разделу резюме он относится.
+Тема определяется наивным байесовским классификатором, обученным на темах, которые LLM ранее
+определила для вопросов (берутся из лога llm_api_calls.jsonl). Для типовых вопросов
+("Ваши ожидания по зарплате?", "Уровень английского?") тема также ищется по ключевым фразам:
+совпадение с правилом, подтвержденное классификатором, дает полную уверенность.
+LLM вызывается только если локальный классификатор не уверен в ответе.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from src.job_prefilter import tokenize
+from src.llm.llm_log import read_llm_log
+
+
+# темы вопросов в том виде, в котором их возвращает LLM
+QUESTION_SECTIONS = (
+    "Personal information", "Legal Authorization", "Work Preferences", "Education Details",
+    "Experience Details", "Projects", "Availability", "Salary Expectations", "Certifications",
+    "Languages", "Interests", "Previous Job Details", "General Knowledge Questions", "Other",
+    )
+SECTION_RE = re.compile("(" + "|".join(QUESTION_SECTIONS) + ")", re.IGNORECASE)
+# по этим строкам в логе LLM находятся запросы на определение темы вопроса
+SECTION_PROMPT_MARKER = "determine which section of the resume is most relevant"
+SECTION_PROMPT_QUESTION_RE = re.compile(r"For the following question: '(.*)', determine which section", re.DOTALL)
+
+# фразы, указывающие на тему вопроса. Отдельные слова вроде "опыт", "доход" или "language" встречаются
+# в вопросах на разные темы ("доход компании", "язык программирования"), поэтому правила составлены из фраз
+KEYWORD_RULES = {
+    "salary_expectations": (r"\b(зарплат|заработн\w* плат|оклад)\w*|\bзп\b|\bожидани\w* по (доход|оплат|вознагражден)\w*"
+                            r"|\bжелаем\w* (доход|уровень дохода|вознагражден)\w*|\bна руки\b|\bsalary\b"
+                            r"|\bcompensation expectations?\b|\bexpected pay\b"),
+    "availability": (r"\bкогда\b.*\b(сможете|готовы|можете)\b.*\b(выйти|приступить|начать)\b|\bсрок\w* выхода\b"
+                     r"|\bотработк\w*|\bnotice period\b|\bhow soon\b|\bavailable to start\b"),
+    "languages": (r"\b(английск|немецк|французск|китайск|испанск)\w*|\bиностранн\w* язык\w*|\bвладени\w* язык\w*"
+                  r"|\b(english|german|french|spanish|chinese)\b|\bforeign language\b|\blanguage proficiency\b"),
+    "personal_information": (r"\bваш\w* (номер\w* )?телефон\w*|\bномер\w* телефон\w*|\be-?mail\b|\bэлектронн\w* почт\w*"
+                             r"|\btelegram\b|\bтелеграм\w*|\blinkedin\b|\bконтакт\w* для связи\b|\bкак с вами связаться\b"
+                             r"|\bдата рождения\b|\bсколько вам лет\b"),
+    "legal_authorization": (r"\bгражданств\w*|\bразрешени\w* на работу\b|\bвиз[ауы]?\b|\bcitizenship\b|\bwork permit\b"
+                            r"|\bvisa\b|\bsponsorship\b"),
+    "work_preferences": (r"\bудал[её]нн\w* (работ|формат)\w*|\bудал[её]нк\w*|\bработ\w* (в|из) офис\w*|\bгибрид\w*"
+                         r"|\bпереезд\w*|\bрелокац\w*|\bкомандировк\w*|\bграфик\w* работы\b|\bremote\b|\brelocat\w*"
+                         r"|\bon-?site\b"),
+    "education_details": (r"\bобразовани\w*|\bвуз\w*|\bуниверситет\w*|\bдиплом\b|\bфакультет\w*|\bdegree\b"
+                          r"|\buniversity\b"),
+    "certifications": r"\bсертификат\w*|\bcertificat\w*",
+    "interests": r"\bхобби\b|\bувлечени\w*|\bhobb(y|ies)\b",
+    "previous_job_details": (r"\bпочему\b.*\b(ушли|уходите|увольня\w*|ищете|меняете)\b|\bпредыдущ\w* (работ|мест)\w*"
+                             r"|\bпрошл\w* (работ|мест)\w*|\bwhy\b.*\b(leave|left|leaving)\b"),
+    "projects": r"\bpet-?проект\w*|\bпортфолио\b|\bваш\w* проект\w*|\bportfolio\b",
+    "experience_details": (r"\bсколько лет\b.*\b(опыт|работ|стаж)\w*|\bстаж\w*|\bкоммерческ\w* опыт\w*"
+                           r"|\bопыт\w* (работы )?(с|в|на)\b|\byears of experience\b|\bexperience (with|in)\b"),
+}
+# уверенность темы, найденной только по ключевым словам. Она ниже порога QUESTION_CLASSIFIER_THRESH
+# по умолчанию, поэтому без подтверждения классификатором тема уточняется у LLM
+RULE_CONFIDENCE = 0.8
+
+
+def section_name_from_reply(reply: str) -> Optional[str]:
+    """Получить название раздела резюме из ответа LLM"""
+    match = SECTION_RE.search(reply or "")
+    return match.group(1).lower().replace(" ", "_") if match else None
+
+
+class QuestionSectionClassifier:
+    """Класс для определения темы вопроса по ключевым словам и наивным байесовским классификатором"""
+    def __init__(self, min_samples: int = 20, alpha: float = 1.0):
+        # сколько примеров нужно, чтобы начать доверять классификатору
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self._rules = {section: re.compile(pattern) for section, pattern in KEYWORD_RULES.items()}
+        self._word_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._section_counts = Counter()
+        self._vocab = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(self._section_counts.values())
+
+    def learn(self, question: str, section_name: str) -> None:
+        """Добавить пример вопроса с известной темой"""
+        words = list(tokenize(question))
+        with self._lock:
+            self._word_counts[section_name].update(words)
+            self._section_counts[section_name] += 1
+            self._vocab.update(words)
+
+    def train(self, samples: Iterable[Tuple[str, str]]) -> int:
+        """Обучить классификатор на парах (вопрос, тема). Возвращает число примеров"""
+        samples_num = 0
+        for question, section_name in samples:
+            self.learn(question, section_name)
+            samples_num += 1
+        return samples_num
+
+    def train_from_llm_log(self, log_path: str) -> int:
+        """Обучить классификатор на темах вопросов, которые ранее определила LLM"""
+        samples_num = self.train(self._samples_from_llm_log(log_path))
+        logger.debug(f"Классификатор тем вопросов обучен на {samples_num} примерах из лога {log_path}")
+        return samples_num
+
+    @staticmethod
+    def _samples_from_llm_log(log_path: str) -> Iterable[Tuple[str, str]]:
+        """Найти в логе LLM запросы на определение темы вопроса и ответы на них"""
+        for entry in read_llm_log(log_path):
+            prompts = entry.get("prompts")
+            prompt = " ".join(prompts.values()) if isinstance(prompts, dict) else str(prompts)
+            if SECTION_PROMPT_MARKER not in prompt:
+                continue
+            match = SECTION_PROMPT_QUESTION_RE.search(prompt)
+            section_name = section_name_from_reply(entry.get("replies"))
+            if match and section_name:
+                yield match.group(1), section_name
+
+    def predict(self, question: str) -> Tuple[Optional[str], float]:
+        """
+        Определить тему вопроса. Возвращает (название раздела резюме или None, уверенность от 0 до 1).
+        Тема, найденная по ключевым словам, получает полную уверенность, только если ее подтверждает классификатор
+        """
+        text = question.lower()
+        matched = [section for section, rule in self._rules.items() if rule.search(text)]
+        section, confidence = self._predict_by_model(question)
+        if len(matched) == 1:
+            if section == matched[0]:
+                return section, 1.0
+            return matched[0], RULE_CONFIDENCE
+        return section, confidence
+
+    def _predict_by_model(self, question: str) -> Tuple[Optional[str], float]:
+        """Определить тему вопроса наивным байесовским классификатором"""
+        with self._lock:
+            if len(self) < self.min_samples:
+                return None, 0.0
+            words = [word for word in tokenize(question) if word in self._vocab]
+            if not words:
+                return None, 0.0
+            samples_num = len(self)
+            vocab_size = len(self._vocab)
+            log_probs = {}
+            for section, section_count in self._section_counts.items():
+                word_counts = self._word_counts[section]
+                total = sum(word_counts.values()) + self.alpha * vocab_size
+                log_probs[section] = math.log(section_count / samples_num) + sum(
+                    math.log((word_counts[word] + self.alpha) / total) for word in words)
+        best_section = max(log_probs, key=log_probs.get)
+        max_log_prob = log_probs[best_section]
+        confidence = 1 / sum(math.exp(log_prob - max_log_prob) for log_prob in log_probs.values())
+        return best_section, confidence
@@ -0,0 +1,118 @@
+"""
+Дисковый кэш ответов LLM.
+
+Ключ кэша - хэш от (модель, температура, текст всех сообщений промпта), поэтому
+повторный запуск того же поиска, перезапуск после сбоя или повторная генерация резюме
+для уже встречавшейся вакансии не требуют новых запросов к LLM.
+Размер кэша ограничен, при переполнении удаляются давно не использовавшиеся ответы (LRU).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from langchain_core.messages.ai import AIMessage
+from loguru import logger
+
+from src.app_config import LLM_CACHE_MAX_ENTRIES
+
+
+LLM_CACHE_FILE = os.path.join(Path("data_folder/output"), "llm_cache.db")
+
+
+class LLMResponseCache:
+    """Класс для хранения ответов LLM в базе SQLite с вытеснением по LRU"""
+    def __init__(self, db_path: str, max_entries: int):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    response_metadata TEXT,
+                    usage_metadata TEXT,
+                    last_access REAL NOT NULL
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        logger.debug(f"Кэш ответов LLM открыт: {db_path}, записей: {self._size}")
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def make_key(model: str, temperature: float, messages: Any) -> str:
+        """Получить ключ кэша для промпта"""
+        if hasattr(messages, "to_messages"):
+            rendered = [[message.type, message.content] for message in messages.to_messages()]
+        else:
+            rendered = messages
+        payload = json.dumps([model, temperature, rendered], ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[AIMessage]:
+        """Найти ответ LLM в кэше"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, response_metadata, usage_metadata FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        content, response_metadata, usage_metadata = row
+        return AIMessage(content=content,
+                         response_metadata=json.loads(response_metadata or "{}"),
+                         usage_metadata=json.loads(usage_metadata) if usage_metadata else None)
+
+    def put(self, key: str, reply: Any) -> None:
+        """Сохранить ответ LLM в кэш, при переполнении удалить самые старые ответы"""
+        usage_metadata = getattr(reply, "usage_metadata", None)
+        response_metadata = getattr(reply, "response_metadata", None) or {}
+        with self._lock, self._conn:
+            exists = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, response_metadata, usage_metadata, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, reply.content, json.dumps(response_metadata, ensure_ascii=False, default=str),
+                 json.dumps(usage_metadata) if usage_metadata else None, time.time()))
+            if not exists:
+                self._size += 1
+            if self._size > self.max_entries:
+                excess = self._size - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access LIMIT ?)", (excess,))
+                self._size -= excess
+
+    def stats(self) -> str:
+        """Статистика использования кэша"""
+        return f"попаданий: {self.hits}, промахов: {self.misses}, записей: {self._size}"
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Получить общий для всего приложения кэш ответов LLM (None, если кэш отключен)"""
+    global _cache
+    if LLM_CACHE_MAX_ENTRIES <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(LLM_CACHE_FILE, LLM_CACHE_MAX_ENTRIES)
+        return _cache
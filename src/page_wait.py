@@ -0,0 +1,132 @@
+"""
+Ожидание элементов и загрузки страницы по событиям страницы, а не опросом раз в секунду.
+
+PageWait заменяет WebDriverWait: условие (expected_conditions) проверяется сразу, а следующая
+проверка делается, как только на странице что-то изменилось (MutationObserver внутри страницы),
+поэтому ожидание заканчивается через миллисекунды после появления элемента.
+PageWait.settle ждет, пока страница успокоится после действия: документ загружен,
+а изменений DOM и загрузок ресурсов нет в течение короткого интервала. Если действие
+начало переход на другую страницу, ждем загрузки нового документа.
+Паузы для имитации пользователя задаются отдельно (HUMAN_PACING_SEC) и не зависят от ожидания страницы.
+"""
+
+import time
+from typing import Any, Callable, Iterable, Type
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException, TimeoutException, WebDriverException
+
+
+# сколько ждать изменений страницы до повторной проверки условия, даже если изменений не было
+# (например, элемент стал видимым из-за CSS анимации, которую MutationObserver не замечает)
+RECHECK_SEC = 0.5
+# сколько страница должна быть без изменений, чтобы считаться загруженной
+SETTLE_IDLE_SEC = 0.2
+# сколько максимум ждать, пока страница успокоится (на страницах с постоянной анимацией)
+SETTLE_TIMEOUT_SEC = 5
+# пауза перед повторной проверкой, если скрипт прерван переходом на другую страницу
+NAVIGATION_SLEEP_SEC = 0.1
+
+# ожидание первого изменения DOM (или истечения timeout мс). Изменения приходят пачками,
+# поэтому скрипт завершается через 50 мс после первого изменения, а не на каждое изменение
+WAIT_FOR_CHANGE_JS = """
+const [timeout, done] = arguments;
+let finished = false;
+const finish = (changed) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(changed);
+};
+const observer = new MutationObserver(() => setTimeout(() => finish(true), 50));
+const timer = setTimeout(() => finish(false), timeout);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+"""
+
+# ожидание, пока документ загрузится и в течение idle мс не будет изменений DOM и загрузок ресурсов
+# (запросов fetch/XHR, картинок, скриптов). Возвращает false, если страница не успокоилась за timeout мс
+SETTLE_JS = """
+const [idle, timeout, done] = arguments;
+const start = performance.now();
+let lastChange = start;
+const touch = () => { lastChange = performance.now(); };
+const observer = new MutationObserver(touch);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+let resources = null;
+try {
+    resources = new PerformanceObserver(touch);
+    resources.observe({type: 'resource'});
+} catch (e) {
+    resources = null;
+}
+const timer = setInterval(() => {
+    const now = performance.now();
+    const settled = document.readyState === 'complete' && now - lastChange >= idle;
+    if (settled || now - start >= timeout) {
+        clearInterval(timer);
+        observer.disconnect();
+        if (resources !== null) resources.disconnect();
+        done(settled);
+    }
+}, 25);
+"""
+
+
+class PageWait:
+    """Класс для ожидания условий на странице, совместимый с WebDriverWait.until"""
+    def __init__(self, driver: webdriver.Chrome, timeout: float, recheck_sec: float = RECHECK_SEC,
+                 ignored_exceptions: Iterable[Type[Exception]] = (NoSuchElementException,)):
+        self.driver = driver
+        self.timeout = timeout
+        self.recheck_sec = recheck_sec
+        self.ignored_exceptions = tuple(ignored_exceptions)
+
+    def until(self, method: Callable[[webdriver.Chrome], Any], message: str = "") -> Any:
+        """Дождаться, пока method вернет истинное значение, и вернуть его. Иначе - TimeoutException"""
+        end_time = time.monotonic() + self.timeout
+        while True:
+            try:
+                value = method(self.driver)
+                if value:
+                    return value
+            except self.ignored_exceptions:
+                pass
+            time_left = end_time - time.monotonic()
+            if time_left <= 0:
+                raise TimeoutException(message)
+            self._wait_for_change(min(time_left, self.recheck_sec))
+
+    def settle(self, idle_sec: float = SETTLE_IDLE_SEC, timeout: float = SETTLE_TIMEOUT_SEC) -> bool:
+        """Дождаться, пока страница успокоится после действия. Возвращает False, если не дождались"""
+        try:
+            return bool(self.driver.execute_async_script(SETTLE_JS, int(idle_sec * 1000), int(timeout * 1000)))
+        except NoSuchWindowException:
+            # вкладка закрыта - ждать на ней нечего
+            return False
+        except WebDriverException:
+            # скрипт прерван переходом на другую страницу - ждем загрузки нового документа
+            return self._wait_for_load(timeout)
+
+    def _wait_for_load(self, timeout: float) -> bool:
+        """Дождаться, пока документ загрузится (document.readyState == 'complete'), но не дольше timeout секунд"""
+        end_time = time.monotonic() + timeout
+        while time.monotonic() < end_time:
+            try:
+                if self.driver.execute_script("return document.readyState") == "complete":
+                    return True
+            except NoSuchWindowException:
+                return False
+            except WebDriverException:
+                # новый документ еще не готов выполнять скрипты
+                pass
+            time.sleep(NAVIGATION_SLEEP_SEC)
+        return False
+
+    def _wait_for_change(self, timeout: float) -> None:
+        """Дождаться изменения страницы, но не дольше timeout секунд"""
+        try:
+            self.driver.execute_async_script(WAIT_FOR_CHANGE_JS, int(timeout * 1000))
+        except WebDriverException:
+            # скрипт прерван переходом на другую страницу - проверяем условие уже на новой странице
+            time.sleep(min(timeout, NAVIGATION_SLEEP_SEC))
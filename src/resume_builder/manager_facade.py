@@ -1,8 +1,6 @@
-import os
 from pathlib import Path
-import tempfile
 import inquirer
-from src.resume_builder.utils import HTML_to_PDF
+from src.resume_builder.utils import get_pdf_renderer
 import webbrowser
 from loguru import logger
 
@@ -49,11 +47,6 @@ class FacadeManager:
             raise ValueError("Перед созданием PDF-файла необходимо выбрать стиль.")
         
         style_path = self.style_manager.get_style_path(self.selected_style)
-
-        with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.html', encoding='utf-8') as temp_html_file:
-            temp_html_path = temp_html_file.name
-            self.resume_generator.create_resume(gpt_resume_generator, style_path, job_description_text, temp_html_path)
- 
-        pdf_base64 = HTML_to_PDF(temp_html_path)
-        os.remove(temp_html_path)
-        return pdf_base64
+        html = self.resume_generator.create_resume_html(gpt_resume_generator, style_path, job_description_text)
+        # HTML печатается в заранее запущенном браузере без временных файлов
+        return get_pdf_renderer().render(html)
@@ -0,0 +1,128 @@
+"""
+Преобразование HTML резюме в PDF в заранее запущенных браузерах Chrome.
+
+Браузеры без окна (headless) запускаются один раз при первом запросе и используются повторно
+для всех резюме. HTML передается в браузер строкой (data: URL), без временных файлов, а печать
+начинается сразу после загрузки страницы и шрифтов, без фиксированной паузы. Несколько резюме
+печатаются одновременно в разных браузерах.
+"""
+
+import base64
+import queue
+import threading
+from typing import Any, Callable
+
+from selenium.common.exceptions import WebDriverException
+from loguru import logger
+
+
+# настройки печати страницы в PDF (Page.printToPDF)
+PDF_PRINT_OPTIONS = {
+    "printBackground": True,          # Включить фон при печати
+    "landscape": False,               # Печатать в вертикальной ориентации (False для портретной ориентации)
+    "paperWidth": 8.27,               # Ширина листа в дюймах (A4)
+    "paperHeight": 11.69,             # Высота листа в дюймах (A4)
+    "marginTop": 0.8,                 # Верхнее поле в дюймах
+    "marginBottom": 0.8,              # Нижнее поле в дюймах
+    "marginLeft": 0.5,                # Левое поле в дюймах
+    "marginRight": 0.5,               # Правое поле в дюймах
+    "displayHeaderFooter": False,     # Не отображать заголовки и нижние колонтитулы
+    "preferCSSPageSize": True,        # Использовать размеры страницы из CSS
+    "generateDocumentOutline": False, # Не генерировать оглавление документа
+    "generateTaggedPDF": False,       # Не генерировать тэгированный PDF
+    "transferMode": "ReturnAsBase64"  # Вернуть PDF в виде строки base64
+}
+
+# ожидание загрузки веб-шрифтов: событие load не ждет шрифты, подключенные через @font-face
+WAIT_FONTS_JS = """
+const done = arguments[arguments.length - 1];
+document.fonts.ready.then(() => done(true), () => done(false));
+"""
+
+
+class PDFRenderer:
+    """Класс для печати HTML в PDF в пуле заранее запущенных браузеров"""
+    def __init__(self, create_driver: Callable[[], Any], browsers_num: int = 1, load_timeout_sec: int = 20):
+        self.create_driver = create_driver
+        self.browsers_num = max(1, browsers_num)
+        self.load_timeout_sec = load_timeout_sec
+        # свободные браузеры
+        self._drivers = queue.Queue()
+        self._started_num = 0
+        self._lock = threading.Lock()
+
+    def render(self, html: str) -> str:
+        """Напечатать HTML в PDF, возвращает PDF в виде строки base64"""
+        html_b64 = base64.b64encode(html.encode("utf-8")).decode("ascii")
+        return self.render_url(f"data:text/html;charset=utf-8;base64,{html_b64}")
+
+    def render_url(self, url: str) -> str:
+        """Открыть страницу по адресу и напечатать ее в PDF, возвращает PDF в виде строки base64"""
+        driver = self._acquire_driver()
+        try:
+            # get возвращает управление после события load страницы
+            driver.get(url)
+            driver.execute_async_script(WAIT_FONTS_JS)
+            pdf_base64 = driver.execute_cdp_cmd("Page.printToPDF", PDF_PRINT_OPTIONS)
+        except WebDriverException as e:
+            # браузер в неизвестном состоянии - закрываем его, при следующем запросе будет запущен новый
+            self._discard_driver(driver)
+            raise RuntimeError(f"Ошибка при работе WebDriver: {e}")
+        self._drivers.put(driver)
+        return pdf_base64["data"]
+
+    def _acquire_driver(self) -> Any:
+        """Взять свободный браузер, запустив новый, если все заняты и еще не запущено browsers_num браузеров"""
+        while True:
+            try:
+                return self._drivers.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                start_new = self._started_num < self.browsers_num
+                if start_new:
+                    self._started_num += 1
+            if start_new:
+                return self._start_driver()
+            # ждем, пока освободится один из браузеров, периодически проверяя, не был ли закрыт неисправный браузер
+            try:
+                return self._drivers.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _start_driver(self) -> Any:
+        """Запустить новый браузер"""
+        logger.debug("Запускаем браузер для печати резюме в PDF")
+        try:
+            driver = self.create_driver()
+        except Exception:
+            with self._lock:
+                self._started_num -= 1
+            raise
+        try:
+            driver.set_page_load_timeout(self.load_timeout_sec)
+            driver.set_script_timeout(self.load_timeout_sec)
+        except Exception:
+            # браузер уже запущен - закрываем его, чтобы не оставить процесс Chrome
+            self._discard_driver(driver)
+            raise
+        return driver
+
+    def _discard_driver(self, driver: Any) -> None:
+        """Закрыть неисправный браузер"""
+        with self._lock:
+            self._started_num -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть браузер для печати резюме: {str(e)}")
+
+    def close(self) -> None:
+        """Закрыть все свободные браузеры"""
+        while True:
+            try:
+                driver = self._drivers.get_nowait()
+            except queue.Empty:
+                break
+            self._discard_driver(driver)
+
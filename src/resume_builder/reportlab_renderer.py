@@ -0,0 +1,363 @@
+"""
+Построение PDF резюме на чистом Python (reportlab), без браузера.
+
+HTML резюме, который собирает GPTResumeGenerator (header, section, .entry, .compact-list, .two-column),
+разбирается с помощью lxml и раскладывается на странице A4 средствами reportlab. Оформление
+приближенно повторяет выбранный стиль: цвета и размеры шрифтов берутся из CSS, встроенного в HTML.
+Для кириллицы нужен TrueType шрифт: он задается в PDF_FONT_PATH или ищется среди системных шрифтов.
+"""
+
+import base64
+import io
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from lxml import html as lxml_html
+from loguru import logger
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.fonts import addMapping
+from reportlab.platypus import (HRFlowable, ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer,
+                                Table, TableStyle)
+
+
+# системные шрифты с кириллицей: (обычный, жирный)
+FONT_CANDIDATES = [
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/dejavu/DejaVuSans.ttf", "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/TTF/DejaVuSans.ttf", "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+     "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf"),
+    ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arialbd.ttf"),
+    ("/System/Library/Fonts/Supplemental/Arial.ttf", "/System/Library/Fonts/Supplemental/Arial Bold.ttf"),
+    ("/Library/Fonts/Arial.ttf", "/Library/Fonts/Arial Bold.ttf"),
+    ]
+FONT_NAME = "ResumeFont"
+# поля страницы в дюймах, как при печати в Chrome
+PAGE_MARGINS = {"left": 0.5, "right": 0.5, "top": 0.8, "bottom": 0.8}
+
+CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+CSS_IMPORT_RE = re.compile(r"@import\s+(?:url\([^)]*\)|\"[^\"]*\"|'[^']*')[^;]*;")
+CSS_RULE_RE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+CSS_VAR_RE = re.compile(r"var\(\s*(--[\w-]+)\s*(?:,[^)]*)?\)")
+CSS_COLOR_RE = re.compile(r"#[0-9a-fA-F]{3,8}\b|rgba?\([^)]*\)|\b[a-zA-Z]+\b")
+CSS_SIZE_RE = re.compile(r"(\d*\.?\d+)\s*(pt|px|rem|em)")
+SPACES_RE = re.compile(r"\s+")
+
+
+def find_fonts(font_path: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """Найти TrueType шрифт с кириллицей, возвращает пути к обычному и жирному начертанию"""
+    if font_path:
+        if not os.path.isfile(font_path):
+            logger.warning(f"Шрифт для PDF не найден: {font_path}")
+        else:
+            # жирное начертание ищем рядом с обычным по распространенным именам файлов
+            root, ext = os.path.splitext(font_path)
+            root = re.sub(r"-Regular$", "", root)
+            for bold_path in (f"{root}-Bold{ext}", f"{root}bd{ext}", f"{root} Bold{ext}"):
+                if os.path.isfile(bold_path):
+                    return font_path, bold_path
+            return font_path, font_path
+    for regular_path, bold_path in FONT_CANDIDATES:
+        if os.path.isfile(regular_path):
+            return regular_path, bold_path if os.path.isfile(bold_path) else regular_path
+    return None
+
+
+def register_fonts(font_path: Optional[str] = None) -> Tuple[str, str]:
+    """Зарегистрировать шрифт резюме в reportlab, возвращает имена обычного и жирного шрифта"""
+    fonts = find_fonts(font_path)
+    if fonts is None:
+        logger.warning("Не найден шрифт с кириллицей для PDF (укажите PDF_FONT_PATH), используется Helvetica")
+        return "Helvetica", "Helvetica-Bold"
+    regular_path, bold_path = fonts
+    bold_name = f"{FONT_NAME}-Bold"
+    pdfmetrics.registerFont(TTFont(FONT_NAME, regular_path))
+    pdfmetrics.registerFont(TTFont(bold_name, bold_path))
+    # курсивного начертания может не быть - курсив выводится обычным шрифтом
+    addMapping(FONT_NAME, 0, 0, FONT_NAME)
+    addMapping(FONT_NAME, 1, 0, bold_name)
+    addMapping(FONT_NAME, 0, 1, FONT_NAME)
+    addMapping(FONT_NAME, 1, 1, bold_name)
+    logger.debug(f"Шрифт для PDF: {regular_path}")
+    return FONT_NAME, bold_name
+
+
+def parse_css(css: str) -> Dict[str, Dict[str, str]]:
+    """
+    Разобрать простые правила CSS в словарь селектор -> свойства. Правила внутри @media
+    объединяются с основными, переменные var(--имя) заменяются значениями из :root
+    """
+    css = CSS_IMPORT_RE.sub("", CSS_COMMENT_RE.sub("", css))
+    rules: Dict[str, Dict[str, str]] = {}
+    for selectors, body in CSS_RULE_RE.findall(css):
+        props = {}
+        for declaration in body.split(";"):
+            if ":" in declaration:
+                name, value = declaration.split(":", 1)
+                name = name.strip()
+                # имена переменных CSS чувствительны к регистру
+                props[name if name.startswith("--") else name.lower()] = value.replace("!important", "").strip()
+        for selector in selectors.split(","):
+            selector = SPACES_RE.sub(" ", selector.strip())
+            if selector and not selector.startswith("@"):
+                rules.setdefault(selector, {}).update(props)
+    variables = {name: value for selector in (":root", "html", "body") for name, value in rules.get(selector, {}).items()
+                 if name.startswith("--")}
+    for props in rules.values():
+        for name, value in props.items():
+            props[name] = CSS_VAR_RE.sub(lambda match: variables.get(match.group(1), ""), value)
+    return rules
+
+
+def _css_color(value: Optional[str]) -> Optional[colors.Color]:
+    """Преобразовать цвет CSS в цвет reportlab, возвращает None для прозрачных и неизвестных цветов"""
+    if not value:
+        return None
+    for token in CSS_COLOR_RE.findall(value):
+        if token.lower() in ("transparent", "none", "inherit", "initial", "solid", "dotted", "dashed"):
+            continue
+        if token.startswith("#") and len(token) in (4, 5):
+            # короткая запись #rgb и #rgba
+            token = "#" + "".join(digit * 2 for digit in token[1:])
+        if token.startswith("#") and len(token) == 9:
+            # цвет с прозрачностью - смешиваем с белым фоном
+            alpha = int(token[-2:], 16) / 255
+            token = token[:-2]
+            try:
+                return colors.linearlyInterpolatedColor(colors.white, colors.toColor(token), 0, 1, alpha)
+            except ValueError:
+                continue
+        try:
+            return colors.toColor(token)
+        except ValueError:
+            continue
+    return None
+
+
+def _css_size(value: Optional[str], base_size: float) -> Optional[float]:
+    """Преобразовать размер шрифта CSS в пункты"""
+    match = CSS_SIZE_RE.search(value or "")
+    if match is None:
+        return None
+    number, unit = float(match.group(1)), match.group(2)
+    if unit == "px":
+        return number * 0.75
+    if unit in ("em", "rem"):
+        return number * base_size
+    return number
+
+
+def css_theme(css: str) -> Dict[str, object]:
+    """Получить цвета и размеры шрифтов резюме из CSS стиля"""
+    rules = parse_css(css)
+
+    def prop(selectors: List[str], name: str) -> Optional[str]:
+        # более специфичные селекторы идут первыми
+        for selector in selectors:
+            value = rules.get(selector, {}).get(name)
+            if value:
+                return value
+        return None
+
+    def color(selectors: List[str], default: colors.Color, name: str = "color") -> colors.Color:
+        return _css_color(prop(selectors, name)) or default
+
+    text_color = color(["body", "*"], colors.HexColor("#333333"))
+    font_size = _css_size(prop(["body", "*"], "font-size"), 12) or 10
+    accent = color(["a"], text_color)
+    header_bg = _css_color(prop(["header"], "background-color") or prop(["header"], "background"))
+    return {
+        "text_color": text_color,
+        "font_size": font_size,
+        "header_bg": header_bg,
+        "name_color": color(["header h1", "h1"], text_color),
+        "name_size": _css_size(prop(["header h1", "h1"], "font-size"), font_size) or font_size * 2,
+        "contact_color": color([".contact-info", "header"], text_color),
+        "contact_link_color": color([".contact-info a", "a"], accent),
+        "h2_color": color(["h2"], text_color),
+        "h2_size": _css_size(prop(["h2"], "font-size"), font_size) or font_size * 1.4,
+        "h2_border": _css_color(prop(["h2"], "border-bottom")) or _css_color(prop(["h2"], "border-bottom-color")),
+        "entry_name_color": color([".entry-name", ".entry-header"], text_color),
+        "entry_details_color": color([".entry-title", ".entry-details"], text_color),
+        "entry_details_size": _css_size(prop([".entry-details"], "font-size"), font_size) or font_size,
+        "link_color": accent,
+        }
+
+
+def _inline(element, link_color: colors.Color) -> str:
+    """Преобразовать содержимое элемента в разметку абзаца reportlab (жирный, курсив, ссылки)"""
+    parts = [escape(element.text or "")]
+    for child in element:
+        tag = child.tag if isinstance(child.tag, str) else ""
+        content = _inline(child, link_color)
+        if tag in ("b", "strong"):
+            parts.append(f"<b>{content}</b>" if content.strip() else content)
+        elif tag in ("i", "em"):
+            # пустые <i> - иконки Font Awesome
+            parts.append(f"<i>{content}</i>" if content.strip() else "")
+        elif tag == "a" and child.get("href"):
+            parts.append(f'<a href="{escape(child.get("href"), {chr(34): "&quot;"})}" '
+                         f'color="{link_color.hexval().replace("0x", "#")}">{content}</a>')
+        elif tag == "br":
+            parts.append("<br/>")
+        elif tag not in ("script", "style"):
+            parts.append(content)
+        parts.append(escape(child.tail or ""))
+    return SPACES_RE.sub(" ", "".join(parts))
+
+
+def _has_class(element, class_name: str) -> bool:
+    """Проверить, есть ли у элемента класс"""
+    return class_name in (element.get("class") or "").split()
+
+
+class ReportlabRenderer:
+    """Класс для построения PDF резюме из HTML средствами reportlab"""
+    def __init__(self, font_path: Optional[str] = None):
+        self.font_name, self.bold_font_name = register_fonts(font_path)
+
+    def render(self, html: str) -> str:
+        """Построить PDF из HTML резюме, возвращает PDF в виде строки base64"""
+        return base64.b64encode(self.build(html)).decode("ascii")
+
+    def build(self, html: str) -> bytes:
+        """Построить PDF из HTML резюме"""
+        tree = lxml_html.fromstring(html)
+        css = "\n".join(style.text_content() for style in tree.xpath("//style"))
+        theme = css_theme(css)
+        styles = self._styles(theme)
+        story = []
+        for header in tree.xpath("//header"):
+            story.extend(self._header(header, styles, theme))
+        for section in tree.xpath("//section"):
+            story.extend(self._section(section, styles, theme))
+        if not story:
+            # разметка не похожа на шаблон резюме - выводим текст как есть
+            story = [Paragraph(_inline(tree, theme["link_color"]), styles["body"])]
+        buffer = io.BytesIO()
+        document = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=PAGE_MARGINS["left"] * inch,
+                                     rightMargin=PAGE_MARGINS["right"] * inch, topMargin=PAGE_MARGINS["top"] * inch,
+                                     bottomMargin=PAGE_MARGINS["bottom"] * inch)
+        document.build(story)
+        return buffer.getvalue()
+
+    def _styles(self, theme: Dict[str, object]) -> Dict[str, ParagraphStyle]:
+        """Создать стили абзацев по цветам и размерам из CSS"""
+        size = theme["font_size"]
+        body = ParagraphStyle("body", fontName=self.font_name, fontSize=size, leading=size * 1.3,
+                              textColor=theme["text_color"])
+        details_size = theme["entry_details_size"]
+        return {
+            "body": body,
+            "name": ParagraphStyle("name", body, fontName=self.bold_font_name, fontSize=theme["name_size"],
+                                   leading=theme["name_size"] * 1.2, alignment=TA_CENTER,
+                                   textColor=theme["name_color"], spaceAfter=size * 0.5),
+            "contact": ParagraphStyle("contact", body, alignment=TA_CENTER, textColor=theme["contact_color"]),
+            "h2": ParagraphStyle("h2", body, fontName=self.bold_font_name, fontSize=theme["h2_size"],
+                                 leading=theme["h2_size"] * 1.2, textColor=theme["h2_color"],
+                                 spaceBefore=size, spaceAfter=2),
+            "entry_name": ParagraphStyle("entry_name", body, fontName=self.bold_font_name,
+                                         textColor=theme["entry_name_color"]),
+            "entry_right": ParagraphStyle("entry_right", body, alignment=TA_RIGHT),
+            "entry_details": ParagraphStyle("entry_details", body, fontSize=details_size,
+                                            leading=details_size * 1.3, textColor=theme["entry_details_color"]),
+            "entry_details_right": ParagraphStyle("entry_details_right", body, fontSize=details_size,
+                                                  leading=details_size * 1.3, alignment=TA_RIGHT,
+                                                  textColor=theme["entry_details_color"]),
+            }
+
+    def _header(self, header, styles: Dict[str, ParagraphStyle], theme: Dict[str, object]) -> list:
+        """Шапка резюме: имя и контакты"""
+        rows = []
+        for h1 in header.xpath(".//h1"):
+            rows.append(Paragraph(_inline(h1, theme["name_color"]), styles["name"]))
+        contacts = [_inline(item, theme["contact_link_color"]).strip()
+                    for info in header.xpath(".//*[contains(concat(' ', @class, ' '), ' contact-info ')]")
+                    for item in info]
+        contacts = [contact for contact in contacts if contact]
+        if contacts:
+            rows.append(Paragraph(" | ".join(contacts), styles["contact"]))
+        if not rows:
+            return []
+        if theme["header_bg"] is None:
+            return rows + [Spacer(1, theme["font_size"] * 0.5)]
+        # шапка с фоном - таблица из одной колонки на всю ширину страницы
+        table = Table([[row] for row in rows], colWidths=["100%"])
+        table.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, -1), theme["header_bg"]),
+            ("TOPPADDING", (0, 0), (-1, -1), 6),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+            ]))
+        return [table, Spacer(1, theme["font_size"] * 0.5)]
+
+    def _section(self, section, styles: Dict[str, ParagraphStyle], theme: Dict[str, object]) -> list:
+        """Раздел резюме: заголовок и записи или списки"""
+        flowables = []
+        for child in section:
+            if not isinstance(child.tag, str):
+                continue
+            if child.tag in ("h1", "h2", "h3"):
+                flowables.append(Paragraph(_inline(child, theme["h2_color"]), styles["h2"]))
+                flowables.append(HRFlowable(width="100%", thickness=1, color=theme["h2_border"] or theme["h2_color"],
+                                            spaceBefore=1, spaceAfter=4))
+            else:
+                flowables.extend(self._block(child, styles, theme))
+        return flowables
+
+    def _block(self, element, styles: Dict[str, ParagraphStyle], theme: Dict[str, object]) -> list:
+        """Блок внутри раздела: запись, список, две колонки или абзац"""
+        if element.tag in ("ul", "ol"):
+            return [self._list(element, styles, theme)]
+        if _has_class(element, "entry"):
+            flowables = []
+            for child in element:
+                if not isinstance(child.tag, str):
+                    continue
+                if _has_class(child, "entry-header"):
+                    flowables.append(self._row(child, styles["entry_name"], styles["entry_right"], theme))
+                elif _has_class(child, "entry-details"):
+                    flowables.append(self._row(child, styles["entry_details"], styles["entry_details_right"], theme))
+                else:
+                    flowables.extend(self._block(child, styles, theme))
+            return flowables + [Spacer(1, theme["font_size"] * 0.4)]
+        if _has_class(element, "two-column"):
+            lists = [self._list(child, styles, theme) for child in element if child.tag in ("ul", "ol")]
+            if lists:
+                table = Table([lists], colWidths=[f"{100 / len(lists):.0f}%"] * len(lists))
+                table.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP"),
+                                           ("LEFTPADDING", (0, 0), (-1, -1), 0)]))
+                return [table]
+        if element.tag == "div" and len(element):
+            return [flowable for child in element if isinstance(child.tag, str)
+                    for flowable in self._block(child, styles, theme)]
+        text = _inline(element, theme["link_color"]).strip()
+        return [Paragraph(text, styles["body"])] if text else []
+
+    def _row(self, element, left_style: ParagraphStyle, right_style: ParagraphStyle,
+             theme: Dict[str, object]) -> Table:
+        """Строка записи: слева название (компания, должность), справа место или годы"""
+        cells = [_inline(child, theme["link_color"]).strip() for child in element if isinstance(child.tag, str)]
+        if not cells:
+            cells = [_inline(element, theme["link_color"]).strip()]
+        left = " ".join(cells[:-1]) if len(cells) > 1 else cells[0]
+        right = cells[-1] if len(cells) > 1 else ""
+        table = Table([[Paragraph(left, left_style), Paragraph(right, right_style)]], colWidths=["70%", "30%"])
+        table.setStyle(TableStyle([("LEFTPADDING", (0, 0), (-1, -1), 0), ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                                   ("TOPPADDING", (0, 0), (-1, -1), 0), ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+                                   ("VALIGN", (0, 0), (-1, -1), "TOP")]))
+        return table
+
+    def _list(self, element, styles: Dict[str, ParagraphStyle], theme: Dict[str, object]) -> ListFlowable:
+        """Маркированный список"""
+        items = [ListItem(Paragraph(_inline(li, theme["link_color"]).strip(), styles["body"]), leftIndent=12)
+                 for li in element if li.tag == "li"]
+        return ListFlowable(items, bulletType="bullet", start="•", leftIndent=12, bulletFontName=self.font_name,
+                            bulletFontSize=theme["font_size"], bulletColor=theme["text_color"])
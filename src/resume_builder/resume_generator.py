@@ -13,9 +13,8 @@ class ResumeGenerator:
                                 <meta name="viewport" content="width=device-width, initial-scale=1.0">
                                 <title>Resume</title>
                                 <link href="https://fonts.googleapis.com/css2?family=Barlow:wght@400;600&display=swap" rel="stylesheet" />
-                                <link href="https://fonts.googleapis.com/css2?family=Barlow:wght@400;600&display=swap" rel="stylesheet" /> 
                                 <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.3/css/all.min.css" /> 
-                                <link rel="stylesheet" href="$style_path">
+                                <style>$style</style>
                             </head>
                             $markdown
                             </body>
@@ -27,14 +26,23 @@ class ResumeGenerator:
         self.resume_object = resume_object
 
     def create_resume(self, gpt_resume_generator: Any, style_path: str, job_description_text: str, temp_html_path):
-        """Генерация резюме"""
+        """Генерация резюме в HTML файл"""
+        message = self.create_resume_html(gpt_resume_generator, style_path, job_description_text)
+        with open(temp_html_path, 'w', encoding='utf-8') as temp_file:
+            temp_file.write(message)
+
+    def create_resume_html(self, gpt_resume_generator: Any, style_path: str, job_description_text: str) -> str:
+        """
+        Генерация резюме в виде HTML строки. Стили встраиваются в HTML,
+        поэтому для печати в PDF не нужны временные файлы
+        """
         gpt_resume_generator.set_job_description_from_text(job_description_text)
-        self._create_resume(gpt_resume_generator, style_path, temp_html_path)
+        return self._create_resume(gpt_resume_generator, style_path)
     
-    def _create_resume(self, gpt_resume_generator: Any, style_path, temp_html_path):
+    def _create_resume(self, gpt_resume_generator: Any, style_path) -> str:
         """Вспомогательный метод для генерации резюме"""
         template = Template(self.html_template)
         html_resume = gpt_resume_generator.generate_html_resume()
-        message = template.substitute(markdown=html_resume, style_path=style_path)
-        with open(temp_html_path, 'w', encoding='utf-8') as temp_file:
-            temp_file.write(message)
+        with open(style_path, 'r', encoding='utf-8') as style_file:
+            style = style_file.read()
+        return template.substitute(markdown=html_resume, style=style)
@@ -1,59 +1,51 @@
-import platform
 import os
-import time
-from selenium.common.exceptions import WebDriverException
+import atexit
+import threading
+from typing import Optional, Union
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium import webdriver
-import time
-from webdriver_manager.chrome import ChromeDriverManager
+from src.utils import chromedriver_path
+from src.resume_builder.pdf_renderer import PDFRenderer
+from src.resume_builder.reportlab_renderer import ReportlabRenderer
+from src.app_config import PDF_RENDERER_BROWSERS_NUM, PDF_BACKEND, PDF_FONT_PATH
+
+_pdf_renderer: Optional[Union[PDFRenderer, ReportlabRenderer]] = None
+_pdf_renderer_lock = threading.Lock()
 
-def create_driver_selenium():
-    """Создание Selenium driver"""
-    options = chrome_browser_options()
 
-    chrome_install = ChromeDriverManager().install()
-    folder = os.path.dirname(chrome_install)
-    if platform.system() == "Windows":
-        chromedriver_path = os.path.join(folder, "chromedriver.exe")
-    else:
-        chromedriver_path = os.path.join(folder, "chromedriver")
-    service = ChromeService(executable_path=chromedriver_path)
+def create_driver_selenium(headless: bool = False):
+    """Создание Selenium driver"""
+    options = chrome_browser_options(headless)
+    service = ChromeService(executable_path=chromedriver_path())
     return webdriver.Chrome(service=service, options=options)
 
+def get_pdf_renderer() -> Union[PDFRenderer, ReportlabRenderer]:
+    """Получить общий для всего приложения сервис печати резюме в PDF (выбирается настройкой PDF_BACKEND)"""
+    global _pdf_renderer
+    with _pdf_renderer_lock:
+        if _pdf_renderer is None and PDF_BACKEND == "reportlab":
+            _pdf_renderer = ReportlabRenderer(PDF_FONT_PATH)
+        elif _pdf_renderer is None:
+            _pdf_renderer = PDFRenderer(lambda: create_driver_selenium(headless=True), PDF_RENDERER_BROWSERS_NUM)
+            atexit.register(_pdf_renderer.close)
+        return _pdf_renderer
+
 def HTML_to_PDF(FilePath):
-    """Проверка и подготовка пути к файлу"""
+    """Напечатать HTML файл в PDF, возвращает PDF в виде строки base64"""
     if not os.path.isfile(FilePath):
         raise FileNotFoundError(f"Файл не найден: {FilePath}")
+    renderer = get_pdf_renderer()
+    if isinstance(renderer, ReportlabRenderer):
+        with open(FilePath, "r", encoding="utf-8") as f:
+            return renderer.render(f.read())
     FilePath = f"file:///{os.path.abspath(FilePath).replace(os.sep, '/')}"
-    driver = create_driver_selenium()
-
-    try:
-        driver.get(FilePath)
-        time.sleep(2)
-        pdf_base64 = driver.execute_cdp_cmd("Page.printToPDF", {
-            "printBackground": True,          # Включить фон при печати
-            "landscape": False,               # Печатать в вертикальной ориентации (False для портретной ориентации)
-            "paperWidth": 8.27,               # Ширина листа в дюймах (A4)
-            "paperHeight": 11.69,             # Высота листа в дюймах (A4)
-            "marginTop": 0.8,                 # Верхнее поле в дюймах 
-            "marginBottom": 0.8,              # Нижнее поле в дюймах
-            "marginLeft": 0.5,                # Левое поле в дюймах
-            "marginRight": 0.5,               # Правое поле в дюймах
-            "displayHeaderFooter": False,     # Не отображать заголовки и нижние колонтитулы
-            "preferCSSPageSize": True,        # Использовать размеры страницы из CSS
-            "generateDocumentOutline": False, # Не генерировать оглавление документа
-            "generateTaggedPDF": False,       # Не генерировать тэгированный PDF
-            "transferMode": "ReturnAsBase64"  # Вернуть PDF в виде строки base64
-        })
-        return pdf_base64['data']
-    except WebDriverException as e:
-        raise RuntimeError(f"Ошибка при работе WebDriver: {e}")
-    finally:
-        driver.quit()
+    return renderer.render_url(FilePath)
 
-def chrome_browser_options():
+def chrome_browser_options(headless: bool = False):
     """Задать настройки браузера Chrome, в котором будет работать Selenium"""
     options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")  # Запускать браузер без окна
     options.add_argument("--start-maximized")  # Avvia il browser a schermo intero
     options.add_argument("--no-sandbox")  # Disabilita la sandboxing per migliorare le prestazioni
     options.add_argument("--disable-dev-shm-usage")  # Utilizza una directory temporanea per la memoria condivisa
@@ -68,7 +60,6 @@ def chrome_browser_options():
     #options.add_argument("--disable-features=VizDisplayCompositor")  # Disabilita il compositore di visualizzazione
     options.add_argument("--no-first-run")  # Disabilita la configurazione iniziale del browser
     options.add_argument("--no-default-browser-check")  # Disabilita il controllo del browser predefinito
-    options.add_argument("--single-process")  # Esegui Chrome in un solo processo
     options.add_argument("--disable-logging")  # Disabilita il logging
     options.add_argument("--disable-autofill")  # Disabilita l'autocompletamento dei moduli
     #options.add_argument("--disable-software-rasterizer")  # Disabilita la rasterizzazione software
@@ -78,8 +69,6 @@ def chrome_browser_options():
     #options.add_argument('--proxy-server=localhost:8081')
     #options.add_experimental_option("useAutomationExtension", False)  # Disabilita l'estensione di automazione di Chrome
     options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])  # Esclude switch della modalità automatica e logging
-
-    options.add_argument("--single-process")  # Esegui Chrome in un solo processo
     return options
 
 def printred(text):
@@ -0,0 +1,174 @@
+"""
+Фоновое создание резюме под вакансии.
+
+Резюме для вакансии (краткое описание вакансии, разделы резюме от LLM и печать в PDF) создается
+в отдельном потоке, а браузер сразу переходит к следующей вакансии. Одновременно создается
+не больше workers_num резюме, а в очереди ждет не больше max_pending, иначе постановка
+в очередь ждет, пока освободится место. Состояние каждой вакансии (в очереди, создается, готово,
+ошибка) сохраняется в базе SQLite, поэтому уже созданные резюме не создаются повторно
+после перезапуска, а резюме с ошибкой - создаются заново. Повторная попытка делается только после
+временных ошибок (превышение лимита запросов, ошибка сервера, таймаут), остальные ошибки не повторяются.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import openai
+from loguru import logger
+
+
+RESUME_STATUSES = ("queued", "running", "done", "failed")
+# коды ответа API (кроме 5xx), после которых запрос можно повторить: таймаут и превышение лимита запросов
+RETRYABLE_STATUS_CODES = (408, 429)
+
+
+def _error_response(error: Exception) -> Optional[httpx.Response]:
+    """Ответ API, вызвавший ошибку (httpx.HTTPStatusError и ошибки клиентов LLM API, например openai.RateLimitError)"""
+    response = getattr(error, "response", None)
+    return response if isinstance(response, httpx.Response) else None
+
+
+def is_transient(error: Exception) -> bool:
+    """Проверить, что ошибка временная и попытку стоит повторить: превышение лимита запросов, ошибка сервера, таймаут"""
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError, openai.APIConnectionError)):
+        return True
+    response = _error_response(error)
+    return response is not None and (response.status_code in RETRYABLE_STATUS_CODES or response.status_code >= 500)
+
+
+def retry_delay(error: Exception, default_sec: float) -> float:
+    """Сколько ждать перед повторной попыткой: при превышении лимита запросов - столько, сколько просит API"""
+    response = _error_response(error)
+    if response is not None and response.status_code == 429:
+        retry_after = response.headers.get("retry-after")
+        retry_after_ms = response.headers.get("retry-after-ms")
+        if retry_after:
+            return float(retry_after)
+        if retry_after_ms:
+            return float(retry_after_ms) / 1000.0
+    return default_sec
+
+
+class ResumeQueue:
+    """Класс для создания резюме в фоновых потоках с учетом состояния каждой вакансии"""
+    def __init__(self, db_path: str, workers_num: int = 2, max_pending: int = 10, max_attempts: int = 3,
+                 retry_delay_sec: float = 20):
+        self.db_path = db_path
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay_sec = retry_delay_sec
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    vacancy TEXT PRIMARY KEY,
+                    company TEXT,
+                    job_title TEXT,
+                    path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at TEXT
+                )""")
+            # резюме, которые не успели создать при прошлом запуске
+            self._conn.execute("UPDATE resumes SET status = 'failed', error = 'Работа прервана' "
+                               "WHERE status IN ('queued', 'running')")
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers_num), thread_name_prefix="resume")
+        # места в очереди: создаваемые резюме и резюме, ожидающие своей очереди
+        self._slots = threading.BoundedSemaphore(max(1, workers_num) + max(0, max_pending))
+        self._futures: List[Future] = []
+        logger.debug(f"Очередь создания резюме открыта: {db_path}")
+
+    def submit(self, vacancy: str, path: str, create: Callable[[], None], company: str = "",
+               job_title: str = "") -> Optional[Future]:
+        """
+        Поставить в очередь создание резюме для вакансии. create создает файл резюме path.
+        Возвращает None, если резюме для вакансии уже создано или создается
+        """
+        status = self.status(vacancy)
+        if status in ("queued", "running") or (status == "done" and os.path.isfile(path)):
+            logger.debug(f"Резюме для вакансии {vacancy} уже {'создано' if status == 'done' else 'в очереди'}")
+            return None
+        # если очередь заполнена - ждем, пока освободится место
+        self._slots.acquire()
+        self._set_status(vacancy, "queued", path=path, company=company, job_title=job_title, attempts=0)
+        future = self._executor.submit(self._run, vacancy, path, create)
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._futures = [item for item in self._futures if not item.done()] + [future]
+        logger.debug(f"Создание резюме для вакансии {vacancy} поставлено в очередь")
+        return future
+
+    def _run(self, vacancy: str, path: str, create: Callable[[], None]) -> bool:
+        """Создать резюме, повторяя попытку при временной ошибке не больше max_attempts раз"""
+        for attempt in range(1, self.max_attempts + 1):
+            self._set_status(vacancy, "running", attempts=attempt)
+            try:
+                create()
+            except Exception as e:
+                tb_str = traceback.format_exc()
+                logger.error(f"Не удалось создать резюме {path} (попытка {attempt} из {self.max_attempts}): {tb_str}")
+                self._set_status(vacancy, "failed", error=str(e))
+                if not is_transient(e):
+                    # например, слишком большой файл резюме - повторная попытка закончится так же
+                    return False
+                if attempt < self.max_attempts:
+                    delay = retry_delay(e, self.retry_delay_sec)
+                    logger.warning(f"Повторим создание резюме через {delay} секунд")
+                    time.sleep(delay)
+                continue
+            self._set_status(vacancy, "done", error=None)
+            logger.info(f"Резюме создано и сохранено: {path}")
+            return True
+        return False
+
+    def _set_status(self, vacancy: str, status: str, **fields: Any) -> None:
+        """Сохранить состояние резюме для вакансии"""
+        fields["status"] = status
+        fields["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self._conn:
+            exists = self._conn.execute("SELECT 1 FROM resumes WHERE vacancy = ?", (vacancy,)).fetchone()
+            if exists:
+                assignments = ", ".join(f"{name} = ?" for name in fields)
+                self._conn.execute(f"UPDATE resumes SET {assignments} WHERE vacancy = ?", [*fields.values(), vacancy])
+            else:
+                fields["vacancy"] = vacancy
+                self._conn.execute(f"INSERT INTO resumes ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})",
+                                   list(fields.values()))
+
+    def status(self, vacancy: str) -> Optional[str]:
+        """Получить состояние резюме для вакансии: queued, running, done, failed или None"""
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM resumes WHERE vacancy = ?", (vacancy,)).fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Получить число резюме в каждом состоянии"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM resumes GROUP BY status").fetchall()
+        return {status: dict(rows).get(status, 0) for status in RESUME_STATUSES}
+
+    def wait(self) -> None:
+        """Дождаться создания всех резюме из очереди"""
+        with self._lock:
+            futures = list(self._futures)
+        if futures:
+            logger.info(f"Ждем завершения создания {sum(not future.done() for future in futures)} резюме")
+            wait(futures)
+        logger.debug(f"Состояние очереди резюме: {self.counts()}")
+
+    def close(self) -> None:
+        """Дождаться создания всех резюме и закрыть соединение с базой"""
+        self.wait()
+        self._executor.shutdown()
+        with self._lock:
+            self._conn.close()
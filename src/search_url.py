@@ -0,0 +1,163 @@
+"""
+Адрес страницы результатов поиска hh.ru по настройкам из search_config.yaml.
+
+Вместо заполнения формы расширенного поиска (десятки кликов с паузами) настройки поиска
+переводятся в параметры запроса hh.ru, и результаты поиска открываются одним driver.get.
+Значения параметров совпадают с теми, что подставляет в адрес сама форма расширенного поиска.
+Регионы, метро, специализация и отрасль в адресе задаются идентификаторами hh.ru
+(названия переводятся в идентификаторы по локальному справочнику, см. src/taxonomy.py):
+если название не удалось перевести в идентификатор - адрес не собирается (SearchUrlError),
+и настройки задаются через форму, как раньше. Районов в выгрузках API hh.ru нет,
+поэтому районы всегда задаются через форму расширенного поиска.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+SEARCH_URL = "https://hh.ru/search/vacancy"
+
+# настройки, где выбирается одно значение: параметр запроса и значения для каждого варианта
+SINGLE_CHOICE_PARAMS = {
+    "experience": ("experience", {
+        "doesnt_matter": None,
+        "no_experience": "noExperience",
+        "between_1_and_3": "between1And3",
+        "between_3_and_6": "between3And6",
+        "6_and_more": "moreThan6",
+        }),
+    "sort_by": ("order_by", {
+        "relevance": "relevance",
+        "publication_time": "publication_time",
+        "salary_desc": "salary_desc",
+        "salary_asc": "salary_asc",
+        }),
+    "output_period": ("search_period", {
+        "all_time": "0",
+        "month": "30",
+        "week": "7",
+        "three_days": "3",
+        "one_day": "1",
+        }),
+    "output_size": ("items_on_page", {
+        "show_20": "20",
+        "show_50": "50",
+        "show_100": "100",
+        }),
+    }
+# настройки, где можно выбрать несколько значений
+MULTIPLE_CHOICE_PARAMS = {
+    "search_only": ("search_field", {
+        "vacancy_name": "name",
+        "company_name": "company_name",
+        "vacancy_description": "description",
+        }),
+    "education": ("education", {
+        "not_needed": "not_required_or_not_specified",
+        "middle": "special_secondary",
+        "higher": "higher",
+        }),
+    "job_type": ("employment", {
+        "full_time": "full",
+        "part_time": "part",
+        "project": "project",
+        "volunteer": "volunteer",
+        "probation": "probation",
+        }),
+    "work_schedule": ("schedule", {
+        "full_day": "fullDay",
+        "shift": "shift",
+        "flexible": "flexible",
+        "remote": "remote",
+        "fly_in_fly_out": "flyInFlyOut",
+        }),
+    "side_job": ("part_time", {
+        "project": "employment_project",
+        "part": "employment_part",
+        "from_4_hours_per_day": "from_four_to_six_hours_in_a_day",
+        "weekend": "only_saturday_and_sunday",
+        "evenings": "start_after_sixteen",
+        }),
+    "other_params": ("label", {
+        "with_address": "with_address",
+        "accept_handicapped": "accept_handicapped",
+        "not_from_agency": "not_from_agency",
+        "accept_kids": "accept_kids",
+        "accredited_it": "accredited_it",
+        "low_performance": "low_performance",
+        }),
+    }
+# настройки, которые задаются названиями: параметр запроса и вид справочника hh.ru.
+# Регионы переводятся раньше метро: станции ищутся в выбранных регионах
+NAMED_PARAMS = {
+    "specialization": ("professional_role", "professional_role"),
+    "industry": ("industry", "industry"),
+    "regions": ("area", "area"),
+    "subway": ("metro", "metro"),
+    }
+# настройки, которые можно задать только через форму расширенного поиска
+FORM_ONLY_PARAMS = ("districts",)
+HH_ID_RE = re.compile(r"^\d+(\.\d+)*$")
+
+
+class SearchUrlError(ValueError):
+    """Настройки поиска нельзя перевести в адрес страницы поиска"""
+
+
+def resolve_id(kind: str, name: str, areas: Iterable[str] = ()) -> Optional[str]:
+    """
+    Получить идентификатор hh.ru по названию. areas - идентификаторы выбранных регионов.
+    Без справочника понимаются только сами идентификаторы
+    """
+    name = str(name).strip()
+    return name if HH_ID_RE.match(name) else None
+
+
+def build_search_params(parameters: Dict[str, Any], resume_id: Optional[str] = None,
+                        resolve: Callable[..., Optional[str]] = resolve_id) -> List[Tuple[str, str]]:
+    """Перевести настройки поиска в параметры запроса hh.ru"""
+    form_only = [key for key in FORM_ONLY_PARAMS if parameters.get(key)]
+    if form_only:
+        raise SearchUrlError(f"Настройки {', '.join(form_only)} задаются только через форму расширенного поиска")
+    params = []
+    if parameters.get("keywords"):
+        params.append(("text", ", ".join(parameters["keywords"])))
+    if parameters.get("words_to_exclude"):
+        params.append(("excluded_text", ", ".join(parameters["words_to_exclude"])))
+    for key, (param, values) in SINGLE_CHOICE_PARAMS.items():
+        for choice, enabled in (parameters.get(key) or {}).items():
+            if enabled is True:
+                if values.get(choice) is not None:
+                    params.append((param, values[choice]))
+                break
+    for key, (param, values) in MULTIPLE_CHOICE_PARAMS.items():
+        params.extend((param, values[choice]) for choice, enabled in (parameters.get(key) or {}).items()
+                      if enabled is True and choice in values)
+    if (parameters.get("job_type") or {}).get("civil_law_contract") is True:
+        params.append(("accept_temporary", "true"))
+    if parameters.get("income", 0) > 0:
+        params.append(("salary", str(parameters["income"])))
+    unresolved = []
+    areas = []
+    for key, (param, kind) in NAMED_PARAMS.items():
+        names = parameters.get(key) or []
+        for name in [names] if isinstance(names, str) else names:
+            hh_id = resolve(kind, name, areas)
+            if hh_id is None:
+                unresolved.append(f"{key}: {name}")
+            else:
+                params.append((param, hh_id))
+                if kind == "area":
+                    areas.append(hh_id)
+    if unresolved:
+        raise SearchUrlError(f"Не найдены идентификаторы hh.ru для {', '.join(unresolved)}")
+    if resume_id:
+        params.append(("resume", resume_id))
+    return params
+
+
+def build_search_url(parameters: Dict[str, Any], resume_id: Optional[str] = None,
+                     resolve: Callable[..., Optional[str]] = resolve_id) -> str:
+    """Собрать адрес страницы результатов поиска hh.ru по настройкам поиска"""
+    return f"{SEARCH_URL}?{urlencode(build_search_params(parameters, resume_id, resolve))}"
@@ -0,0 +1,176 @@
+"""
+Кэш ответов на похожие по смыслу вопросы.
+
+Работодатели задают один и тот же вопрос разными словами, поэтому точный поиск
+по тексту вопроса часто промахивается. Здесь вопросы переводятся в векторы хэшированных
+символьных n-грамм (полностью локально, без обращения к LLM), складываются в индекс FAISS,
+и если для нового вопроса нашелся достаточно похожий старый - используется его ответ.
+Вопросы, которые отличаются только названием технологии или числом ("Сколько лет вы работаете
+с Python?" и "... с Go?"), очень похожи по n-граммам, поэтому такие совпадения отбрасываются.
+
+Векторы вопросов дописываются в конец файла (как и сами вопросы в JSONL файл), а индексы FAISS
+строятся в памяти отдельно для каждой пары (логин, резюме) при запуске.
+"""
+
+import os
+import re
+import json
+import zlib
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from loguru import logger
+
+from src.utils import sanitize_text
+
+
+# поля записи о вопросе в файле вопросов
+META_FIELDS = ("login", "job_title", "question", "answer")
+# слова из латинских букв и цифр: названия технологий (python, c++, node.js, 1c) и числа
+DISTINCT_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[+#]+|\.[a-z0-9]+)*")
+
+
+def distinct_tokens(text: str) -> FrozenSet[str]:
+    """Слова вопроса, которые должны совпадать у похожих вопросов: названия технологий и числа"""
+    return frozenset(DISTINCT_TOKEN_RE.findall(sanitize_text(text)))
+
+
+class HashedNgramVectorizer:
+    """Перевод текста в вектор хэшированных символьных n-грамм"""
+    def __init__(self, dim: int = 2048, ngram_range: Tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def transform(self, text: str) -> np.ndarray:
+        """Получить нормированный вектор текста"""
+        # знаки препинания не влияют на смысл вопроса
+        text = re.sub(r"[^\w\s]", " ", sanitize_text(text))
+        text = f" {' '.join(text.split())} "
+        vector = np.zeros(self.dim, dtype=np.float32)
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(text) - n + 1):
+                # crc32 вместо hash(), чтобы векторы не менялись между запусками
+                vector[zlib.crc32(text[i:i + n].encode("utf-8")) % self.dim] += 1
+        np.log1p(vector, out=vector)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class SemanticAnswerCache:
+    """Класс для поиска ответов на похожие вопросы через индексы FAISS"""
+    # сколько ближайших вопросов того же логина и резюме просматривать при поиске
+    search_depth = 32
+
+    def __init__(self, vectors_path: str, meta_path: str, threshold: float, vectorizer: HashedNgramVectorizer = None):
+        self.vectors_path = vectors_path
+        self.meta_path = meta_path
+        self.threshold = threshold
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        self._lock = threading.Lock()
+        self._indexes: Dict[Tuple[str, str], faiss.IndexFlatIP] = {}
+        self._metas: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+        self._size = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _load(self) -> None:
+        """Загрузить вопросы и их векторы, при необходимости досчитать недостающие векторы"""
+        metas = []
+        if os.path.isfile(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        meta = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    # запись без логина, резюме, вопроса или ответа пропускаем так же, как поврежденную строку
+                    if isinstance(meta, dict) and all(isinstance(meta.get(field), str) for field in META_FIELDS):
+                        metas.append(meta)
+        vectors = np.zeros((0, self.vectorizer.dim), dtype=np.float32)
+        if os.path.isfile(self.vectors_path):
+            saved = np.fromfile(self.vectors_path, dtype=np.float32)
+            if saved.size % self.vectorizer.dim == 0:
+                vectors = saved.reshape(-1, self.vectorizer.dim)
+            else:
+                logger.error(f"Файл векторов {self.vectors_path} поврежден, считаем векторы заново")
+        if len(vectors) > len(metas):
+            # векторов больше, чем вопросов - файлы не соответствуют друг другу, считаем векторы заново
+            vectors = vectors[:0]
+            os.remove(self.vectors_path)
+        # если векторы отстают от списка вопросов (например, после сбоя) - досчитываем их
+        missing = metas[len(vectors):]
+        if missing:
+            missing_vectors = np.stack([self.vectorizer.transform(m["question"]) for m in missing])
+            self._append_vectors(missing_vectors)
+            vectors = np.concatenate([vectors, missing_vectors])
+        self._add_to_indexes(metas, vectors)
+        logger.debug(f"Загружено {len(self)} вопросов в семантический кэш ответов")
+
+    def _append_vectors(self, vectors: np.ndarray) -> None:
+        """Дописать векторы в конец файла векторов"""
+        os.makedirs(os.path.dirname(self.vectors_path) or ".", exist_ok=True)
+        with open(self.vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+
+    def _add_to_indexes(self, metas: List[Dict[str, str]], vectors: np.ndarray) -> None:
+        """Добавить вопросы в индексы их логинов и резюме"""
+        positions: Dict[Tuple[str, str], List[int]] = {}
+        for position, meta in enumerate(metas):
+            positions.setdefault((meta["login"], meta["job_title"]), []).append(position)
+        for key, key_positions in positions.items():
+            if key not in self._indexes:
+                self._indexes[key] = faiss.IndexFlatIP(self.vectorizer.dim)
+                self._metas[key] = []
+            self._indexes[key].add(vectors[key_positions])
+            self._metas[key].extend(metas[position] for position in key_positions)
+        self._size += len(metas)
+
+    def find(self, login: str, job_title: str, question: str) -> Optional[str]:
+        """
+        Найти ответ на самый похожий вопрос того же логина и резюме, если его сходство не ниже порога,
+        а названия технологий и числа в вопросах совпадают
+        """
+        key = (login, job_title)
+        if key not in self._indexes:
+            return None
+        vector = self.vectorizer.transform(question).reshape(1, -1)
+        tokens = distinct_tokens(question)
+        with self._lock:
+            index = self._indexes[key]
+            scores, ids = index.search(vector, min(self.search_depth, index.ntotal))
+            for score, idx in zip(scores[0], ids[0]):
+                if idx < 0 or score < self.threshold:
+                    break
+                meta = self._metas[key][idx]
+                if distinct_tokens(meta["question"]) != tokens:
+                    logger.debug(f"Похожий вопрос (сходство {score:.2f}) отличается технологией или числом: {meta['question']}")
+                    continue
+                logger.debug(f"Найден похожий вопрос (сходство {score:.2f}): {meta['question']}")
+                return meta["answer"]
+        return None
+
+    def add(self, login: str, job_title: str, question: str, answer: str) -> None:
+        """Добавить вопрос и ответ на него в кэш"""
+        self.add_many([(login, job_title, question, answer)])
+
+    def add_many(self, records: List[Tuple[str, str, str, str]]) -> None:
+        """Добавить в кэш несколько вопросов с ответами"""
+        if not records:
+            return
+        metas = [{"login": login, "job_title": job_title, "question": question, "answer": answer}
+                 for login, job_title, question, answer in records]
+        vectors = np.stack([self.vectorizer.transform(m["question"]) for m in metas])
+        with self._lock:
+            # сначала вопросы, затем векторы: недостающие после сбоя векторы досчитываются при запуске
+            os.makedirs(os.path.dirname(self.meta_path) or ".", exist_ok=True)
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(m, ensure_ascii=False) + "\n" for m in metas)
+            self._append_vectors(vectors)
+            self._add_to_indexes(metas, vectors)
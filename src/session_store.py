@@ -0,0 +1,65 @@
+"""
+Хранилище сессий hh.ru: cookies и localStorage после входа на сайт, отдельно для каждого логина.
+
+При запуске сессия восстанавливается в браузер без ручного входа, в том числе в дополнительных
+браузерах (копиях профиля Chrome) и профилях кампаний с тем же логином.
+В файле хранятся данные для входа в аккаунт - не передавайте его другим людям.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+
+class SessionStore:
+    """Класс для хранения cookies и localStorage сессий hh.ru"""
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        if os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._sessions = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Не удалось прочитать сохраненные сессии {path}: {str(e)}")
+
+    def get(self, login: str) -> Optional[Dict[str, Any]]:
+        """Получить сохраненную сессию: cookies (без истекших) и localStorage"""
+        with self._lock:
+            session = self._sessions.get(login)
+        if session is None:
+            return None
+        now = time.time()
+        cookies = [cookie for cookie in session["cookies"] if cookie.get("expires", -1) <= 0 or cookie["expires"] > now]
+        return {"cookies": cookies, "local_storage": session.get("local_storage", {})}
+
+    def save(self, login: str, cookies: List[Dict[str, Any]], local_storage: Dict[str, str]) -> None:
+        """Сохранить сессию"""
+        with self._lock:
+            self._sessions[login] = {
+                "cookies": cookies,
+                "local_storage": local_storage,
+                "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                }
+            self._write()
+        logger.debug(f"Сессия для {login} сохранена ({len(cookies)} cookies)")
+
+    def delete(self, login: str) -> None:
+        """Удалить сессию, которая больше не действует"""
+        with self._lock:
+            if self._sessions.pop(login, None) is not None:
+                self._write()
+
+    def _write(self) -> None:
+        """Записать сессии в файл через временный файл, чтобы не повредить его при сбое"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._sessions, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
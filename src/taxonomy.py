@@ -0,0 +1,277 @@
+"""
+Локальный справочник hh.ru: регионы, специализации, отрасли и станции метро.
+
+Названия из search_config.yaml переводятся в идентификаторы hh.ru без обращения к сайту:
+сначала ищется точное совпадение (без учета регистра, ё/е и знаков препинания), затем название,
+содержащее все слова из настройки (только для специализаций и отраслей), и, наконец, название
+с опечаткой (расстояние Левенштейна). Станции метро ищутся в городах, выбранных в настройках.
+Если название подходит к нескольким записям, идентификатор не выбирается наугад.
+Найденные идентификаторы запоминаются, поэтому повторный поиск занимает микросекунды.
+
+Вместе с приложением поставляется небольшой справочник src/hh_taxonomy.json. Полный справочник
+собирается из выгрузок API hh.ru (/areas, /professional_roles, /industries, /metro)
+и сохраняется в TAXONOMY_PATH. Выгрузки можно скачать сразу или передать сохраненными файлами:
+    python -m src.taxonomy --fetch
+    python -m src.taxonomy <файлы выгрузки> ...
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import httpx
+from loguru import logger
+
+from src.app_config import TAXONOMY_PATH
+
+
+TAXONOMY_KINDS = ("area", "professional_role", "industry", "metro")
+# справочники, в которых название ищется и по части слов ("Программист" -> "Программист, разработчик").
+# Названия городов и станций ищутся только целиком: "Новгород" - это не "Нижний Новгород"
+PARTIAL_MATCH_KINDS = ("professional_role", "industry")
+SEED_PATH = Path(__file__).with_name("hh_taxonomy.json")
+# API hh.ru и справочники, из которых собирается полный справочник
+HH_API_URL = "https://api.hh.ru"
+HH_DUMP_ENDPOINTS = ("areas", "professional_roles", "industries", "metro")
+# API hh.ru отклоняет запросы без User-Agent
+HH_API_USER_AGENT = "XXAutoJobsApplierPro/1.0"
+HH_ID_RE = re.compile(r"^\d+(\.\d+)*$")
+NOT_WORD_RE = re.compile(r"[\W_]+")
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+class TaxonomyMatch(NamedTuple):
+    """Найденная запись справочника"""
+    id: Optional[str]
+    name: str
+    # название найдено только с учетом опечатки
+    typo: bool
+    # название подходит к нескольким записям (например, станции с одинаковым названием в разных городах):
+    # названия этих записей, id = None
+    ambiguous: Tuple[str, ...] = ()
+
+
+def normalize(name: str) -> str:
+    """Привести название к виду для сравнения: нижний регистр, ё -> е, без знаков препинания"""
+    return NOT_WORD_RE.sub(" ", str(name).lower().replace("ё", "е")).strip()
+
+
+def levenshtein(a: str, b: str, max_distance: int) -> int:
+    """Расстояние Левенштейна между строками. Если оно больше max_distance - возвращается max_distance + 1"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        # все варианты уже дальше max_distance - дальше считать не нужно
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
+
+
+class TaxonomyIndex:
+    """Класс для поиска идентификаторов hh.ru по названиям"""
+    def __init__(self, data: Dict[str, Any]):
+        self.version = data.get("version", "")
+        self._titles: Dict[str, Dict[str, str]] = {kind: {} for kind in TAXONOMY_KINDS}
+        # город записи (для станций метро)
+        self._areas: Dict[str, Dict[str, str]] = {kind: {} for kind in TAXONOMY_KINDS}
+        # нормализованное название -> идентификаторы всех записей с таким названием
+        self._names: Dict[str, Dict[str, List[str]]] = {kind: {} for kind in TAXONOMY_KINDS}
+        self._cache: Dict[Tuple[str, str, Tuple[str, ...]], Optional[TaxonomyMatch]] = {}
+        self.update(data)
+
+    @classmethod
+    def load(cls, paths: Iterable[Any]) -> "TaxonomyIndex":
+        """Загрузить справочник из файлов. Записи из следующих файлов заменяют записи из предыдущих"""
+        index = cls({})
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                index.update(json.load(f))
+            logger.debug(f"Загружен справочник hh.ru {path}, версия {index.version}")
+        return index
+
+    def update(self, data: Dict[str, Any]) -> None:
+        """
+        Добавить записи в справочник. Запись - название или {"name": название, "area": город}
+        """
+        self.version = data.get("version", self.version)
+        for kind in TAXONOMY_KINDS:
+            titles, areas, names = self._titles[kind], self._areas[kind], self._names[kind]
+            for hh_id, entry in data.get(kind, {}).items():
+                hh_id = str(hh_id)
+                name, area = (entry["name"], entry.get("area")) if isinstance(entry, dict) else (entry, None)
+                if hh_id in titles:
+                    names[normalize(titles[hh_id])].remove(hh_id)
+                titles[hh_id] = name
+                if area is None:
+                    areas.pop(hh_id, None)
+                else:
+                    areas[hh_id] = str(area)
+                names.setdefault(normalize(name), []).append(hh_id)
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return sum(len(titles) for titles in self._titles.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Справочник в виде словаря для сохранения в JSON"""
+        data = {"version": self.version}
+        for kind in TAXONOMY_KINDS:
+            areas = self._areas[kind]
+            data[kind] = {hh_id: {"name": name, "area": areas[hh_id]} if hh_id in areas else name
+                          for hh_id, name in self._titles[kind].items()}
+        return data
+
+    def find(self, kind: str, name: str, areas: Iterable[str] = ()) -> Optional[TaxonomyMatch]:
+        """
+        Найти запись справочника по названию или идентификатору.
+        areas - идентификаторы выбранных регионов: станции метро ищутся только в них,
+        если для этих регионов в справочнике есть станции
+        """
+        key = (kind, normalize(name), tuple(sorted(set(areas))))
+        if key not in self._cache:
+            self._cache[key] = self._find(kind, str(name).strip(), key[1], set(key[2]))
+        return self._cache[key]
+
+    def resolve(self, kind: str, name: str, areas: Iterable[str] = ()) -> Optional[str]:
+        """Получить идентификатор hh.ru по названию. Если название подходит к нескольким записям - None"""
+        match = self.find(kind, name, areas)
+        return match.id if match else None
+
+    def _find(self, kind: str, name: str, normalized: str, areas: Set[str]) -> Optional[TaxonomyMatch]:
+        """Поиск без учета запомненных результатов"""
+        titles = self._titles[kind]
+        # в настройках уже указан идентификатор
+        if HH_ID_RE.match(name):
+            return TaxonomyMatch(name, titles.get(name, name), False)
+        if not normalized:
+            return None
+        entry_areas = self._areas[kind]
+        if areas and any(area in areas for area in entry_areas.values()):
+            names = {candidate: [hh_id for hh_id in ids if entry_areas.get(hh_id) in areas]
+                     for candidate, ids in self._names[kind].items()}
+        else:
+            names = self._names[kind]
+        if names.get(normalized):
+            return self._match(kind, names[normalized], False)
+        # название, в котором есть все слова из настройки, например "Программист" -> "Программист, разработчик"
+        if kind in PARTIAL_MATCH_KINDS:
+            words = set(normalized.split())
+            ids = [hh_id for candidate, candidate_ids in names.items() if words <= set(candidate.split())
+                   for hh_id in candidate_ids]
+            if ids:
+                return self._match(kind, ids, False)
+        # название с опечаткой: не больше одной ошибки на каждые 4 буквы
+        max_distance = max(1, len(normalized) // 4)
+        best_distance, best_ids = max_distance + 1, []
+        for candidate, candidate_ids in names.items():
+            if not candidate_ids:
+                continue
+            distance = levenshtein(normalized, candidate, min(max_distance, best_distance))
+            if distance < best_distance:
+                best_distance, best_ids = distance, list(candidate_ids)
+            elif distance == best_distance <= max_distance:
+                best_ids.extend(candidate_ids)
+        if not best_ids:
+            return None
+        return self._match(kind, best_ids, True)
+
+    def _match(self, kind: str, ids: List[str], typo: bool) -> TaxonomyMatch:
+        """Запись справочника или, если подходят несколько записей, список их названий"""
+        titles = self._titles[kind]
+        if len(ids) == 1:
+            return TaxonomyMatch(ids[0], titles[ids[0]], typo)
+        ambiguous = tuple(f"{titles[hh_id]} ({hh_id})" for hh_id in ids)
+        return TaxonomyMatch(None, titles[ids[0]], typo, ambiguous)
+
+
+def parse_hh_dump(data: Any) -> Dict[str, Dict[str, str]]:
+    """Получить записи справочника из выгрузки API hh.ru (/areas, /professional_roles, /industries или /metro)"""
+    if isinstance(data, dict) and "categories" in data:
+        return {"professional_role": {str(role["id"]): role["name"] for category in data["categories"]
+                                      for role in category.get("roles", [])}}
+    if not isinstance(data, list) or not data:
+        raise ValueError("Неизвестный формат выгрузки API hh.ru")
+    if "lines" in data[0]:
+        # станции с одинаковыми названиями есть в разных городах, поэтому у станции сохраняется ее город
+        return {"metro": {str(station["id"]): {"name": station["name"], "area": str(city["id"])}
+                          for city in data for line in city.get("lines", []) for station in line.get("stations", [])}}
+    if "industries" in data[0]:
+        industries = {}
+        for industry in data:
+            industries[str(industry["id"])] = industry["name"]
+            industries.update({str(child["id"]): child["name"] for child in industry.get("industries", [])})
+        return {"industry": industries}
+    if "areas" in data[0]:
+        areas = {}
+        stack = list(data)
+        while stack:
+            area = stack.pop(0)
+            areas[str(area["id"])] = area["name"]
+            stack.extend(area.get("areas", []))
+        return {"area": areas}
+    raise ValueError("Неизвестный формат выгрузки API hh.ru")
+
+
+def taxonomy_paths() -> List[Any]:
+    """Файлы справочника: поставляемый с приложением и собранный из выгрузок API hh.ru"""
+    return [SEED_PATH] + ([TAXONOMY_PATH] if os.path.isfile(TAXONOMY_PATH) else [])
+
+
+def get_taxonomy() -> TaxonomyIndex:
+    """Получить общий для всего приложения справочник hh.ru"""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            _taxonomy = TaxonomyIndex.load(taxonomy_paths())
+        return _taxonomy
+
+
+def fetch_hh_dumps(transport: Optional[httpx.BaseTransport] = None) -> List[Any]:
+    """Скачать выгрузки справочников из API hh.ru"""
+    dumps = []
+    with httpx.Client(base_url=HH_API_URL, headers={"User-Agent": HH_API_USER_AGENT},
+                      timeout=30, transport=transport) as client:
+        for endpoint in HH_DUMP_ENDPOINTS:
+            logger.debug(f"Скачиваем справочник {HH_API_URL}/{endpoint}")
+            response = client.get(f"/{endpoint}")
+            response.raise_for_status()
+            dumps.append(response.json())
+    return dumps
+
+
+def save_taxonomy(dumps: Iterable[Any], path: Any = TAXONOMY_PATH) -> TaxonomyIndex:
+    """Добавить выгрузки API hh.ru к справочнику и сохранить его в файл"""
+    taxonomy = TaxonomyIndex.load(taxonomy_paths())
+    for dump in dumps:
+        taxonomy.update(parse_hh_dump(dump))
+    taxonomy.version = date.today().isoformat()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(taxonomy.to_dict(), f, ensure_ascii=False, indent=2)
+    logger.info(f"Справочник hh.ru сохранен в {path}: {len(taxonomy)} записей, версия {taxonomy.version}")
+    return taxonomy
+
+
+def _load_dump(dump_path: str) -> Any:
+    """Прочитать сохраненную выгрузку API hh.ru"""
+    with open(dump_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Использование: python -m src.taxonomy --fetch | <файлы выгрузки API hh.ru> ...")
+        sys.exit(1)
+    save_taxonomy(fetch_hh_dumps() if sys.argv[1:] == ["--fetch"] else map(_load_dump, sys.argv[1:]))
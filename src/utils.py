@@ -1,9 +1,15 @@
 import os
+import re
 import sys
+import shutil
+import platform
+import threading
+from typing import Any, Callable
 
 from selenium import webdriver
+from webdriver_manager.chrome import ChromeDriverManager
 from loguru import logger
-from src.app_config import MINIMUM_LOG_LEVEL
+from src.app_config import MINIMUM_LOG_LEVEL, CHROMEDRIVER_PATH
 
 
 log_file = "app_log.log"
@@ -17,24 +23,108 @@ else:
     logger.add(sys.stderr, level="DEBUG")
 
 chromeProfilePath = os.path.join(os.getcwd(), "chrome_profile", "hh_profile")
+# профили Chrome кампаний, запущенных из файла campaigns.yaml
+chromeCampaignProfilesPath = os.path.join(os.getcwd(), "chrome_profile_campaigns")
+# файлы блокировки профиля и кэши, которые не нужно копировать
+CHROME_PROFILE_IGNORE = shutil.ignore_patterns("Singleton*", "lockfile", "*.lock", "Cache", "Code Cache",
+                                               "GPUCache", "ShaderCache", "GrShaderCache", "Service Worker")
 
-def ensure_chrome_profile() -> str:
+# путь к chromedriver, найденный при прошлом запуске
+chromedriverCachePath = os.path.join(os.getcwd(), "chrome_profile", "chromedriver_path.txt")
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+# управляющие символы, которые удаляются из текста при очистке
+CONTROL_CHARS_RE = re.compile(r'[\x00-\x1F\x7F]')
+
+# хранилища, открытые в процессе, по классу и абсолютным путям к файлам
+_shared_stores = {}
+_shared_stores_lock = threading.Lock()
+
+
+def sanitize_text(text: str) -> str:
+    """Очистить текст вопроса/ответа для сравнения"""
+    sanitized_text = text.lower().strip().replace('"', '').replace('\\', '')
+    sanitized_text = CONTROL_CHARS_RE.sub('', sanitized_text).replace('\n', ' ').replace('\r', '').rstrip(',')
+    return sanitized_text
+
+
+def open_shared(store_class: Callable[..., Any], *args: Any) -> Any:
+    """
+    Открыть хранилище (журнал откликов, очередь вакансий и т.д.) один раз на процесс.
+    Кампании и браузеры, запущенные в одном процессе, работают с одним объектом хранилища,
+    а не перезаписывают одни и те же файлы независимо друг от друга
+    """
+    key = (store_class, tuple(os.path.abspath(arg) if isinstance(arg, (str, os.PathLike)) else arg for arg in args))
+    with _shared_stores_lock:
+        if key not in _shared_stores:
+            _shared_stores[key] = store_class(*args)
+        return _shared_stores[key]
+
+
+def chromedriver_path(refresh: bool = False) -> str:
+    """
+    Получить путь к chromedriver: путь из CHROMEDRIVER_PATH, путь, найденный при прошлом запуске
+    (без обращения к сети), или chromedriver, загруженный webdriver_manager.
+    refresh=True - загрузить chromedriver заново, например, если Chrome обновился
+    """
+    global _chromedriver_path
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+    with _chromedriver_lock:
+        if not refresh and _chromedriver_path is None and os.path.isfile(chromedriverCachePath):
+            with open(chromedriverCachePath, "r", encoding="utf-8") as f:
+                cached_path = f.read().strip()
+            if os.path.isfile(cached_path):
+                _chromedriver_path = cached_path
+        if refresh or _chromedriver_path is None:
+            logger.debug("Ищем подходящий chromedriver через webdriver_manager")
+            # install может вернуть путь к другому файлу из архива chromedriver
+            folder = os.path.dirname(ChromeDriverManager().install())
+            _chromedriver_path = os.path.join(folder, "chromedriver.exe" if platform.system() == "Windows" else "chromedriver")
+            os.makedirs(os.path.dirname(chromedriverCachePath), exist_ok=True)
+            with open(chromedriverCachePath, "w", encoding="utf-8") as f:
+                f.write(_chromedriver_path)
+        return _chromedriver_path
+
+
+def ensure_chrome_profile(profile_path: str = chromeProfilePath) -> str:
     """Проверяем, что профиль Chrome существует"""
-    logger.debug(f"Проверяем, что профиль Chrome существует по пути: {chromeProfilePath}")
-    profile_dir = os.path.dirname(chromeProfilePath)
+    logger.debug(f"Проверяем, что профиль Chrome существует по пути: {profile_path}")
+    profile_dir = os.path.dirname(profile_path)
     if not os.path.exists(profile_dir):
         os.makedirs(profile_dir)
         logger.debug(f"Created directory for Chrome profile: {profile_dir}")
-    if not os.path.exists(chromeProfilePath):
-        os.makedirs(chromeProfilePath)
-        logger.debug(f"Created Chrome profile directory: {chromeProfilePath}")
-    return chromeProfilePath
+    if not os.path.exists(profile_path):
+        os.makedirs(profile_path)
+        logger.debug(f"Created Chrome profile directory: {profile_path}")
+    return profile_path
+
+
+def campaign_chrome_profile(campaign_name: str) -> str:
+    """Получить путь к профилю Chrome кампании. У каждой кампании свой профиль и свои данные для входа"""
+    return ensure_chrome_profile(os.path.join(chromeCampaignProfilesPath, campaign_name, "hh_profile"))
+
+
+def copy_chrome_profile(worker_id: int, profile_path: str = chromeProfilePath) -> str:
+    """
+    Скопировать профиль Chrome (вместе с данными для входа на сайт) для дополнительного браузера.
+    Два запущенных браузера не могут использовать одну папку профиля, поэтому у каждого браузера своя копия
+    """
+    ensure_chrome_profile(profile_path)
+    user_data_dir = os.path.join(os.path.dirname(profile_path) + "_workers", f"worker_{worker_id}")
+    logger.debug(f"Копируем профиль Chrome в папку: {user_data_dir}")
+    shutil.copytree(os.path.dirname(profile_path), user_data_dir, ignore=CHROME_PROFILE_IGNORE, dirs_exist_ok=True)
+    return os.path.join(user_data_dir, os.path.basename(profile_path))
 
 
-def chrome_browser_options() -> webdriver.ChromeOptions:
-    """Задать настройки браузера Chrome, в котором будет работать Selenium"""
+def chrome_browser_options(profile_path: str | None = None) -> webdriver.ChromeOptions:
+    """
+    Задать настройки браузера Chrome, в котором будет работать Selenium.
+    Если путь к профилю не задан - используется основной профиль
+    """
     logger.debug("Задаем настройки Chrome")
-    ensure_chrome_profile()
+    profile_path = ensure_chrome_profile(profile_path or chromeProfilePath)
     options = webdriver.ChromeOptions()
     # options.add_argument("--start-maximized")
     options.add_argument("--no-sandbox")
@@ -62,12 +152,12 @@ def chrome_browser_options() -> webdriver.ChromeOptions:
     }
     options.add_experimental_option("prefs", prefs)
 
-    if len(chromeProfilePath) > 0:
-        initial_path = os.path.dirname(chromeProfilePath)
-        profile_dir = os.path.basename(chromeProfilePath)
+    if len(profile_path) > 0:
+        initial_path = os.path.dirname(profile_path)
+        profile_dir = os.path.basename(profile_path)
         options.add_argument('--user-data-dir=' + initial_path)
         options.add_argument("--profile-directory=" + profile_dir)
-        logger.debug(f"Используем профиль Chrome из папки: {chromeProfilePath}")
+        logger.debug(f"Используем профиль Chrome из папки: {profile_path}")
     else:
         options.add_argument("--incognito")
         logger.debug("Используем Chrome в режиме инкогнито")
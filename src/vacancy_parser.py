@@ -0,0 +1,111 @@
+"""
+Разбор HTML страницы вакансии без браузера.
+
+Поля вакансии берутся из элементов с атрибутом data-qa так же, как при сборе через WebDriver,
+но разбор выполняется локально с помощью lxml: либо по driver.page_source (один запрос к браузеру
+на всю страницу), либо по сохраненным ранее HTML файлам.
+
+Пакетный разбор сохраненных страниц (результат - JSONL файл, одна вакансия в строке):
+    python -m src.vacancy_parser <папка с HTML файлами> <выходной файл>
+"""
+
+import os
+import re
+import sys
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from lxml import html as lxml_html
+from loguru import logger
+
+
+# поля вакансии и data-qa элементов, из которых они берутся (используется первый найденный элемент)
+VACANCY_FIELDS = [
+    ("title", ["vacancy-title"]),
+    ("salary", ["vacancy-salary-compensation-type-net"]),
+    ("experience", ["vacancy-experience"]),
+    ("job_type", ["vacancy-view-employment-mode"]),
+    ("company_name", ["vacancy-company-name"]),
+    ("company_address", ["vacancy-view-raw-address", "vacancy-view-location"]),
+    ("description", ["vacancy-branded", "vacancy-description"]),
+    ]
+VACANCY_SKILLS_DATA_QA = "skills-element"
+
+# элементы, текст которых начинается с новой строки (как в innerText браузера)
+BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section", "article", "header",
+              "footer", "table", "blockquote", "pre"}
+# элементы, текст которых не отображается на странице
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+SPACES_RE = re.compile(r"[ \t\r\f\v\u00a0]+")
+
+
+def _collect_text(element, parts: list) -> None:
+    """Рекурсивно собрать видимый текст элемента с разбиением на строки по блочным элементам"""
+    tag = element.tag if isinstance(element.tag, str) else ""
+    if tag in SKIPPED_TAGS:
+        return
+    if tag in BLOCK_TAGS:
+        parts.append("\n")
+    if tag == "br":
+        parts.append("\n")
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+    if tag in BLOCK_TAGS:
+        parts.append("\n")
+
+
+def element_text(element) -> str:
+    """Получить текст элемента в том же виде, в котором его возвращает WebElement.text"""
+    parts = []
+    _collect_text(element, parts)
+    lines = (SPACES_RE.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_vacancy_html(page_html: str) -> Dict[str, Optional[str]]:
+    """Собрать информацию о вакансии из HTML страницы"""
+    tree = lxml_html.fromstring(page_html)
+    job = {}
+    for key, data_qas in VACANCY_FIELDS:
+        job[key] = None
+        for data_qa in data_qas:
+            elements = tree.xpath(f"//*[@data-qa='{data_qa}']")
+            if elements:
+                job[key] = element_text(elements[0])
+                break
+    skill_list = tree.xpath(f"//*[@data-qa='{VACANCY_SKILLS_DATA_QA}']")
+    job["skills"] = ", ".join(element_text(skill) for skill in skill_list)
+    return job
+
+
+def parse_vacancy_file(file_path: str) -> Dict[str, Optional[str]]:
+    """Собрать информацию о вакансии из сохраненного HTML файла"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return parse_vacancy_html(f.read())
+
+
+def parse_vacancy_files(file_paths: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Optional[str]]]]:
+    """Разобрать сохраненные страницы вакансий, пропуская файлы, которые не удалось прочитать"""
+    for file_path in file_paths:
+        try:
+            yield file_path, parse_vacancy_file(file_path)
+        except Exception as e:
+            logger.error(f"Не удалось разобрать страницу вакансии {file_path}: {str(e)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Использование: python -m src.vacancy_parser <папка с HTML файлами> <выходной файл>")
+        sys.exit(1)
+    html_dir, output_file = sys.argv[1], sys.argv[2]
+    html_files = sorted(str(path) for path in Path(html_dir).glob("*.htm*"))
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        for file_path, job in parse_vacancy_files(html_files):
+            f.write(json.dumps({"file": file_path, **job}, ensure_ascii=False) + "\n")
+    logger.info(f"Разобрано страниц вакансий: {len(html_files)}, результат сохранен в {output_file}")
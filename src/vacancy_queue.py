@@ -0,0 +1,122 @@
+"""
+Очередь найденных вакансий на базе SQLite.
+
+Сначала все страницы результатов поиска обходятся по URL, и найденные вакансии
+(id, ссылка, название, компания) складываются в очередь без повторов. Затем отклики
+рассылаются по очереди, а каждая обработанная вакансия отмечается в базе, поэтому
+после перезапуска работа продолжается с того же места.
+Несколько браузеров могут брать вакансии из одной очереди: взятые вакансии помечаются
+как обрабатываемые, поэтому одна вакансия не достанется двум браузерам.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+
+class VacancyQueue:
+    """Класс для хранения очереди вакансий, на которые нужно откликнуться"""
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS vacancies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    login TEXT NOT NULL,
+                    job_title TEXT NOT NULL,
+                    vacancy_id TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    title TEXT,
+                    company TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    result TEXT,
+                    added_at TEXT,
+                    processed_at TEXT,
+                    UNIQUE (login, job_title, vacancy_id)
+                )""")
+            # в очередях, созданных до появления параллельных откликов, нет колонки worker
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(vacancies)")]
+            if "worker" not in columns:
+                self._conn.execute("ALTER TABLE vacancies ADD COLUMN worker TEXT")
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vacancies_status
+                ON vacancies (login, job_title, status)""")
+        logger.debug(f"Очередь вакансий открыта: {db_path}")
+
+    def add_many(self, login: str, job_title: str, vacancies: Iterable[Dict[str, str]]) -> int:
+        """
+        Добавить вакансии в очередь. Вакансии, которые уже были в очереди, пропускаются.
+        Возвращает число добавленных вакансий
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [(login, job_title, vacancy["vacancy_id"], vacancy["url"], vacancy.get("title"),
+                 vacancy.get("company"), now) for vacancy in vacancies if vacancy.get("vacancy_id")]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO vacancies (login, job_title, vacancy_id, url, title, company, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return self._conn.total_changes - before
+
+    def pending(self, login: str, job_title: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Получить необработанные вакансии в порядке их добавления в очередь"""
+        query = ("SELECT vacancy_id, url, title, company FROM vacancies "
+                 "WHERE login = ? AND job_title = ? AND status = 'pending' ORDER BY id")
+        params = [login, job_title]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{"vacancy_id": vacancy_id, "url": url, "title": title, "company": company}
+                for vacancy_id, url, title, company in rows]
+
+    def claim(self, login: str, job_title: str, worker: str, limit: int) -> List[Dict[str, str]]:
+        """
+        Взять из очереди до limit необработанных вакансий для обработки в одном из браузеров.
+        Взятые вакансии не возвращаются методами pending и claim, пока их не вернут методом release
+        """
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, vacancy_id, url, title, company FROM vacancies "
+                "WHERE login = ? AND job_title = ? AND status = 'pending' ORDER BY id LIMIT ?",
+                (login, job_title, limit)).fetchall()
+            self._conn.executemany("UPDATE vacancies SET status = 'claimed', worker = ? WHERE id = ?",
+                                   [(worker, row[0]) for row in rows])
+        return [{"vacancy_id": vacancy_id, "url": url, "title": title, "company": company}
+                for _, vacancy_id, url, title, company in rows]
+
+    def release(self, login: str, job_title: str, worker: Optional[str] = None) -> int:
+        """
+        Вернуть в очередь вакансии, взятые браузером worker (или всеми браузерами), но не обработанные.
+        Возвращает число возвращенных вакансий
+        """
+        query = "UPDATE vacancies SET status = 'pending', worker = NULL WHERE login = ? AND job_title = ? AND status = 'claimed'"
+        params = [login, job_title]
+        if worker is not None:
+            query += " AND worker = ?"
+            params.append(worker)
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).rowcount
+
+    def mark_done(self, login: str, job_title: str, vacancy_id: str, result: str) -> None:
+        """Отметить вакансию как обработанную"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE vacancies SET status = 'done', result = ?, processed_at = ? "
+                "WHERE login = ? AND job_title = ? AND vacancy_id = ?",
+                (result, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), login, job_title, vacancy_id))
+
+    def close(self) -> None:
+        """Закрыть соединение с базой"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,157 @@
+"""
+Параллельная рассылка откликов в нескольких браузерах.
+
+Сначала все страницы результатов поиска собираются в очередь вакансий, затем несколько
+браузеров (у каждого своя копия профиля Chrome) берут вакансии из общей очереди.
+Журнал откликов, очередь вакансий и готовые ответы на вопросы у всех браузеров общие,
+а максимальное число откликов и темп откликов с одного аккаунта соблюдаются для всех браузеров вместе.
+"""
+
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from loguru import logger
+
+
+class ApplyCoordinator:
+    """Класс для соблюдения общих для всех браузеров ограничений на отклики"""
+    def __init__(self, max_applies_num: int, min_interval_sec: float):
+        self.max_applies_num = max_applies_num
+        # минимальный интервал между откликами с одного аккаунта
+        self.min_interval_sec = min_interval_sec
+        self.applies_num = 0
+        # вакансии, которые сейчас обрабатываются в браузерах
+        self._in_progress = 0
+        self._next_apply_time: Dict[str, float] = {}
+        # компании и вакансии, на которые браузеры откликаются сейчас или уже откликнулись успешно
+        self._reserved: Set[Tuple[str, str]] = set()
+        self._condition = threading.Condition()
+
+    def limit_reached(self) -> bool:
+        """Проверить, достигнуто ли максимальное число откликов"""
+        with self._condition:
+            return self.applies_num >= self.max_applies_num
+
+    def acquire(self) -> bool:
+        """
+        Занять место под отклик перед обработкой вакансии. Если все оставшиеся места заняты
+        другими браузерами - ждем, пока они освободятся. Возвращает False,
+        если достигнуто максимальное число откликов
+        """
+        with self._condition:
+            while self.applies_num + self._in_progress >= self.max_applies_num:
+                if self.applies_num >= self.max_applies_num:
+                    return False
+                self._condition.wait()
+            self._in_progress += 1
+            return True
+
+    def release(self, success: bool) -> None:
+        """Освободить место под отклик после обработки вакансии"""
+        with self._condition:
+            self._in_progress -= 1
+            if success:
+                self.applies_num += 1
+            self._condition.notify_all()
+
+    def reserve(self, company: str, job: str, once_at_company: bool) -> bool:
+        """
+        Занять компанию и вакансию под отклик, чтобы другие браузеры не откликнулись на них одновременно.
+        Если задано once_at_company - занимается вся компания. Возвращает False, если они уже заняты
+        """
+        with self._condition:
+            if (company, job) in self._reserved:
+                return False
+            if once_at_company and any(company == reserved_company for reserved_company, _ in self._reserved):
+                return False
+            self._reserved.add((company, job))
+            return True
+
+    def unreserve(self, company: str, job: str) -> None:
+        """Освободить компанию и вакансию, если откликнуться на них не удалось"""
+        with self._condition:
+            self._reserved.discard((company, job))
+
+    def wait_turn(self, login: str) -> None:
+        """Дождаться очереди на отклик, чтобы с одного аккаунта откликаться не чаще, чем раз в min_interval_sec"""
+        with self._condition:
+            now = time.monotonic()
+            apply_time = max(now, self._next_apply_time.get(login, now))
+            self._next_apply_time[login] = apply_time + self.min_interval_sec
+        if apply_time > now:
+            logger.debug(f"Ждем {apply_time - now:.1f} секунд до следующего отклика с аккаунта {login}")
+            time.sleep(apply_time - now)
+
+
+class WorkerPool:
+    """Класс для параллельной рассылки откликов в нескольких браузерах"""
+    def __init__(self, workers_num: int, create_driver: Callable[[int], Any], setup_worker: Callable[[Any], None],
+                 max_applies_num: int, min_interval_sec: float):
+        self.workers_num = workers_num
+        # функция для запуска браузера с заданным номером, в котором уже выполнен вход на сайт
+        self.create_driver = create_driver
+        # функция для настройки LLM и генератора резюме для JobManager дополнительного браузера
+        self.setup_worker = setup_worker
+        self.max_applies_num = max_applies_num
+        self.min_interval_sec = min_interval_sec
+
+    def run(self, job_manager: Any) -> int:
+        """
+        Разослать отклики на вакансии из очереди вакансий job_manager во всех браузерах.
+        Первым браузером служит браузер самого job_manager. Возвращает число успешных откликов
+        """
+        coordinator = ApplyCoordinator(self.max_applies_num, self.min_interval_sec)
+        # вакансии, взятые браузерами при прошлом запуске, но так и не обработанные
+        released_num = job_manager.vacancy_queue.release(job_manager.login, job_manager.job_title)
+        if released_num:
+            logger.debug(f"В очередь вакансий возвращено {released_num} необработанных вакансий")
+        workers = [job_manager] + self._create_workers(job_manager)
+        logger.info(f"Рассылаем отклики в {len(workers)} браузерах")
+        threads = []
+        for worker_id, worker in enumerate(workers):
+            worker.set_apply_coordinator(coordinator)
+            thread = threading.Thread(target=self._run_worker, args=(worker, str(worker_id)),
+                                      name=f"apply_worker_{worker_id}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        for worker in workers[1:]:
+            self._close_worker(worker)
+        job_manager.set_apply_coordinator(None)
+        logger.info(f"Все браузеры завершили работу, отправлено откликов: {coordinator.applies_num}")
+        return coordinator.applies_num
+
+    def _create_workers(self, job_manager: Any) -> List[Any]:
+        """Запустить дополнительные браузеры. Браузеры запускаются по очереди, чтобы не мешать друг другу"""
+        workers = []
+        for worker_id in range(1, self.workers_num):
+            try:
+                worker = job_manager.create_worker(self.create_driver(worker_id))
+                self.setup_worker(worker)
+                workers.append(worker)
+            except Exception:
+                tb_str = traceback.format_exc()
+                logger.error(f"Не удалось запустить браузер {worker_id}: {tb_str}")
+        return workers
+
+    @staticmethod
+    def _run_worker(worker: Any, worker_id: str) -> None:
+        """Откликаться на вакансии в одном браузере"""
+        try:
+            worker.apply_as_worker(worker_id)
+        except Exception:
+            tb_str = traceback.format_exc()
+            logger.error(f"Неизвестная ошибка в браузере {worker_id}: {tb_str}")
+
+    @staticmethod
+    def _close_worker(worker: Any) -> None:
+        """Закрыть дополнительный браузер"""
+        if worker.llm_prefetcher is not None:
+            worker.llm_prefetcher.close()
+        try:
+            worker.driver.quit()
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть браузер: {str(e)}")
@@ -0,0 +1,66 @@
+from src.answer_store import AnswerStore
+
+
+def test_add_and_get(tmp_path):
+    store = AnswerStore(str(tmp_path / "answers.jsonl"))
+    store.add("login", "job", "What is your salary expectations?", "300000")
+
+    assert store.get("login", "job", ' What is your "salary" expectations? ') == "300000"
+    assert store.get("other_login", "job", "What is your salary expectations?") is None
+    assert store.get("login", "other_job", "What is your salary expectations?") is None
+    assert len(store) == 1
+
+
+def test_answers_are_persisted(tmp_path):
+    store_path = str(tmp_path / "answers.jsonl")
+    store = AnswerStore(store_path)
+    store.add("login", "job", "Question 1", "Answer 1")
+    store.add("login", "job", "Question 1", "Answer 2")
+    store.add("login", "job", "Question 2", "Answer 3")
+
+    reloaded_store = AnswerStore(store_path)
+
+    assert len(reloaded_store) == 2
+    assert reloaded_store.get("login", "job", "Question 1") == "Answer 2"
+    assert reloaded_store.get("login", "job", "Question 2") == "Answer 3"
+
+
+def test_import_answers(tmp_path):
+    store = AnswerStore(str(tmp_path / "answers.jsonl"))
+    legacy_answers = [{"question": "Question 1", "answer": "Answer 1"},
+                      {"question": "Question 2", "answer": "Answer 2"}]
+
+    assert store.import_answers("login", "job", legacy_answers) == 2
+    assert store.import_answers("login", "job", []) == 0
+    assert store.get("login", "job", "question 2") == "Answer 2"
+
+
+def test_broken_lines_are_skipped(tmp_path):
+    store_path = tmp_path / "answers.jsonl"
+    store_path.write_text('{"login": "login", "job_title": "job", "question": "Q", "answer": "A"}\n{"login": \n',
+                          encoding="utf-8")
+
+    store = AnswerStore(str(store_path))
+
+    assert store.get("login", "job", "q") == "A"
+
+
+def test_import_file_once_per_login_and_job(tmp_path):
+    store_path = str(tmp_path / "answers.jsonl")
+    store = AnswerStore(store_path)
+    store.add("login", "job", "Question 1", "New answer")
+    legacy_answers = [{"question": "Question 1", "answer": "Old answer"},
+                      {"question": "Question 2", "answer": "Answer 2"}]
+
+    # уже сохраненные ответы не перезаписываются старыми
+    assert store.import_file("login", "job", "answers.json", legacy_answers) == [("login", "job", "question 2", "Answer 2")]
+    assert store.get("login", "job", "Question 1") == "New answer"
+    # старые ответы переносятся и для других логинов и резюме
+    assert len(store.import_file("other_login", "job", "answers.json", legacy_answers)) == 2
+    assert store.get("other_login", "job", "Question 2") == "Answer 2"
+
+    reloaded_store = AnswerStore(store_path)
+
+    assert reloaded_store.import_file("login", "job", "answers.json", legacy_answers) == []
+    assert len(reloaded_store.import_file("login", "other_job", "answers.json", legacy_answers)) == 2
+    assert len(reloaded_store) == 6
@@ -105,3 +105,67 @@ def test_is_logged_in_timeout_exception(authenticator):
 
     result = authenticator.is_logged_in()
     assert result is False
+
+def test_start_valid_session_skips_page_load(authenticator):
+    """Test start method when the quick session check succeeds."""
+    authenticator.session_store = Mock()
+    authenticator.driver.execute_async_script.return_value = True
+    authenticator.driver.execute_cdp_cmd.return_value = {"cookies": [
+        {"name": "hhtoken", "value": "token", "domain": ".hh.ru", "expires": -1, "size": 10},
+        {"name": "other", "value": "other", "domain": ".example.com"},
+        ]}
+    authenticator.driver.current_url = "https://hh.ru/robots.txt"
+    authenticator.driver.execute_script.return_value = {"key": "value"}
+
+    with patch.object(authenticator, "is_logged_in") as mock_is_logged_in:
+        assert authenticator.start() is True
+
+    mock_is_logged_in.assert_not_called()
+    authenticator.driver.get.assert_called_once_with("https://hh.ru/robots.txt")
+    # сохраняются только cookies hh.ru и только поля, которые принимает Network.setCookies
+    authenticator.session_store.save.assert_called_once_with(
+        "abc", [{"name": "hhtoken", "value": "token", "domain": ".hh.ru"}], {"key": "value"})
+
+def test_start_restores_session(authenticator):
+    """Test start method when a saved session is restored."""
+    session = {"cookies": [{"name": "hhtoken", "value": "token", "domain": ".hh.ru"}], "local_storage": {"key": "value"}}
+    authenticator.session_store = Mock()
+    authenticator.session_store.get.return_value = session
+    # до восстановления сессии пользователь не вошел на сайт, после - вошел
+    authenticator.driver.execute_async_script.side_effect = [False, True]
+
+    with patch.object(authenticator, "is_logged_in") as mock_is_logged_in:
+        assert authenticator.start() is True
+
+    mock_is_logged_in.assert_not_called()
+    authenticator.driver.execute_cdp_cmd.assert_called_once_with("Network.setCookies", {"cookies": session["cookies"]})
+    authenticator.session_store.delete.assert_not_called()
+
+@patch('src.authenticator.Authenticator.is_logged_in', return_value=True)
+def test_start_expired_session(mock_is_logged_in, authenticator):
+    """Test start method when a saved session is no longer valid."""
+    authenticator.session_store = Mock()
+    authenticator.session_store.get.return_value = {"cookies": [], "local_storage": {}}
+    authenticator.driver.execute_async_script.return_value = False
+    authenticator.driver.execute_cdp_cmd.return_value = {"cookies": []}
+    authenticator.driver.current_url = "https://hh.ru/"
+
+    assert authenticator.start() is True
+
+    authenticator.session_store.delete.assert_called_once_with("abc")
+    mock_is_logged_in.assert_called_once()
+
+@patch('src.authenticator.Authenticator.is_logged_in', return_value=True)
+def test_start_session_check_unknown(mock_is_logged_in, authenticator):
+    """Test start method when the quick session check fails (403, 429, 5xx)."""
+    authenticator.session_store = Mock()
+    authenticator.session_store.get.return_value = {"cookies": [], "local_storage": {}}
+    authenticator.driver.execute_async_script.return_value = None
+    authenticator.driver.execute_cdp_cmd.return_value = {"cookies": []}
+    authenticator.driver.current_url = "https://hh.ru/"
+
+    assert authenticator.start() is True
+
+    # сессия, которую не удалось проверить, не удаляется
+    authenticator.session_store.delete.assert_not_called()
+    mock_is_logged_in.assert_called_once()
@@ -1,12 +1,19 @@
+import shutil
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from urllib.parse import quote
+from selenium import webdriver
+from unittest.mock import Mock, AsyncMock, patch, MagicMock, PropertyMock
 from src.job_manager import JobManager
+from src.page_wait import PageWait
+from src.worker_pool import ApplyCoordinator
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 
 
 @pytest.fixture
-def job_manager():
+def job_manager(tmp_path, monkeypatch):
+    # все выходные файлы (журнал откликов и т.д.) создаются во временной папке
+    monkeypatch.chdir(tmp_path)
     driver = MagicMock(current_url = "https://hh.ru/test")  # Mock the webdriver
     _job_manager = JobManager(driver)
     params = {
@@ -23,7 +30,12 @@ def job_manager():
     _job_manager.driver.find_elements.return_value = [MagicMock(location={"y": 0}), MagicMock(location={"y": 0}, text="test_job")]
     _job_manager.driver.find_element.return_value = MagicMock()
     _job_manager.driver.execute_script.return_value = 0
-    _job_manager.driver.window_handles = [0, 1, 2]
+    windows = [0, 1]
+    def open_window():
+        # при каждом обращении появляется новая вкладка, как после клика по вакансии
+        windows.append(len(windows))
+        return list(windows)
+    type(_job_manager.driver).window_handles = PropertyMock(side_effect=open_window)
     _job_manager.wait.until = Mock()
     return _job_manager
 
@@ -60,14 +72,138 @@ def test_send_responses(job_manager):
     job_manager._scrape_employer_page = Mock(return_value={"company_name": "Test Company", "title": "Test Job"})
     job_manager._is_blacklisted = Mock(return_value=False)
     job_manager._is_already_applied_to_job_or_company = Mock(return_value=(False, ""))
+    job_manager.gpt_answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
     job_manager.apply_job = Mock(return_value=("Success", ""))
-    job_manager._save_company_to_json = Mock()
+    job_manager._save_company_to_ledger = Mock()
     job_manager._sleep = Mock()
 
     job_manager._send_repsonses()
 
     job_manager.apply_job.assert_called()
-    job_manager._save_company_to_json.assert_called()
+    job_manager._save_company_to_ledger.assert_called()
+    assert job_manager.vacancy_num == 2
+
+
+def test_open_from_search_page_picks_new_window(job_manager):
+    job_manager.wait = PageWait(job_manager.driver, 0.05)
+    # порядок вкладок не гарантирован: новая вкладка не обязательно последняя
+    type(job_manager.driver).window_handles = PropertyMock(side_effect=[[0, 1, 2]] + [[0, 3, 1, 2]] * 5)
+
+    assert job_manager._open_from_search_page(MagicMock(location={"y": 0}), 0) == 3
+    job_manager.driver.switch_to.window.assert_called_with(3)
+
+    # клик не открыл вкладку - не возвращаем уже открытую вкладку другой вакансии
+    type(job_manager.driver).window_handles = PropertyMock(return_value=[0, 1, 2])
+    with pytest.raises(TimeoutException):
+        job_manager._open_from_search_page(MagicMock(location={"y": 0}), 0)
+
+
+@patch("src.job_manager.MONKEY_MODE", new=False)
+@patch("src.job_manager.PREFETCH_DEPTH", new=1)
+def test_send_responses_prefetch(job_manager):
+    jobs = [{"company_name": f"company_{i}", "title": f"job_{i}", "description": ""} for i in range(2)]
+    job_manager._scrape_employer_page = Mock(side_effect=jobs)
+    job_manager.gpt_answerer.ajobs_are_interesting = AsyncMock(return_value=[True, False])
+    job_manager.gpt_answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
+    job_manager.apply_job = Mock(return_value=("Success", ""))
+    job_manager._save_company_to_ledger = Mock()
+    job_manager._sleep = Mock()
+
+    job_manager._send_repsonses()
+
+    # обе вакансии были открыты до отклика на первую из них и оценены одним пакетом
+    job_manager.gpt_answerer.ajobs_are_interesting.assert_awaited_once_with(jobs)
+    job_manager.apply_job.assert_called_once_with("company_0", "job_0", jobs[0], "Sample cover letter")
+    results = [call.args[0] for call in job_manager._save_company_to_ledger.call_args_list]
+    assert results == ["success", "skipped"]
+
+
+def test_send_responses_filters_cards(job_manager):
+    job_manager.job_blacklist = ["blacklisted"]
+    job_manager._add_to_applied_index("applied", "job_2")
+    elements = [MagicMock(location={"y": 0}) for _ in range(4)]
+    cards = [
+        {"element": elements[0], "vacancy_id": "1", "url": "https://hh.ru/vacancy/1", "title": "job_1", "company": "Blacklisted", "responded": False},
+        {"element": elements[1], "vacancy_id": "2", "url": "https://hh.ru/vacancy/2", "title": "job_2", "company": "Applied", "responded": False},
+        {"element": elements[2], "vacancy_id": "3", "url": "https://hh.ru/vacancy/3", "title": "job_3", "company": "company_3", "responded": True},
+        {"element": elements[3], "vacancy_id": "4", "url": "https://hh.ru/vacancy/4", "title": "job_4", "company": "company_4", "responded": False},
+    ]
+    job_manager.driver.execute_script = Mock(return_value=cards)
+    job_manager._scrape_employer_page = Mock(return_value={"company_name": "company_4", "title": "job_4", "description": ""})
+    job_manager.gpt_answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
+    job_manager.apply_job = Mock(return_value=("Success", ""))
+    job_manager._sleep = Mock()
+
+    job_manager._send_repsonses()
+
+    # открыта только последняя вакансия, остальные пропущены по карточкам
+    elements[3].click.assert_called_once()
+    for element in elements[:3]:
+        element.click.assert_not_called()
+    job_manager._scrape_employer_page.assert_called_once()
+    skipped = job_manager.skipped_companies["test_login"]["test_job"]
+    assert [job_info["link"] for job_infos in skipped.values() for job_info in job_infos] == [
+        "https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2", "https://hh.ru/vacancy/3"]
+
+
+def test_get_search_page_url(job_manager):
+    url = job_manager._get_search_page_url("https://hh.ru/search/vacancy?text=python&page=3&area=1", 5)
+    assert url == "https://hh.ru/search/vacancy?text=python&area=1&page=5"
+
+
+def test_harvest_search_results(job_manager):
+    job_manager.driver.current_url = "https://hh.ru/search/vacancy?text=python"
+    pages = [
+        [{"vacancy_id": "1", "url": "https://hh.ru/vacancy/1", "title": "job_1", "company": "company_1"},
+         {"vacancy_id": "2", "url": "https://hh.ru/vacancy/2", "title": "job_2", "company": "company_2"}],
+        [{"vacancy_id": "3", "url": "https://hh.ru/vacancy/3", "title": "job_3", "company": "company_3"}],
+        # последняя страница возвращается повторно
+        [{"vacancy_id": "3", "url": "https://hh.ru/vacancy/3", "title": "job_3", "company": "company_3"}],
+    ]
+    job_manager.driver.execute_script = Mock(side_effect=pages)
+
+    assert job_manager._harvest_search_results() == 3
+    # при повторном сборе в очередь добавляются только новые вакансии
+    job_manager.driver.execute_script = Mock(side_effect=pages)
+    assert job_manager._harvest_search_results() == 0
+    assert [vacancy["vacancy_id"] for vacancy in job_manager.vacancy_queue.pending("test_login", "test_job")] == ["1", "2", "3"]
+    job_manager.driver.get.assert_called_with("https://hh.ru/search/vacancy?text=python&page=2")
+
+
+def test_apply_from_queue(job_manager):
+    job_manager.vacancy_queue.add_many("test_login", "test_job", [
+        {"vacancy_id": "1", "url": "https://hh.ru/vacancy/1", "title": "job_1", "company": "company_1"},
+        {"vacancy_id": "2", "url": "https://hh.ru/vacancy/2", "title": "job_2", "company": "company_2"},
+    ])
+    jobs = [{"company_name": f"company_{i}", "title": f"job_{i}", "description": ""} for i in (1, 2)]
+    job_manager._scrape_employer_page = Mock(side_effect=jobs)
+    job_manager.gpt_answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
+    job_manager.apply_job = Mock(return_value=("Success", ""))
+    job_manager._sleep = Mock()
+
+    job_manager._apply_from_queue()
+
+    assert job_manager.apply_job.call_count == 2
+    job_manager.driver.get.assert_any_call("https://hh.ru/vacancy/1")
+    job_manager.driver.get.assert_any_call("https://hh.ru/vacancy/2")
+    assert job_manager.vacancy_queue.pending("test_login", "test_job") == []
+
+
+def test_apply_from_queue_releases_claimed(job_manager):
+    job_manager.vacancy_queue.add_many("test_login", "test_job", [
+        {"vacancy_id": "1", "url": "https://hh.ru/vacancy/1", "title": "job_1", "company": "company_1"},
+    ])
+    # вакансию взял браузер прерванной параллельной рассылки
+    job_manager.vacancy_queue.claim("test_login", "test_job", "1", 1)
+    job_manager._scrape_employer_page = Mock(return_value={"company_name": "company_1", "title": "job_1", "description": ""})
+    job_manager.gpt_answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
+    job_manager.apply_job = Mock(return_value=("Success", ""))
+    job_manager._sleep = Mock()
+
+    job_manager._apply_from_queue()
+
+    job_manager.apply_job.assert_called_once()
+    job_manager.driver.get.assert_any_call("https://hh.ru/vacancy/1")
 
 
 def test_scrape_employer_page(job_manager):
@@ -82,13 +218,132 @@ def test_scrape_employer_page(job_manager):
     assert job_data["skills"] == "Test Data"
 
 
+def test_scrape_employer_page_by_elements(job_manager):
+    # страница вакансии: data-qa -> тексты элементов
+    page = {
+        "vacancy-title": ["Python developer"],
+        "vacancy-company-name": ["Test Company"],
+        "vacancy-view-location": ["Москва"],
+        "vacancy-description": ["Test description"],
+        "skills-element": ["Python", "SQL"],
+    }
+
+    def find_elements(by, xpath):
+        data_qa = xpath.split("'")[1]
+        return [MagicMock(text=text) for text in page.get(data_qa, [])]
+
+    def find_element(by, xpath):
+        elements = find_elements(by, xpath)
+        if not elements:
+            raise NoSuchElementException(xpath)
+        return elements[0]
+
+    job_manager.driver.find_element = Mock(side_effect=find_element)
+    job_manager.driver.find_elements = Mock(side_effect=find_elements)
+    # JavaScript не выполнился - поля собираются по одному
+    job_manager.driver.execute_script = Mock(side_effect=WebDriverException("javascript error"))
+
+    job_data = job_manager._scrape_employer_page()
+
+    assert job_data == {"title": "Python developer", "salary": None, "experience": None, "job_type": None,
+                        "company_name": "Test Company", "company_address": "Москва",
+                        "description": "Test description", "skills": "Python, SQL"}
+
+
+VACANCY_HTML = """<html><body>
+<h1 data-qa="vacancy-title">Python&nbsp;developer</h1>
+<span data-qa="vacancy-experience">1–3 года</span>
+<a data-qa="vacancy-company-name"><span>Test</span> <span>Company</span></a>
+<div data-qa="vacancy-description"><p>Разработка сервисов.</p><ul><li>Python</li><li>SQL</li></ul></div>
+<li data-qa="skills-element">Python</li><li data-qa="skills-element">PostgreSQL</li>
+</body></html>"""
+
+
+@pytest.fixture
+def headless_driver():
+    if not any(shutil.which(name) for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")):
+        pytest.skip("Chrome не установлен")
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except WebDriverException as e:
+        pytest.skip(f"Не удалось запустить Chrome: {e}")
+    yield driver
+    driver.quit()
+
+
+def test_scrape_vacancy_js_matches_elements(headless_driver):
+    # SCRAPE_VACANCY_JS выполняется в настоящем браузере на сохраненной странице вакансии
+    headless_driver.get("data:text/html;charset=utf-8," + quote(VACANCY_HTML))
+    job_manager = JobManager(headless_driver)
+
+    job_data = job_manager._scrape_employer_page_by_script()
+
+    assert job_data == job_manager._scrape_employer_page_by_elements()
+    assert job_data["title"] == "Python developer"
+    assert job_data["skills"] == "Python, PostgreSQL"
+
+
+@patch("src.job_manager.SCRAPING_BACKEND", new="html")
+def test_scrape_employer_page_from_html(job_manager):
+    job_manager.driver.page_source = ('<h1 data-qa="vacancy-title">Python developer</h1>'
+                                      '<div data-qa="vacancy-description">Test description</div>')
+
+    job_data = job_manager._scrape_employer_page()
+
+    assert job_data["title"] == "Python developer"
+    assert job_data["description"] == "Test description"
+    job_manager.driver.find_element.assert_not_called()
+
+
+@patch("src.job_manager.time.sleep")
+def test_scroll_slow(mock_sleep, job_manager):
+    element = MagicMock(location={"y": 500})
+    job_manager.driver.execute_async_script.return_value = 470
+
+    assert job_manager._scroll_slow(element, time_to_scroll_sec=2) == 470
+    # вся анимация выполняется одним вызовом WebDriver
+    job_manager.driver.execute_async_script.assert_called_once()
+    assert job_manager.driver.execute_async_script.call_args.args[1:] == (element, 2000)
+    job_manager.driver.execute_script.assert_not_called()
+
+
+@patch("src.job_manager.time.sleep")
+def test_scroll_slow_fallback(mock_sleep, job_manager):
+    element = MagicMock(location={"y": 500})
+    job_manager.driver.execute_async_script.side_effect = WebDriverException("script timeout")
+
+    assert job_manager._scroll_slow(element) == 500
+    job_manager.driver.execute_script.assert_called_once_with("window.scrollTo(0, 500);")
+
+
+@patch("src.job_manager.time.sleep")
+@patch("src.job_manager.time.monotonic", side_effect=[100.0, 100.4, 200.0, 203.0])
+@patch("src.job_manager.random.uniform", return_value=1.0)
+def test_pause_includes_page_wait(mock_uniform, mock_monotonic, mock_sleep, job_manager):
+    job_manager.wait.settle = Mock(return_value=True)
+
+    # страница загружалась 0.4 секунды - от паузы остается 0.6 секунды
+    JobManager._pause(job_manager)
+    mock_uniform.assert_called_with(1, 2)
+    assert mock_sleep.call_args.args[0] == pytest.approx(0.6)
+
+    # страница загружалась дольше паузы - больше не ждем
+    mock_sleep.reset_mock()
+    JobManager._pause(job_manager, 0, 2)
+    mock_sleep.assert_not_called()
+    assert job_manager.wait.settle.call_count == 2
+
+
 def test_define_answers_output_file(job_manager):
     output_file = job_manager._define_answers_output_file("test_output.json")
     assert "test_output.json" in str(output_file)
 
 @patch('json.load', return_value={})
 def test_save_company(mock_json_load, job_manager):
-    job_manager._save_company_to_json = Mock()
+    job_manager._save_company_to_ledger = Mock()
     job_manager.succes_companies = {"test_login": {"test_job": {}}}
 
     company_name = "test_name"
@@ -101,17 +356,13 @@ def test_save_company(mock_json_load, job_manager):
                                                                                         'link': 'https://hh.ru/test', 
                                                                                         'reason': 'test'}]}}}
 
-@patch("json.dump")
-@patch("json.load", return_value={})
-def test_save_company_to_json(mock_json_dump, mock_json_load, job_manager):
-    job_manager._define_answers_output_file = Mock(return_value="path/to/output.json")
-    job_info = [{"name": "company_1", "link": "https://hh.ru/company_1", "reason": ""}]
-    
-    with patch("builtins.open", MagicMock()):
-        job_manager._save_company_to_json("success.json", job_info)
+def test_save_company_to_ledger(job_manager):
+    job_info = {"job_title": "test_title", "link": "https://hh.ru/vacancy/123", "reason": ""}
+
+    job_manager._save_company_to_ledger("success", "company_1", job_info)
 
-    mock_json_dump.assert_called_once()
-    mock_json_load.assert_called_once()
+    assert job_manager._load_companies_from_ledger("success") == {"test_login": {"test_job": {"company_1": [job_info]}}}
+    assert job_manager._load_companies_from_ledger("skipped") == {"test_login": {"test_job": {}}}
 
 
 @patch("json.load", return_value={"test_login": {"test_job": {}}})
@@ -134,14 +385,19 @@ def test_load_questions_from_json(mock_json_dump, mock_json_load, job_manager):
     assert data == [{"question": "What is your salary expectations?", "answer": "Test"}]
 
 
-@patch("json.dump")
-def test_save_questions_to_json(mock_json_dump, job_manager):
-    job_manager._define_answers_output_file = Mock(return_value="path/to/answers.json")
+def test_handle_textbox_question_uses_stored_answer(job_manager):
+    job_manager._scroll_slow = Mock()
+    job_manager._enter_text = Mock()
+    job_manager.answer_store.add("test_login", "test_job", "Test Question?", "Stored Answer")
+    question = MagicMock(spec=WebElement, text=" test question? ")
+    text_field = MagicMock(spec=WebElement)
 
-    with patch("builtins.open", MagicMock()):
-        job_manager._save_questions_to_json({"question": "What is your salary expectations?"})
+    with patch("time.sleep"):
+        result, _ = job_manager._handle_textbox_question(question, text_field)
 
-    mock_json_dump.assert_called_once()
+    assert result is True
+    job_manager.gpt_answerer.answer_question_textual_wide_range.assert_not_called()
+    job_manager._enter_text.assert_called_with(text_field, "Stored Answer")
 
 
 def test_handle_response_popup(job_manager):
@@ -236,6 +492,7 @@ def test_is_already_applied_to_job_or_company(job_manager):
     job_manager.succes_companies = {"test_user": {"test_job": {"Company A": [{"job_title": "Job 1"}, {"job_title": "Job 2"}]}}}
     job_manager.login = "test_user"
     job_manager.job_title = "test_job"
+    job_manager._build_applied_index()
 
     result_a = job_manager._is_already_applied_to_job_or_company("company a", "job 1")
     assert result_a[0] is True
@@ -243,7 +500,26 @@ def test_is_already_applied_to_job_or_company(job_manager):
     assert result_b[0] is False
 
 
-@patch("selenium.webdriver.support.ui.WebDriverWait.until", value=Mock())
+@patch("src.job_manager.APPLY_ONCE_AT_COMPANY", new=False)
+def test_is_already_applied_to_job(job_manager):
+    job_manager.succes_companies = {"test_login": {"test_job": {"Company A": [{"job_title": "Job 1"}]}}}
+    job_manager._build_applied_index()
+
+    assert job_manager._is_already_applied_to_job_or_company("company a", "job 1") == (True, "Вакансия уже встречалась")
+    assert job_manager._is_already_applied_to_job_or_company("company a", "job 2") == (False, "")
+
+
+def test_save_company_updates_applied_index(job_manager):
+    job_manager._save_company_to_ledger = Mock()
+
+    job_manager.save_company("Company B", "Job 3", ("Success", ""))
+    job_manager.save_company("Company C", "Job 4", ("Skip", "test"))
+
+    assert job_manager._is_already_applied_to_job_or_company("company b", "job 3")[0] is True
+    assert job_manager._is_already_applied_to_job_or_company("company c", "job 4")[0] is False
+
+
+@patch("src.page_wait.PageWait.until", value=Mock())
 def test_enter_advanced_search_menu(_, job_manager):
     job_manager.driver.find_elements.return_value = [MagicMock(text="abc"), MagicMock(text="test_job")]
     job_manager._scroll_slow = Mock()
@@ -258,3 +534,176 @@ def test_enter_advanced_search_menu(_, job_manager):
 def test_sanitize_text(job_manager):
     sanitized = job_manager._sanitize_text(" This is a \ntest! ")
     assert sanitized == "this is a test!"
+
+
+def test_apply_from_queue_skips_applied(job_manager):
+    job_manager._add_to_applied_index("company_1", "job_1")
+    job_manager.vacancy_queue.add_many("test_login", "test_job", [
+        {"vacancy_id": "1", "url": "https://hh.ru/vacancy/1", "title": "job_1", "company": "company_1"},
+    ])
+    job_manager._open_by_url = Mock()
+
+    job_manager._apply_from_queue()
+
+    job_manager._open_by_url.assert_not_called()
+    assert job_manager.vacancy_queue.pending("test_login", "test_job") == []
+
+
+def test_apply_from_queue_skips_broken_vacancy(job_manager):
+    job_manager.vacancy_queue.add_many("test_login", "test_job", [
+        {"vacancy_id": str(i), "url": f"https://hh.ru/vacancy/{i}", "title": f"job_{i}", "company": f"company_{i}"}
+        for i in range(1, 5)
+    ])
+    jobs = [{"company_name": f"company_{i}", "title": f"job_{i}", "description": ""} for i in range(2, 5)]
+    # первая вакансия удалена - ее страница не загружается
+    job_manager._scrape_employer_page = Mock(side_effect=[TimeoutException("vacancy-title"), *jobs])
+    job_manager._open_by_url = Mock(side_effect=lambda url: f"window {url}")
+    job_manager.driver.current_window_handle = "window https://hh.ru/vacancy/1"
+    job_manager.gpt_answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
+    job_manager.apply_job = Mock(return_value=("Success", ""))
+    job_manager._sleep = Mock()
+
+    job_manager._apply_from_queue()
+
+    # вкладка с недоступной вакансией закрыта, остальные вакансии обработаны
+    assert job_manager._open_by_url.call_count == 4
+    assert job_manager.apply_job.call_count == 3
+    job_manager.driver.close.assert_called()
+    assert job_manager.vacancy_queue.pending("test_login", "test_job") == []
+    assert job_manager.failed_companies["test_login"]["test_job"]["company_1"][0]["link"] == "https://hh.ru/vacancy/1"
+
+
+def test_apply_as_worker_does_not_release_broken_vacancy(job_manager):
+    job_manager.vacancy_queue.add_many("test_login", "test_job", [
+        {"vacancy_id": "1", "url": "https://hh.ru/vacancy/1", "title": "job_1", "company": "company_1"},
+    ])
+    job_manager._open_by_url = Mock(side_effect=WebDriverException("net::ERR_CONNECTION_RESET"))
+
+    job_manager.apply_as_worker("0")
+
+    # вакансия, которую не удалось открыть, не возвращается в очередь другим браузерам
+    job_manager._open_by_url.assert_called_once()
+    assert job_manager.vacancy_queue.pending("test_login", "test_job") == []
+    assert job_manager.vacancy_queue.claim("test_login", "test_job", "1", 10) == []
+
+
+def test_create_worker(job_manager):
+    driver = MagicMock()
+
+    worker = job_manager.create_worker(driver)
+
+    assert worker.driver is driver
+    assert worker.gpt_answerer is None
+    # журнал откликов, очередь вакансий и индекс откликов общие
+    assert worker.ledger is job_manager.ledger
+    assert worker.vacancy_queue is job_manager.vacancy_queue
+    assert worker.applied_companies is job_manager.applied_companies
+
+
+def test_apply_as_worker(job_manager):
+    job_manager.vacancy_queue.add_many("test_login", "test_job", [
+        {"vacancy_id": str(i), "url": f"https://hh.ru/vacancy/{i}", "title": f"job_{i}", "company": f"company_{i}"}
+        for i in range(1, 4)
+    ])
+    jobs = [{"company_name": f"company_{i}", "title": f"job_{i}", "description": ""} for i in range(1, 4)]
+    job_manager._scrape_employer_page = Mock(side_effect=jobs)
+    job_manager.gpt_answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
+    job_manager.apply_job = Mock(return_value=("Success", ""))
+    job_manager._sleep = Mock()
+    coordinator = ApplyCoordinator(max_applies_num=2, min_interval_sec=0)
+    job_manager.set_apply_coordinator(coordinator)
+
+    with patch("src.job_manager.time.sleep") as mock_sleep:
+        job_manager.apply_as_worker("0")
+
+    # в нескольких браузерах пауза между вакансиями не ждет ввода из консоли
+    job_manager._sleep.assert_not_called()
+    assert mock_sleep.called
+    # общий лимит откликов соблюдается, необработанная вакансия возвращена в очередь
+    assert job_manager.apply_job.call_count == 2
+    assert coordinator.applies_num == 2
+    assert job_manager.vacancy_num == 2
+    assert [vacancy["vacancy_id"] for vacancy in job_manager.vacancy_queue.pending("test_login", "test_job")] == ["3"]
+
+
+@patch("src.job_manager.APPLY_ONCE_AT_COMPANY", new=True)
+def test_apply_job_reserves_company(job_manager):
+    job = {"company_name": "Company", "title": "Python developer", "description": ""}
+    job_manager.gpt_answerer = Mock()
+    coordinator = ApplyCoordinator(max_applies_num=10, min_interval_sec=0)
+    job_manager.set_apply_coordinator(coordinator)
+    other_worker = job_manager.create_worker(MagicMock())
+    other_worker.set_apply_coordinator(coordinator)
+    other_worker.gpt_answerer = Mock()
+
+    # пока первый браузер откликается, второй не откликается в ту же компанию
+    def apply_job(*args):
+        assert other_worker._apply_job_reserved({**job, "title": "Java developer"}, None)[0] == "Skip"
+        return "Error", "Не удалось откликнуться"
+    job_manager.apply_job = Mock(side_effect=apply_job)
+    assert job_manager._apply_job_reserved(job, None) == ("Error", "Не удалось откликнуться")
+
+    # отклик не удался - компания снова свободна
+    other_worker.apply_job = Mock(return_value=("Success", ""))
+    assert other_worker._apply_job_reserved(job, None) == ("Success", "")
+    assert job_manager._apply_job_reserved(job, None)[0] == "Skip"
+
+
+def test_stores_are_shared(job_manager):
+    other_job_manager = JobManager(MagicMock(current_url="https://hh.ru/test"))
+    other_job_manager.set_parameters({"job_title": "other_job", "login": "other_login", "sort_by": "test",
+                                      "output_period": "test", "output_size": "test", "experience": "test"})
+
+    # кампании, запущенные в одном процессе, не открывают одни и те же файлы повторно
+    assert other_job_manager.ledger is job_manager.ledger
+    assert other_job_manager.vacancy_queue is job_manager.vacancy_queue
+    assert other_job_manager.answer_store is job_manager.answer_store
+
+
+def test_write_and_upload_resume_in_background(job_manager):
+    job_manager.resume_generator_manager = Mock()
+    job_manager.resume_generator_manager.pdf_base64.return_value = "JVBERg=="
+    job_manager.gpt_resume_generator = Mock()
+    job = {"title": "test_title", "company_name": "test_company_name"}
+
+    job_manager._write_and_upload_resume(job)
+    job_manager._get_resume_queue().wait()
+
+    assert job["resume_path"].endswith("CV_test_company_name_test_title.pdf")
+    with open(job["resume_path"], "rb") as f:
+        assert f.read() == b"%PDF"
+    assert job_manager._get_resume_queue().status("https://hh.ru/test") == "done"
+    # в генератор резюме передается описание вакансии без пути к файлу резюме
+    assert "resume_path" not in job_manager.resume_generator_manager.pdf_base64.call_args.args[1]
+
+
+@patch("src.job_manager.SEARCH_URL_MODE", new=True)
+def test_set_advanced_search_params_by_url(job_manager):
+    job_manager.search_parameters = {"keywords": ["Python"], "experience": {"between_1_and_3": True}}
+    job_manager.driver.execute_script.return_value = [
+        {"title": "Другое резюме", "href": "https://hh.ru/resume/111"},
+        {"title": "test_job", "href": "https://hh.ru/resume/abc123?hhtmFrom=resume_list"},
+        ]
+    job_manager._enter_advanced_search_menu = Mock()
+
+    job_manager.set_advanced_search_params()
+
+    search_url = job_manager.driver.get.call_args.args[0]
+    assert search_url.startswith("https://hh.ru/search/vacancy?")
+    assert "text=Python" in search_url and "experience=between1And3" in search_url
+    assert "resume=abc123" in search_url
+    job_manager._enter_advanced_search_menu.assert_not_called()
+
+
+@patch("src.job_manager.SEARCH_URL_MODE", new=True)
+@patch("src.job_manager.inputimeout", new=Mock())
+def test_set_advanced_search_params_fallback(job_manager):
+    job_manager.search_parameters = {"keywords": ["Python"], "regions": ["Москва"], "districts": ["Замоскворечье"]}
+    job_manager.driver.execute_script.return_value = []
+    job_manager._enter_advanced_search_menu = Mock()
+    job_manager.experience = job_manager.sort_by = job_manager.output_period = job_manager.output_size = {}
+
+    job_manager.set_advanced_search_params()
+
+    # районы задаются только через форму поиска
+    job_manager._enter_advanced_search_menu.assert_called_once()
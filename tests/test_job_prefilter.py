@@ -0,0 +1,62 @@
+import pytest
+from src.job_prefilter import JobPrefilter, tokenize, flatten_text
+
+
+@pytest.fixture
+def resume():
+    return {
+        "work_preferences": {"position": "Python разработчик"},
+        "skills": ["Python", "Django", "PostgreSQL", "Docker"],
+        "interests": ["Машинное обучение"],
+        "experience_details": [{"position": "Python разработчик", "key_responsibilities": ["Разработка REST API"]}],
+        "personal_information": {"name": "Иван"},
+        }
+
+
+@pytest.fixture
+def python_job():
+    return {"title": "Python разработчик", "skills": "Python, Django",
+            "description": "Разработка REST API на Django, опыт работы с Docker и PostgreSQL"}
+
+
+@pytest.fixture
+def cook_job():
+    return {"title": "Повар", "skills": None,
+            "description": "В ресторан требуется повар горячего цеха, опыт работы на кухне"}
+
+
+def test_tokenize():
+    assert list(tokenize("Разработчики C++ и C#, ёлка")) == ["разраб", "c++", "c#", "елка"]
+
+
+def test_flatten_text():
+    assert flatten_text({"a": ["x", {"b": "y"}], "c": None, "d": 1}) == "x y  1"
+
+
+def test_score(resume, python_job, cook_job):
+    prefilter = JobPrefilter(resume, None, None)
+
+    assert prefilter.score(python_job) > 0.3
+    assert prefilter.score(cook_job) < 0.05
+
+
+def test_score_is_independent_of_order(resume, python_job, cook_job):
+    prefilter = JobPrefilter(resume, None, None)
+    score = prefilter.score(python_job)
+
+    # оценка не зависит от того, какие вакансии оценивались раньше
+    for _ in range(3):
+        prefilter.score(cook_job)
+    assert prefilter.score(python_job) == score
+    assert JobPrefilter(resume, None, None).score(python_job) == score
+
+
+def test_decide(resume, python_job, cook_job):
+    prefilter = JobPrefilter(resume, reject_thresh=0.05, accept_thresh=0.9)
+
+    assert prefilter.decide(cook_job)[0] is False
+    decision, score = prefilter.decide(python_job)
+    assert decision is None and 0.05 <= score < 0.9
+
+    prefilter.accept_thresh = 0.1
+    assert prefilter.decide(python_job)[0] is True
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from src.ledger import ApplicationLedger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    _ledger = ApplicationLedger(str(tmp_path / "applications.db"))
+    yield _ledger
+    _ledger.close()
+
+
+def test_record_and_load(ledger):
+    job_info = {"job_title": "Python developer", "link": "https://hh.ru/vacancy/123?from=serp", "reason": ""}
+    ledger.record("success", "login", "job", "Company", job_info)
+    ledger.record("skipped", "login", "job", "Other", job_info)
+    ledger.record("success", "other_login", "job", "Company", job_info)
+
+    assert ledger.load("success", "login", "job") == {"Company": [job_info]}
+    assert ledger.load("skipped", "login", "job") == {"Other": [job_info]}
+    assert ledger.load("failed", "login", "job") == {}
+
+
+def test_get_vacancy_id():
+    assert ApplicationLedger.get_vacancy_id("https://hh.ru/vacancy/108529441?query=python") == "108529441"
+    assert ApplicationLedger.get_vacancy_id("https://hh.ru/search/vacancy") == ""
+    assert ApplicationLedger.get_vacancy_id(None) == ""
+
+
+def test_import_companies_only_once(ledger):
+    data = {"login": {"job": {"Company": [{"job_title": "Dev", "link": "https://hh.ru/vacancy/1", "reason": ""},
+                                          {"job_title": "QA", "link": "https://hh.ru/vacancy/2", "reason": ""}]}}}
+
+    assert ledger.import_companies("success", "success.json", data) == 2
+    assert ledger.import_companies("success", "success.json", data) == 0
+    assert len(ledger.load("success", "login", "job")["Company"]) == 2
+
+
+def test_export_json(ledger, tmp_path):
+    job_info = {"job_title": "Dev", "link": "https://hh.ru/vacancy/1", "reason": "test"}
+    ledger.record("failed", "login", "job", "Company", job_info)
+    json_path = tmp_path / "failed.json"
+
+    ledger.export_json("failed", str(json_path))
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        assert json.load(f) == {"login": {"job": {"Company": [job_info]}}}
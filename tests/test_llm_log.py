@@ -0,0 +1,87 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.llm.llm_log import LLMLogWriter, migrate_llm_log, read_llm_log
+
+
+def test_writer_appends_entries_from_many_threads(tmp_path):
+    log_path = str(tmp_path / "llm_api_calls.jsonl")
+    writer = LLMLogWriter(log_path)
+
+    with ThreadPoolExecutor(max_workers=7) as executor:
+        for i in range(100):
+            executor.submit(writer.write, {"id": i, "replies": "Ответ"})
+    writer.close()
+
+    entries = list(read_llm_log(log_path))
+    assert len(entries) == 100
+    assert sorted(entry["id"] for entry in entries) == list(range(100))
+    assert entries[0]["replies"] == "Ответ"
+
+
+def test_writer_flush(tmp_path):
+    log_path = str(tmp_path / "llm_api_calls.jsonl")
+    writer = LLMLogWriter(log_path)
+
+    writer.write({"id": 1})
+    writer.flush()
+
+    assert list(read_llm_log(log_path)) == [{"id": 1}]
+    writer.close()
+
+
+def test_migrate_llm_log(tmp_path):
+    legacy_path = tmp_path / "llm_api_calls.json"
+    log_path = tmp_path / "llm_api_calls.jsonl"
+    legacy_path.write_text(json.dumps([{"id": 1}, {"id": 2}]), encoding="utf-8")
+
+    assert migrate_llm_log(str(legacy_path), str(log_path)) == 2
+    assert not legacy_path.exists()
+    assert (tmp_path / "llm_api_calls.json.bak").exists()
+    assert list(read_llm_log(str(log_path))) == [{"id": 1}, {"id": 2}]
+    # повторный перенос ничего не делает
+    assert migrate_llm_log(str(legacy_path), str(log_path)) == 0
+
+
+def test_migrate_llm_log_after_crash(tmp_path):
+    legacy_path = tmp_path / "llm_api_calls.json"
+    log_path = tmp_path / "llm_api_calls.jsonl"
+    legacy_path.write_text(json.dumps([{"id": 1}, {"id": 2}]), encoding="utf-8")
+    log_path.write_text('{"id": 0}\n', encoding="utf-8")
+
+    # процесс упал после переноса записей, но до переименования старого лога
+    real_replace = os.replace
+    def replace(src, dst):
+        if dst.endswith(".bak"):
+            raise OSError("crash")
+        real_replace(src, dst)
+    with patch("src.llm.llm_log.os.replace", side_effect=replace):
+        assert migrate_llm_log(str(legacy_path), str(log_path)) == 0
+    assert legacy_path.exists()
+    assert len(list(read_llm_log(str(log_path)))) == 3
+
+    # повторный перенос не дублирует записи
+    assert migrate_llm_log(str(legacy_path), str(log_path)) == 2
+    assert list(read_llm_log(str(log_path))) == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert not (tmp_path / "llm_api_calls.json.migrating").exists()
+
+
+def test_migrate_llm_log_os_error(tmp_path):
+    legacy_path = tmp_path / "llm_api_calls.json"
+    legacy_path.write_text(json.dumps([{"id": 1}]), encoding="utf-8")
+
+    log_path = tmp_path / "llm_api_calls.jsonl"
+    log_path.mkdir()
+
+    # лог нельзя записать - ошибка не прерывает работу приложения
+    assert migrate_llm_log(str(legacy_path), str(log_path)) == 0
+    assert legacy_path.exists()
+
+
+def test_read_llm_log_skips_broken_lines(tmp_path):
+    log_path = tmp_path / "llm_api_calls.jsonl"
+    log_path.write_text('{"id": 1}\n{"id": \n\n{"id": 3}\n', encoding="utf-8")
+
+    assert list(read_llm_log(str(log_path))) == [{"id": 1}, {"id": 3}]
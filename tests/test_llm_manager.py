@@ -1,6 +1,17 @@
+import json
 import pytest
 from unittest.mock import Mock, MagicMock, patch
-from src.llm.llm_manager import AIAdapter, LLMLogger, LoggerChatModel, GPTAnswerer
+import src.llm.prompts as prompts
+import src.llm.response_cache as response_cache
+import src.llm.llm_manager as llm_manager
+from src.llm.llm_manager import AIAdapter, LLMLogger, LoggerChatModel, GPTAnswerer, get_ai_adapter
+
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """Кэш ответов LLM и клиенты LLM API каждого теста создаются заново во временной папке"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(response_cache, "_cache", None)
+    monkeypatch.setattr(llm_manager, "_ai_adapters", {})
 
 @pytest.fixture
 def mock_config():
@@ -32,6 +43,14 @@ def test_ai_adapter_creation(mock_config, mock_api_key):
     adapter = AIAdapter(mock_config, mock_api_key)
     assert adapter.model is not None
 
+def test_get_ai_adapter(mock_config, mock_api_key):
+    adapter = get_ai_adapter(mock_config, mock_api_key)
+
+    # один клиент на процесс для одинаковых настроек
+    assert get_ai_adapter(mock_config, mock_api_key) is adapter
+    assert get_ai_adapter(mock_config, "other_key") is not adapter
+    assert GPTAnswerer(mock_config, mock_api_key).ai_adapter is adapter
+
 @patch("loguru.logger")
 def test_llm_logger_initialization(mock_logger, mock_ai_adapter):
     llm_logger = LLMLogger(mock_ai_adapter)
@@ -53,6 +72,28 @@ def test_logger_chat_model_call(mock_log_request, mock_ai_adapter):
     mock_ai_adapter.model.invoke.assert_called_once_with(messages)
     assert result.content == "test_content"
 
+@patch("src.llm.llm_manager.LLMLogger.log_request")
+def test_logger_chat_model_call_cached(mock_log_request, mock_ai_adapter):
+    chat_model = LoggerChatModel(mock_ai_adapter)
+    messages = [{"content": "test message", "role": "user"}]
+    mock_ai_adapter.model.invoke.return_value = MagicMock(
+        content="test_content",
+        id="test_id",
+        response_metadata={},
+        usage_metadata={},
+        )
+
+    first = chat_model(messages)
+    second = chat_model(messages)
+
+    mock_ai_adapter.model.invoke.assert_called_once_with(messages)
+    mock_log_request.assert_called_once()
+    assert first.content == second.content == "test_content"
+
+def test_logger_chat_model_call_uncached(mock_ai_adapter):
+    chat_model = LoggerChatModel(mock_ai_adapter, use_cache=False)
+    assert chat_model.cache is None
+
 def test_gpt_answerer_initialization(gpt_answerer):
     assert gpt_answerer.ai_adapter is not None
     assert isinstance(gpt_answerer.llm_cheap, LoggerChatModel)
@@ -128,3 +169,101 @@ def test_select_one_answer_from_options(mock_str_output_parser, mock_chat_prompt
     options = ["Home", "Hound", "House", "Hill"]
 
     assert gpt_answerer.select_one_answer_from_options(question, options) == options[2]
+
+@patch("src.llm.llm_manager.JOB_SCORING_BATCH_SIZE", new=5)
+def test_jobs_are_interesting_batch(gpt_answerer):
+    gpt_answerer.resume = {"skills": ["Python"], "interests": ["AI Research"]}
+    jobs = [{"description": "Python developer"}, {"description": "C++ developer"}]
+
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = ('[{"job": 1, "score": 9, "reasoning": "test"}, '
+                                      '{"job": 2, "score": 2, "reasoning": "test"}]')
+    gpt_answerer.chains["job_is_interesting_batch"] = mock_chain
+    gpt_answerer.chains["job_is_interesting"] = MagicMock()
+
+    assert gpt_answerer.jobs_are_interesting(jobs) == [True, False]
+    mock_chain.invoke.assert_called_once()
+    assert "Python developer" in mock_chain.invoke.call_args.args[0]["job_descriptions"]
+    gpt_answerer.chains["job_is_interesting"].invoke.assert_not_called()
+
+@patch("src.llm.llm_manager.JOB_SCORING_BATCH_SIZE", new=5)
+def test_jobs_are_interesting_fallback(gpt_answerer):
+    gpt_answerer.resume = {"skills": ["Python"], "interests": ["AI Research"]}
+    jobs = [{"description": "Python developer"}, {"description": "C++ developer"}]
+
+    mock_chain = MagicMock()
+    # оценка второй вакансии в ответе отсутствует
+    mock_chain.invoke.return_value = '[{"job": 1, "score": 9, "reasoning": "test"}]'
+    gpt_answerer.chains["job_is_interesting_batch"] = mock_chain
+    single_chain = MagicMock()
+    single_chain.invoke.return_value = "Score: 3. Reasoning: test"
+    gpt_answerer.chains["job_is_interesting"] = single_chain
+
+    assert gpt_answerer.jobs_are_interesting(jobs) == [True, False]
+    single_chain.invoke.assert_called_once()
+
+    mock_chain.invoke.return_value = "not a json"
+    assert gpt_answerer.jobs_are_interesting(jobs) == [False, False]
+    assert single_chain.invoke.call_count == 3
+
+@patch("src.llm.llm_manager.JOB_PREFILTER_REJECT_THRESH", new=0.05)
+@patch("src.llm.llm_manager.JOB_PREFILTER_ACCEPT_THRESH", new=None)
+def test_job_is_interesting_prefilter(gpt_answerer):
+    gpt_answerer.set_resume({"skills": ["Python", "Django"], "interests": ["AI Research"]})
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = "Score: 9. Reasoning: test"
+    gpt_answerer.chains["job_is_interesting"] = mock_chain
+
+    # явно неподходящая вакансия отклоняется без обращения к LLM
+    assert gpt_answerer.job_is_interesting({"title": "Повар", "description": "Требуется повар на кухню"}) is False
+    mock_chain.invoke.assert_not_called()
+
+    assert gpt_answerer.job_is_interesting({"title": "Python developer", "description": "Python, Django"}) is True
+    mock_chain.invoke.assert_called_once()
+
+def test_job_is_interesting_prefilter_score_only(gpt_answerer):
+    gpt_answerer.set_resume({"skills": ["Python", "Django"], "interests": ["AI Research"]})
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = "Score: 9. Reasoning: test"
+    gpt_answerer.chains["job_is_interesting"] = mock_chain
+
+    # без порогов вакансия с низкой локальной оценкой все равно оценивается LLM
+    assert gpt_answerer._prefilter_job({"title": "Повар", "description": "Требуется повар"})[0] is None
+    assert gpt_answerer.job_is_interesting({"title": "Go developer", "description": "Go. Nice to have: Python"}) is True
+    mock_chain.invoke.assert_called_once()
+
+def test_answer_question_textual_wide_range_local_section(gpt_answerer):
+    gpt_answerer.resume = {"salary_expectations": {"salary_range": "200000"},
+                           "personal_information": {"sex": "мужской"}}
+    gpt_answerer.chains["question_section"] = MagicMock()
+    gpt_answerer.chains["salary_expectations"] = MagicMock()
+    gpt_answerer.chains["salary_expectations"].invoke.return_value = "200000"
+    # тема, найденная по ключевым словам, должна подтверждаться классификатором
+    gpt_answerer.question_classifier.train([("Ожидания по зарплате", "salary_expectations")] * 15
+                                           + [("Что такое GIL?", "general_knowledge_questions")] * 5)
+
+    assert gpt_answerer.answer_question_textual_wide_range("Ваши ожидания по зарплате?") == "200000"
+    gpt_answerer.chains["question_section"].invoke.assert_not_called()
+
+def test_question_classifier_trains_on_legacy_log(mock_config, mock_api_key, tmp_path):
+    legacy_log = tmp_path / "data_folder" / "output" / "llm_api_calls.json"
+    legacy_log.parent.mkdir(parents=True)
+    legacy_log.write_text(json.dumps([
+        {"prompts": {"prompt_1": prompts.question_section_template.format(question="Что такое GIL?")},
+         "replies": "General Knowledge Questions"},
+        ], ensure_ascii=False), encoding="utf-8")
+
+    # при первом запуске после обновления классификатор обучается на перенесенном логе
+    assert len(GPTAnswerer(mock_config, mock_api_key).question_classifier) == 1
+
+
+def test_answer_question_textual_wide_range_llm_section(gpt_answerer):
+    gpt_answerer.resume = {"general_knowledge_questions": "", "personal_information": {"sex": "мужской"}}
+    gpt_answerer.chains["question_section"] = MagicMock()
+    gpt_answerer.chains["question_section"].invoke.return_value = "General Knowledge Questions"
+    gpt_answerer.chains["general_knowledge_questions"] = MagicMock()
+    gpt_answerer.chains["general_knowledge_questions"].invoke.return_value = "Global Interpreter Lock"
+
+    assert gpt_answerer.answer_question_textual_wide_range("Что такое GIL?") == "Global Interpreter Lock"
+    gpt_answerer.chains["question_section"].invoke.assert_called_once_with({"question": "Что такое GIL?"})
+    assert len(gpt_answerer.question_classifier) == 1
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+from src.llm.prefetch import LLMPrefetcher
+
+
+@pytest.fixture
+def gpt_answerer():
+    answerer = Mock()
+    answerer.ajobs_are_interesting = AsyncMock(side_effect=lambda jobs: [True] * len(jobs))
+    answerer.awrite_cover_letter = AsyncMock(return_value="Sample cover letter")
+    return answerer
+
+
+@pytest.fixture
+def prefetcher(gpt_answerer):
+    _prefetcher = LLMPrefetcher(gpt_answerer)
+    yield _prefetcher
+    _prefetcher.close()
+
+
+def test_submit_interesting_job(prefetcher, gpt_answerer):
+    job = {"title": "test_job", "description": "test"}
+
+    assert prefetcher.submit(job).result(timeout=5) == (True, "Sample cover letter")
+    gpt_answerer.ajobs_are_interesting.assert_awaited_once_with([job])
+    gpt_answerer.awrite_cover_letter.assert_awaited_once_with(job)
+
+
+def test_submit_not_interesting_job(prefetcher, gpt_answerer):
+    gpt_answerer.ajobs_are_interesting.side_effect = lambda jobs: [False] * len(jobs)
+
+    assert prefetcher.submit({"title": "test_job"}).result(timeout=5) == (False, None)
+    gpt_answerer.awrite_cover_letter.assert_not_awaited()
+
+
+def test_submit_without_interest_check(prefetcher, gpt_answerer):
+    assert prefetcher.submit({"title": "test_job"}, check_interest=False).result(timeout=5) == (True, "Sample cover letter")
+    gpt_answerer.ajobs_are_interesting.assert_not_awaited()
+
+
+def test_cover_letter_error(prefetcher, gpt_answerer):
+    gpt_answerer.awrite_cover_letter.side_effect = RuntimeError("LLM error")
+
+    assert prefetcher.submit({"title": "test_job"}).result(timeout=5) == (True, None)
+
+
+def test_submit_many_scores_jobs_in_one_batch(prefetcher, gpt_answerer):
+    gpt_answerer.ajobs_are_interesting.side_effect = lambda jobs: [True, False, None]
+    jobs = [{"title": f"job_{i}"} for i in range(3)]
+
+    results = [future.result(timeout=5) for future in prefetcher.submit_many(jobs)]
+
+    assert results == [(True, "Sample cover letter"), (False, None), (None, None)]
+    gpt_answerer.ajobs_are_interesting.assert_awaited_once_with(jobs)
+    gpt_answerer.awrite_cover_letter.assert_awaited_once_with(jobs[0])
@@ -1,7 +1,10 @@
 import pytest
 from pathlib import Path
-from main import ConfigValidator, ConfigError, FileManager, init_driver
-from selenium.common.exceptions import WebDriverException
+from main import ConfigValidator, ConfigError, FileManager, init_driver, run_campaigns
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from unittest.mock import Mock
+from src import utils
+from src.taxonomy import TaxonomyIndex
 import yaml
 
 # Mock Data for Testing
@@ -123,6 +126,72 @@ def test_validate_data_folder_missing_files(tmp_invalid_data_folder):
     with pytest.raises(FileNotFoundError):
         FileManager.validate_data_folder(tmp_invalid_data_folder)
 
+# Test ConfigValidator.validate_campaigns()
+@pytest.fixture
+def tmp_campaigns_folder(tmp_path, mocker):
+    folder = tmp_path / "data_folder"
+    folder.mkdir()
+    write_yaml(folder / "search_config_1.yaml", VALID_YAML_CONTENT)
+    write_yaml(folder / "search_config_2.yaml", {**VALID_YAML_CONTENT, 'login': 'other_user'})
+    (folder / "secrets.yaml").write_text("llm_api_key: test_key")
+    mocker.patch.object(ConfigValidator, "validate_resume", side_effect=lambda path: {"resume": path.name})
+    return folder
+
+def test_validate_campaigns(tmp_campaigns_folder):
+    write_yaml(tmp_campaigns_folder / "campaigns.yaml", {'campaigns': [
+        {'name': 'first', 'search_config': 'search_config_1.yaml', 'structured_resume': 'resume_1.yaml'},
+        {'name': 'second', 'search_config': 'search_config_2.yaml', 'structured_resume': 'resume_2.yaml'},
+    ]})
+    secrets_file, campaigns_file = FileManager.validate_campaigns_data_folder(tmp_campaigns_folder)
+
+    campaigns = ConfigValidator().validate_campaigns(campaigns_file, tmp_campaigns_folder)
+
+    assert [campaign['name'] for campaign in campaigns] == ['first', 'second']
+    assert [campaign['parameters']['login'] for campaign in campaigns] == ['user', 'other_user']
+    assert campaigns[1]['resume'] == {"resume": "resume_2.yaml"}
+
+@pytest.mark.parametrize("campaigns", [
+    [],
+    [{'name': 'first', 'search_config': 'search_config_1.yaml'}],
+    [{'name': '../first', 'search_config': 'search_config_1.yaml', 'structured_resume': 'resume.yaml'}],
+    # повторяющееся имя кампании
+    [{'name': 'first', 'search_config': 'search_config_1.yaml', 'structured_resume': 'resume.yaml'},
+     {'name': 'first', 'search_config': 'search_config_2.yaml', 'structured_resume': 'resume.yaml'}],
+    # повторяющиеся логин и должность
+    [{'name': 'first', 'search_config': 'search_config_1.yaml', 'structured_resume': 'resume.yaml'},
+     {'name': 'second', 'search_config': 'search_config_1.yaml', 'structured_resume': 'resume.yaml'}],
+    # файл настроек поиска не найден
+    [{'name': 'first', 'search_config': 'missing.yaml', 'structured_resume': 'resume.yaml'}],
+])
+def test_validate_campaigns_invalid(tmp_campaigns_folder, campaigns):
+    write_yaml(tmp_campaigns_folder / "campaigns.yaml", {'campaigns': campaigns})
+    with pytest.raises(ConfigError):
+        ConfigValidator().validate_campaigns(tmp_campaigns_folder / "campaigns.yaml", tmp_campaigns_folder)
+
+def test_validate_campaigns_data_folder_missing_files(tmp_data_folder):
+    with pytest.raises(FileNotFoundError):
+        FileManager.validate_campaigns_data_folder(tmp_data_folder)
+
+def test_run_campaigns(mocker):
+    create_and_run_bot = mocker.patch("main.create_and_run_bot", side_effect=[None, Exception("Browser init failed")])
+    mocker.patch("main.campaign_chrome_profile", side_effect=lambda name: f"profiles/{name}")
+    campaigns = [{'name': name, 'parameters': {'login': name}, 'resume': {}} for name in ('first', 'second')]
+
+    # ошибка в одной кампании не останавливает остальные
+    run_campaigns(campaigns, "test_key")
+
+    assert create_and_run_bot.call_count == 2
+    create_and_run_bot.assert_any_call({'login': 'first'}, "test_key", {}, "profiles/first")
+
+@pytest.fixture(autouse=True)
+def chromedriver_cache(tmp_path, mocker):
+    """Сохранять найденный путь к chromedriver во временную папку"""
+    cache_path = tmp_path / "chromedriver_path.txt"
+    mocker.patch("src.utils.chromedriverCachePath", str(cache_path))
+    mocker.patch("src.utils._chromedriver_path", None)
+    return cache_path
+
+
 # Test init_driver() - This will require mocking Selenium's webdriver due to dependencies on external services.
 def test_init_driver(mocker):
     mocker.patch("src.utils.chrome_browser_options")
@@ -140,3 +209,122 @@ def test_init_driver_exception(mocker):
     mocker.patch("webdriver_manager.chrome.ChromeDriverManager.install", return_value="/path/to/chromedriver")
     with pytest.raises(RuntimeError):
       init_driver()
+
+
+def test_init_driver_attach(mocker):
+    mocker.patch("main.CHROME_DEBUGGER_ADDRESS", "127.0.0.1:9222")
+    mocker.patch("main.chromedriver_path", return_value="/path/to/chromedriver")
+    mocker.patch("main.ChromeService")
+    chrome = mocker.patch("selenium.webdriver.Chrome")
+
+    init_driver()
+
+    options = chrome.call_args.kwargs["options"]
+    assert options.experimental_options["debuggerAddress"] == "127.0.0.1:9222"
+
+
+def test_init_driver_attach_failed(mocker):
+    mocker.patch("main.CHROME_DEBUGGER_ADDRESS", "127.0.0.1:9222")
+    mocker.patch("main.chromedriver_path", return_value="/path/to/chromedriver")
+    mocker.patch("main.ChromeService")
+    browser_options = mocker.patch("main.chrome_browser_options")
+    chrome = mocker.patch("selenium.webdriver.Chrome", side_effect=[WebDriverException("cannot connect"), Mock()])
+
+    assert init_driver() is not None
+
+    # к запущенному Chrome подключиться не удалось - запускается новый браузер
+    assert chrome.call_args.kwargs["options"] is browser_options.return_value
+
+
+def test_init_driver_refreshes_chromedriver(mocker):
+    mocker.patch("main.chrome_browser_options")
+    mocker.patch("main.ChromeService")
+    chromedriver_path = mocker.patch("main.chromedriver_path", side_effect=["/old/chromedriver", "/new/chromedriver"])
+    mocker.patch("selenium.webdriver.Chrome", side_effect=[SessionNotCreatedException("version mismatch"), Mock()])
+
+    assert init_driver() is not None
+
+    chromedriver_path.assert_called_with(refresh=True)
+
+
+def test_chromedriver_path_cached(tmp_path, mocker, chromedriver_cache):
+    chromedriver = tmp_path / "chromedriver"
+    chromedriver.write_text("")
+    install = mocker.patch("src.utils.ChromeDriverManager")
+    install.return_value.install.return_value = str(chromedriver)
+    mocker.patch("src.utils.platform.system", return_value="Linux")
+
+    assert utils.chromedriver_path() == str(chromedriver)
+    assert chromedriver_cache.read_text() == str(chromedriver)
+
+    # при следующем запуске путь берется из файла без обращения к сети
+    mocker.patch("src.utils._chromedriver_path", None)
+    assert utils.chromedriver_path() == str(chromedriver)
+    assert install.return_value.install.call_count == 1
+
+
+def test_chromedriver_path_pinned(mocker):
+    mocker.patch("src.utils.CHROMEDRIVER_PATH", "/opt/chromedriver")
+    install = mocker.patch("src.utils.ChromeDriverManager")
+
+    assert utils.chromedriver_path() == "/opt/chromedriver"
+    install.assert_not_called()
+
+
+def test_validate_search_config_taxonomy(tmp_path):
+    config_file = tmp_path / "search_config.yaml"
+    config_validator = ConfigValidator()
+
+    with open(config_file, "w") as f:
+        yaml.dump({**VALID_YAML_CONTENT, "regions": ["Москва"], "districts": ["Замоскворечье"]}, f)
+    # районы не проверяются по справочнику - они задаются через форму поиска
+    assert config_validator.validate_search_config(config_file)["regions"] == ["Москва"]
+
+    with open(config_file, "w") as f:
+        yaml.dump({**VALID_YAML_CONTENT, "regions": ["Масква"]}, f)
+    with pytest.raises(ConfigError, match="возможно, имелось в виду 'Москва'"):
+        config_validator.validate_search_config(config_file)
+
+
+def test_validate_search_config_taxonomy_ambiguous(tmp_path, mocker):
+    mocker.patch("main.get_taxonomy", return_value=TaxonomyIndex({
+        "area": {"1": "Москва", "66": "Нижний Новгород", "67": "Великий Новгород", "1001": "Ленинск", "1002": "Ленинск"},
+        "metro": {"1.1": {"name": "Спортивная", "area": "1"}, "2.1": {"name": "Спортивная", "area": "2"}},
+        }))
+    warning = mocker.patch("main.logger.warning")
+    config_file = tmp_path / "search_config.yaml"
+    config_validator = ConfigValidator()
+
+    # станция ищется в выбранном регионе
+    with open(config_file, "w") as f:
+        yaml.dump({**VALID_YAML_CONTENT, "regions": ["Москва"], "subway": ["Спортивная"]}, f)
+    config_validator.validate_search_config(config_file)
+    warning.assert_not_called()
+
+    # город не выбран по части названия, одинаковые названия не выбираются наугад
+    with open(config_file, "w") as f:
+        yaml.dump({**VALID_YAML_CONTENT, "regions": ["Новгород", "Ленинск"]}, f)
+    config_validator.validate_search_config(config_file)
+    assert "Новгород" in warning.call_args_list[0].args[0]
+    assert "Ленинск (1001), Ленинск (1002)" in warning.call_args_list[1].args[0]
+
+
+def test_validate_search_config_taxonomy_form_fallback(tmp_path, mocker):
+    mocker.patch("main.get_taxonomy", return_value=TaxonomyIndex({"version": "seed", "area": {"1": "Москва"}}))
+    warning = mocker.patch("main.logger.warning")
+    config_file = tmp_path / "search_config.yaml"
+    config_validator = ConfigValidator()
+
+    with open(config_file, "w") as f:
+        yaml.dump({**VALID_YAML_CONTENT, "regions": ["Москва"], "districts": ["Замоскворечье"], "subway": ["Павелецкая"]}, f)
+    config_validator.validate_search_config(config_file)
+
+    # при проверке настроек видно, какие настройки не дадут открыть поиск по адресу
+    summary = warning.call_args.args[0]
+    assert "districts, subway" in summary and "python -m src.taxonomy --fetch" in summary
+
+    warning.reset_mock()
+    with open(config_file, "w") as f:
+        yaml.dump({**VALID_YAML_CONTENT, "regions": ["Москва"]}, f)
+    config_validator.validate_search_config(config_file)
+    warning.assert_not_called()
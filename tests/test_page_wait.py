@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException, TimeoutException, WebDriverException
+from src.page_wait import PageWait, SETTLE_JS, WAIT_FOR_CHANGE_JS
+
+
+def test_until_returns_immediately():
+    driver = MagicMock()
+    condition = Mock(return_value="element")
+
+    assert PageWait(driver, 4).until(condition) == "element"
+    # условие выполнено сразу - изменений страницы не ждем
+    driver.execute_async_script.assert_not_called()
+
+
+def test_until_rechecks_after_page_change():
+    driver = MagicMock()
+    condition = Mock(side_effect=[NoSuchElementException(), False, "element"])
+
+    assert PageWait(driver, 4).until(condition) == "element"
+
+    assert driver.execute_async_script.call_count == 2
+    assert driver.execute_async_script.call_args.args == (WAIT_FOR_CHANGE_JS, 500)
+
+
+@patch("src.page_wait.time.sleep")
+def test_until_timeout(mock_sleep):
+    driver = MagicMock()
+    # скрипт прерывается переходом на другую страницу
+    driver.execute_async_script.side_effect = WebDriverException("javascript error: document unloaded")
+
+    with pytest.raises(TimeoutException):
+        PageWait(driver, 0.05).until(Mock(return_value=False))
+    assert mock_sleep.called
+
+
+def test_settle():
+    driver = MagicMock()
+    driver.execute_async_script.return_value = True
+
+    assert PageWait(driver, 4).settle(idle_sec=0.3, timeout=2) is True
+    driver.execute_async_script.assert_called_once_with(SETTLE_JS, 300, 2000)
+
+    driver.execute_async_script.side_effect = NoSuchWindowException("no such window")
+    assert PageWait(driver, 4).settle() is False
+
+
+@patch("src.page_wait.time.sleep")
+def test_settle_after_navigation(mock_sleep):
+    driver = MagicMock()
+    # клик начал переход на другую страницу - ждем загрузки нового документа
+    driver.execute_async_script.side_effect = WebDriverException("javascript error: document unloaded")
+    driver.execute_script.side_effect = [WebDriverException("unloaded"), "loading", "complete"]
+
+    assert PageWait(driver, 4).settle() is True
+    assert driver.execute_script.call_count == 3
+    assert mock_sleep.call_count == 2
+
+    driver.execute_script.side_effect = None
+    driver.execute_script.return_value = "loading"
+    assert PageWait(driver, 4).settle(timeout=0) is False
@@ -0,0 +1,83 @@
+import base64
+import threading
+import pytest
+from unittest.mock import MagicMock, Mock
+from selenium.common.exceptions import WebDriverException
+from src.resume_builder.pdf_renderer import PDFRenderer, PDF_PRINT_OPTIONS
+
+
+def make_driver():
+    driver = MagicMock()
+    driver.execute_cdp_cmd.return_value = {"data": "pdf_data"}
+    return driver
+
+
+def test_render_reuses_driver():
+    create_driver = Mock(side_effect=make_driver)
+    renderer = PDFRenderer(create_driver)
+
+    assert renderer.render("<html><body>Резюме</body></html>") == "pdf_data"
+    assert renderer.render("<html><body>Другое резюме</body></html>") == "pdf_data"
+
+    # браузер запускается один раз, HTML передается без временных файлов
+    create_driver.assert_called_once()
+    driver = renderer._drivers.get_nowait()
+    url = driver.get.call_args_list[0].args[0]
+    assert url.startswith("data:text/html;charset=utf-8;base64,")
+    assert base64.b64decode(url.split(",", 1)[1]).decode("utf-8") == "<html><body>Резюме</body></html>"
+    driver.execute_async_script.assert_called()
+    driver.execute_cdp_cmd.assert_called_with("Page.printToPDF", PDF_PRINT_OPTIONS)
+
+
+def test_render_error_discards_driver():
+    drivers = [make_driver(), make_driver()]
+    drivers[0].get.side_effect = WebDriverException("Browser crashed")
+    renderer = PDFRenderer(Mock(side_effect=drivers))
+
+    with pytest.raises(RuntimeError):
+        renderer.render("<html></html>")
+    drivers[0].quit.assert_called_once()
+
+    # вместо неисправного браузера запускается новый
+    assert renderer.render("<html></html>") == "pdf_data"
+
+
+def test_start_driver_error_quits_browser():
+    drivers = [make_driver(), make_driver()]
+    drivers[0].set_page_load_timeout.side_effect = WebDriverException("Browser crashed")
+    renderer = PDFRenderer(Mock(side_effect=drivers))
+
+    with pytest.raises(WebDriverException):
+        renderer.render("<html></html>")
+    # запущенный браузер закрыт, а не оставлен работать
+    drivers[0].quit.assert_called_once()
+    assert renderer._started_num == 0
+
+    assert renderer.render("<html></html>") == "pdf_data"
+
+
+def test_render_concurrently():
+    started = threading.Barrier(2, timeout=5)
+    drivers = []
+
+    def create_driver():
+        driver = make_driver()
+        # оба резюме печатаются одновременно в разных браузерах
+        driver.get.side_effect = lambda url: started.wait()
+        drivers.append(driver)
+        return driver
+
+    renderer = PDFRenderer(create_driver, browsers_num=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(renderer.render("<html></html>"))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["pdf_data", "pdf_data"]
+    assert len(drivers) == 2
+
+    renderer.close()
+    for driver in drivers:
+        driver.quit.assert_called_once()
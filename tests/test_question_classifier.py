@@ -0,0 +1,79 @@
+import json
+import pytest
+from src.llm.question_classifier import RULE_CONFIDENCE, QuestionSectionClassifier, section_name_from_reply
+import src.llm.prompts as prompts
+
+
+@pytest.fixture
+def classifier():
+    return QuestionSectionClassifier(min_samples=4)
+
+
+def test_section_name_from_reply():
+    assert section_name_from_reply("Salary Expectations") == "salary_expectations"
+    assert section_name_from_reply("**Personal Information**") == "personal_information"
+    assert section_name_from_reply("unknown") is None
+
+
+@pytest.mark.parametrize("question,section_name", [
+    ("Укажите ваши ожидания по заработной плате", "salary_expectations"),
+    ("Какой у вас уровень английского?", "languages"),
+    ("Готовы ли вы к командировкам?", "work_preferences"),
+    ("Почему вы ищете новую работу?", "previous_job_details"),
+])
+def test_predict_by_keywords(classifier, question, section_name):
+    # без подтверждения классификатором уверенность ниже порога, тему уточняет LLM
+    assert classifier.predict(question) == (section_name, RULE_CONFIDENCE)
+
+
+def test_predict_by_keywords_confirmed(classifier):
+    classifier.train([
+        ("Ваши ожидания по зарплате?", "salary_expectations"),
+        ("Желаемый уровень дохода", "salary_expectations"),
+        ("Что такое GIL в Python?", "general_knowledge_questions"),
+        ("Ссылка на ваш GitHub", "personal_information"),
+    ])
+
+    assert classifier.predict("Укажите ваши ожидания по заработной плате") == ("salary_expectations", 1.0)
+
+
+@pytest.mark.parametrize("question", [
+    "Какой доход у вашей компании был в прошлом году?",
+    "Какой язык программирования вы используете? Which programming language do you prefer?",
+    "Есть ли у вас контакты с заказчиками?",
+    "Разрабатывали ли вы приложения для телефонов?",
+])
+def test_predict_broad_words_are_not_rules(classifier, question):
+    assert classifier.predict(question) == (None, 0.0)
+
+
+def test_predict_without_samples(classifier):
+    # вопрос подходит под несколько правил, а обученной модели еще нет
+    assert classifier.predict("Готовы ли вы к переезду и какой у вас уровень английского?") == (None, 0.0)
+
+
+def test_predict_by_model(classifier):
+    classifier.train([
+        ("Что такое GIL в Python?", "general_knowledge_questions"),
+        ("Какие HTTP методы вы знаете?", "general_knowledge_questions"),
+        ("Что такое REST API?", "general_knowledge_questions"),
+        ("Ссылка на ваш GitHub", "personal_information"),
+    ])
+
+    section_name, confidence = classifier.predict("Что такое декоратор в Python?")
+
+    assert section_name == "general_knowledge_questions"
+    assert 0.5 < confidence <= 1.0
+
+
+def test_train_from_llm_log(classifier, tmp_path):
+    log_path = tmp_path / "llm_api_calls.jsonl"
+    entries = [
+        {"prompts": {"prompt_1": prompts.question_section_template.format(question="Что такое GIL?")},
+         "replies": "General Knowledge Questions"},
+        {"prompts": {"prompt_1": "Write a cover letter"}, "replies": "Dear hiring manager"},
+    ]
+    log_path.write_text("\n".join(json.dumps(entry, ensure_ascii=False) for entry in entries), encoding="utf-8")
+
+    assert classifier.train_from_llm_log(str(log_path)) == 1
+    assert len(classifier) == 1
@@ -0,0 +1,63 @@
+import base64
+from unittest.mock import patch
+from reportlab.lib import colors
+from src.resume_builder.reportlab_renderer import ReportlabRenderer, css_theme, find_fonts, register_fonts
+
+RESUME_BODY = """<body><header><h1>Иван Петров</h1><div class="contact-info">
+<p class="fas fa-envelope"><a href="mailto:ivan@example.com">ivan@example.com</a></p>
+<p class="fab fa-github"><i class="fab fa-github"></i><a href="https://github.com/ivan">GitHub</a></p>
+</div></header><main>
+<section id="work-experience"><h2>Опыт работы</h2><div class="entry">
+<div class="entry-header"><span class="entry-name">ООО Ромашка</span><span class="entry-location">Москва</span></div>
+<div class="entry-details"><span class="entry-title">Python разработчик</span><span class="entry-year">2020 – 2024</span></div>
+<ul class="compact-list"><li><strong>Ускорил</strong> сервис в 3 раза &amp; больше</li></ul>
+</div></section>
+<section id="skills-section"><h2>Навыки</h2><div class="two-column">
+<ul class="compact-list"><li>Python</li></ul><ul class="compact-list"><li>SQL</li></ul>
+</div></section></main></body>"""
+
+
+def test_css_theme():
+    css = """@import url("https://fonts.googleapis.com/css2?family=Open+Sans:wght@0,400;0,600&display=swap");
+    :root { --textColor: #383838; }
+    * { color: var(--textColor); }
+    body { font-size: 10pt; }
+    header { background-color: #3498db; }
+    h1 { font-size: 28pt; color: #fff; }
+    h2 { border-bottom: 2px solid #3498db; }
+    a { color: #0077b5; }
+    @media print { h1 { font-size: 24pt; } }"""
+
+    theme = css_theme(css)
+
+    assert theme["text_color"] == colors.HexColor("#383838")
+    assert theme["font_size"] == 10
+    assert theme["header_bg"] == colors.HexColor("#3498db")
+    assert theme["name_color"] == colors.HexColor("#ffffff")
+    # для печати используются правила @media print
+    assert theme["name_size"] == 24
+    assert theme["h2_border"] == colors.HexColor("#3498db")
+    assert theme["link_color"] == colors.HexColor("#0077b5")
+
+
+def test_render_bundled_styles():
+    renderer = ReportlabRenderer()
+    for style in ("style_josylad_blue.css", "style_samodum_bold.css", "style_cloyola.css"):
+        with open(f"src/resume_builder/resume_style/{style}", "r", encoding="utf-8") as f:
+            css = f.read()
+
+        pdf = base64.b64decode(renderer.render(f"<html><head><style>{css}</style></head>{RESUME_BODY}</html>"))
+
+        assert pdf.startswith(b"%PDF")
+
+
+def test_font_fallback(tmp_path):
+    # заданный шрифт не найден и системных шрифтов нет - используется Helvetica
+    with patch("src.resume_builder.reportlab_renderer.FONT_CANDIDATES", []):
+        assert find_fonts(str(tmp_path / "missing.ttf")) is None
+        assert register_fonts(str(tmp_path / "missing.ttf")) == ("Helvetica", "Helvetica-Bold")
+        renderer = ReportlabRenderer(str(tmp_path / "missing.ttf"))
+
+    pdf = base64.b64decode(renderer.render(f"<html>{RESUME_BODY}</html>"))
+
+    assert pdf.startswith(b"%PDF")
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.prompt_values import StringPromptValue
+from src.llm.response_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(str(tmp_path / "llm_cache.db"), max_entries=2)
+
+
+def make_reply(content):
+    return MagicMock(content=content,
+                     response_metadata={"model_name": "test"},
+                     usage_metadata={"input_tokens": 1, "output_tokens": 2, "total_tokens": 3})
+
+
+def test_make_key_depends_on_prompt_model_and_temperature():
+    key = LLMResponseCache.make_key("openai/gpt", 0.4, StringPromptValue(text="вопрос"))
+    assert key == LLMResponseCache.make_key("openai/gpt", 0.4, StringPromptValue(text="вопрос"))
+    assert key != LLMResponseCache.make_key("openai/gpt", 0.4, StringPromptValue(text="другой вопрос"))
+    assert key != LLMResponseCache.make_key("openai/other", 0.4, StringPromptValue(text="вопрос"))
+    assert key != LLMResponseCache.make_key("openai/gpt", 0.7, StringPromptValue(text="вопрос"))
+
+
+def test_get_and_put(cache):
+    assert cache.get("key") is None
+    cache.put("key", make_reply("ответ"))
+
+    reply = cache.get("key")
+
+    assert reply.content == "ответ"
+    assert reply.response_metadata == {"model_name": "test"}
+    assert reply.usage_metadata["total_tokens"] == 3
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction(cache):
+    cache.put("a", make_reply("a"))
+    cache.put("b", make_reply("b"))
+    cache.get("a")
+    cache.put("c", make_reply("c"))
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a").content == "a"
+    assert cache.get("c").content == "c"
+
+
+def test_cache_persists(tmp_path):
+    db_path = str(tmp_path / "llm_cache.db")
+    LLMResponseCache(db_path, max_entries=10).put("key", make_reply("ответ"))
+
+    reopened = LLMResponseCache(db_path, max_entries=10)
+
+    assert len(reopened) == 1
+    assert reopened.get("key").content == "ответ"
@@ -0,0 +1,113 @@
+import threading
+import httpx
+import openai
+import pytest
+from unittest.mock import Mock
+from src.resume_queue import ResumeQueue, is_transient, retry_delay
+
+
+@pytest.fixture
+def queue(tmp_path):
+    _queue = ResumeQueue(str(tmp_path / "resume_jobs.db"), workers_num=1, max_pending=1, max_attempts=3,
+                         retry_delay_sec=0)
+    yield _queue
+    _queue.close()
+
+
+def write_file(path):
+    with open(path, "wb") as f:
+        f.write(b"%PDF")
+
+
+def test_submit_creates_resume(tmp_path, queue):
+    path = str(tmp_path / "cv.pdf")
+
+    future = queue.submit("https://hh.ru/vacancy/1", path, lambda: write_file(path), "company", "job")
+
+    assert future.result() is True
+    assert queue.status("https://hh.ru/vacancy/1") == "done"
+    # созданное резюме не создается повторно
+    assert queue.submit("https://hh.ru/vacancy/1", path, lambda: write_file(path)) is None
+
+
+def test_submit_retries_limited(tmp_path, queue):
+    path = str(tmp_path / "cv.pdf")
+    create = Mock(side_effect=[TimeoutError("LLM timeout"), None])
+    failing = Mock(side_effect=TimeoutError("LLM timeout"))
+
+    assert queue.submit("https://hh.ru/vacancy/1", path, create).result() is True
+    assert queue.submit("https://hh.ru/vacancy/2", path, failing).result() is False
+
+    assert create.call_count == 2
+    assert failing.call_count == 3
+    assert queue.status("https://hh.ru/vacancy/2") == "failed"
+    assert queue.counts() == {"queued": 0, "running": 0, "done": 1, "failed": 1}
+
+
+def test_submit_doesnt_retry_permanent_error(tmp_path, queue):
+    too_large = Mock(side_effect=ValueError("Resume file size exceeds the maximum limit of 2 MB"))
+
+    # ошибка не временная - повторять попытку бессмысленно
+    assert queue.submit("https://hh.ru/vacancy/1", str(tmp_path / "cv.pdf"), too_large).result() is False
+    too_large.assert_called_once()
+    assert queue.status("https://hh.ru/vacancy/1") == "failed"
+
+
+def test_submit_waits_for_free_slot(tmp_path, queue):
+    started = threading.Event()
+    finish = threading.Event()
+
+    def slow_create():
+        started.set()
+        finish.wait(5)
+
+    queue.submit("https://hh.ru/vacancy/1", str(tmp_path / "1.pdf"), slow_create)
+    started.wait(5)
+    queue.submit("https://hh.ru/vacancy/2", str(tmp_path / "2.pdf"), Mock())
+    # одно резюме создается, одно ждет в очереди - третье ставится в очередь только после освобождения места
+    third = threading.Thread(target=queue.submit, args=("https://hh.ru/vacancy/3", str(tmp_path / "3.pdf"), Mock()))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()
+    assert queue.status("https://hh.ru/vacancy/3") is None
+
+    finish.set()
+    third.join(5)
+    queue.wait()
+    assert queue.status("https://hh.ru/vacancy/3") == "done"
+
+
+def test_interrupted_resumes_marked_failed(tmp_path):
+    db_path = str(tmp_path / "resume_jobs.db")
+    queue = ResumeQueue(db_path)
+    queue._set_status("https://hh.ru/vacancy/1", "running", path=str(tmp_path / "cv.pdf"))
+    queue.close()
+
+    reopened = ResumeQueue(db_path)
+
+    assert reopened.status("https://hh.ru/vacancy/1") == "failed"
+    reopened.close()
+
+
+def test_retry_delay():
+    request = httpx.Request("POST", "https://api.openai.com")
+    rate_limit = httpx.HTTPStatusError("429", request=request,
+                                       response=httpx.Response(429, headers={"retry-after-ms": "1500"}, request=request))
+
+    assert retry_delay(rate_limit, 20) == 1.5
+    assert retry_delay(RuntimeError("error"), 20) == 20
+    # ошибка клиента OpenAI тоже содержит ответ API
+    openai_rate_limit = openai.RateLimitError("rate limit", body=None, response=httpx.Response(
+        429, headers={"retry-after": "3"}, request=request))
+    assert retry_delay(openai_rate_limit, 20) == 3.0
+
+
+def test_is_transient():
+    request = httpx.Request("POST", "https://api.openai.com")
+
+    assert is_transient(openai.RateLimitError("rate limit", body=None, response=httpx.Response(429, request=request)))
+    assert is_transient(openai.APITimeoutError(request))
+    assert is_transient(httpx.HTTPStatusError("503", request=request, response=httpx.Response(503, request=request)))
+    assert is_transient(httpx.ReadTimeout("timeout", request=request))
+    assert not is_transient(httpx.HTTPStatusError("401", request=request, response=httpx.Response(401, request=request)))
+    assert not is_transient(ValueError("Resume file size exceeds the maximum limit of 2 MB"))
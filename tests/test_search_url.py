@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import Mock
+from urllib.parse import parse_qsl, urlsplit
+from src.search_url import SearchUrlError, build_search_url, build_search_params
+
+
+PARAMETERS = {
+    "job_title": "Программист Python",
+    "login": "ivan_ivanov@gmail.com",
+    "keywords": ["ML инженер"],
+    "search_only": {"vacancy_name": True, "company_name": False, "vacancy_description": True},
+    "words_to_exclude": ["Аналитик", "Analyst"],
+    "regions": ["1"],
+    "income": 300000,
+    "education": {"not_needed": True, "middle": False, "higher": True},
+    "experience": {"doesnt_matter": False, "between_1_and_3": True, "between_3_and_6": False},
+    "job_type": {"full_time": True, "part_time": False, "civil_law_contract": True},
+    "work_schedule": {"flexible": True, "remote": True},
+    "other_params": {"not_from_agency": True, "accredited_it": False},
+    "sort_by": {"relevance": False, "publication_time": True},
+    "output_period": {"all_time": False, "week": True},
+    "output_size": {"show_20": False, "show_50": True},
+    }
+
+
+def test_build_search_url():
+    url = build_search_url(PARAMETERS, resume_id="abc123")
+
+    assert url.startswith("https://hh.ru/search/vacancy?")
+    assert parse_qsl(urlsplit(url).query) == [
+        ("text", "ML инженер"),
+        ("excluded_text", "Аналитик, Analyst"),
+        ("experience", "between1And3"),
+        ("order_by", "publication_time"),
+        ("search_period", "7"),
+        ("items_on_page", "50"),
+        ("search_field", "name"),
+        ("search_field", "description"),
+        ("education", "not_required_or_not_specified"),
+        ("education", "higher"),
+        ("employment", "full"),
+        ("schedule", "flexible"),
+        ("schedule", "remote"),
+        ("label", "not_from_agency"),
+        ("accept_temporary", "true"),
+        ("salary", "300000"),
+        ("area", "1"),
+        ("resume", "abc123"),
+        ]
+
+
+def test_build_search_params_doesnt_matter():
+    params = build_search_params({"experience": {"doesnt_matter": True, "no_experience": True}})
+
+    assert params == []
+
+
+def test_build_search_params_unresolved_names():
+    parameters = {**PARAMETERS, "regions": ["Москва"], "subway": ["Павелецкая"]}
+
+    with pytest.raises(SearchUrlError, match="regions: Москва, subway: Павелецкая"):
+        build_search_params(parameters)
+
+    # названия, которые удалось перевести в идентификаторы
+    resolve = Mock(side_effect=lambda kind, name, areas: {"Москва": "1", "Павелецкая": "5.76"}[name])
+    params = build_search_params(parameters, resolve=resolve)
+    assert ("area", "1") in params
+    assert ("metro", "5.76") in params
+    # станция ищется в выбранных регионах
+    resolve.assert_called_with("metro", "Павелецкая", ["1"])
+
+
+def test_build_search_params_districts():
+    with pytest.raises(SearchUrlError, match="districts"):
+        build_search_params({**PARAMETERS, "districts": ["Замоскворечье"]}, resolve=Mock(return_value="1"))
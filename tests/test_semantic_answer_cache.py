@@ -0,0 +1,102 @@
+import numpy as np
+
+from src.semantic_answer_cache import HashedNgramVectorizer, SemanticAnswerCache
+
+
+def make_cache(tmp_path, threshold=0.9):
+    return SemanticAnswerCache(str(tmp_path / "answers_faiss.vectors"), str(tmp_path / "answers_faiss.jsonl"), threshold)
+
+
+def test_vectorizer_is_normalized_and_stable():
+    vectorizer = HashedNgramVectorizer()
+    vector = vectorizer.transform("Готовы ли вы к переезду?")
+
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+    assert np.array_equal(vector, vectorizer.transform("Готовы ли вы к переезду?"))
+    assert np.isclose(vector @ vectorizer.transform("готовы ли Вы к переезду"), 1.0)
+
+
+def test_find_similar_question(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add("login", "job", "Готовы ли вы к переезду?", "Да")
+
+    assert cache.find("login", "job", "готовы ли Вы к переезду") == "Да"
+    assert cache.find("login", "job", "Какая у вас желаемая зарплата?") is None
+    assert cache.find("other_login", "job", "Готовы ли вы к переезду?") is None
+
+
+def test_cache_is_persisted(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add_many([("login", "job", "Вопрос номер один", "Ответ 1"),
+                    ("login", "job", "Совсем другой вопрос", "Ответ 2")])
+
+    reloaded_cache = make_cache(tmp_path)
+
+    assert len(reloaded_cache) == 2
+    assert reloaded_cache._indexes[("login", "job")].ntotal == 2
+    assert reloaded_cache.find("login", "job", "Совсем другой вопрос") == "Ответ 2"
+
+
+def test_index_is_rebuilt_from_metadata(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add("login", "job", "Вопрос номер один", "Ответ 1")
+    (tmp_path / "answers_faiss.vectors").unlink()
+
+    reloaded_cache = make_cache(tmp_path)
+
+    assert reloaded_cache._indexes[("login", "job")].ntotal == 1
+    assert (tmp_path / "answers_faiss.vectors").stat().st_size == 2048 * 4
+    assert reloaded_cache.find("login", "job", "Вопрос номер один") == "Ответ 1"
+
+
+def test_incomplete_metadata_is_skipped(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add("login", "job", "Вопрос номер один", "Ответ 1")
+    with open(tmp_path / "answers_faiss.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"question": "x"}\n["login", "job"]\n')
+
+    # запись без логина и резюме не мешает загрузить остальные вопросы
+    reloaded_cache = make_cache(tmp_path)
+
+    assert len(reloaded_cache) == 1
+    assert reloaded_cache.find("login", "job", "Вопрос номер один") == "Ответ 1"
+
+
+def test_different_technology_is_not_similar(tmp_path):
+    cache = make_cache(tmp_path)
+    question = "Сколько лет вы работаете с {}? Укажите число лет коммерческого опыта разработки"
+    cache.add("login", "job", question.format("Python"), "5")
+
+    assert cache.find("login", "job", question.format("Python").lower()) == "5"
+    assert cache.find("login", "job", question.format("Java")) is None
+    assert cache.find("login", "job", question.format("Go")) is None
+    # вопросы с разными числами тоже отличаются
+    cache.add("login", "job", "Готовы ли вы работать в офисе 5 дней в неделю по графику компании?", "Да")
+    assert cache.find("login", "job", "Готовы ли вы работать в офисе 2 дней в неделю по графику компании?") is None
+
+
+def test_vectors_are_appended(tmp_path):
+    cache = make_cache(tmp_path)
+    vectors_path = tmp_path / "answers_faiss.vectors"
+    cache.add("login", "job", "Вопрос номер один", "Ответ 1")
+    cache.add("login", "job", "Совсем другой вопрос", "Ответ 2")
+
+    assert vectors_path.stat().st_size == 2 * 2048 * 4
+
+    # векторы, которые не успели записаться, досчитываются при запуске
+    with open(vectors_path, "r+b") as f:
+        f.truncate(2048 * 4)
+    reloaded_cache = make_cache(tmp_path)
+
+    assert vectors_path.stat().st_size == 2 * 2048 * 4
+    assert reloaded_cache.find("login", "job", "Совсем другой вопрос") == "Ответ 2"
+
+
+def test_search_is_limited_to_login_and_job(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.search_depth = 2
+    # у других логинов много почти одинаковых вопросов
+    cache.add_many([(f"other_login_{i}", "job", "Готовы ли вы к переезду?", "Нет") for i in range(5)])
+    cache.add("login", "job", "Готовы ли вы к переезду в другой город?", "Да")
+
+    assert cache.find("login", "job", "Готовы ли вы к переезду в другой город") == "Да"
@@ -0,0 +1,37 @@
+import time
+from src.session_store import SessionStore
+
+
+def test_save_and_get(tmp_path):
+    path = str(tmp_path / "sessions.json")
+    store = SessionStore(path)
+    cookies = [
+        {"name": "hhtoken", "value": "token", "domain": ".hh.ru", "expires": time.time() + 3600},
+        {"name": "old", "value": "old", "domain": ".hh.ru", "expires": time.time() - 3600},
+        {"name": "session", "value": "session", "domain": "hh.ru"},
+        ]
+
+    store.save("login", cookies, {"key": "value"})
+
+    # сессии сохраняются в файл, истекшие cookies не восстанавливаются
+    session = SessionStore(path).get("login")
+    assert [cookie["name"] for cookie in session["cookies"]] == ["hhtoken", "session"]
+    assert session["local_storage"] == {"key": "value"}
+    assert store.get("other_login") is None
+
+
+def test_delete(tmp_path):
+    path = str(tmp_path / "sessions.json")
+    store = SessionStore(path)
+    store.save("login", [], {})
+
+    store.delete("login")
+
+    assert SessionStore(path).get("login") is None
+
+
+def test_broken_file(tmp_path):
+    path = tmp_path / "sessions.json"
+    path.write_text("{", encoding="utf-8")
+
+    assert SessionStore(str(path)).get("login") is None
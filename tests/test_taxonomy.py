@@ -0,0 +1,114 @@
+import json
+import httpx
+import pytest
+import src.taxonomy as taxonomy_module
+from src.taxonomy import TaxonomyIndex, TaxonomyMatch, fetch_hh_dumps, levenshtein, parse_hh_dump, save_taxonomy
+
+
+@pytest.fixture
+def taxonomy():
+    return TaxonomyIndex({
+        "version": "test",
+        "area": {"113": "Россия", "1": "Москва", "2": "Санкт-Петербург", "66": "Нижний Новгород",
+                 "67": "Великий Новгород", "1001": "Ленинск", "1002": "Ленинск"},
+        "professional_role": {"96": "Программист, разработчик", "10": "Аналитик", "11": "Аналитик данных"},
+        "metro": {"5.76": {"name": "Павелецкая", "area": "1"}, "1.8": {"name": "Речной вокзал", "area": "1"},
+                  "1.26": {"name": "Спортивная", "area": "1"}, "2.40": {"name": "Спортивная", "area": "2"}},
+        })
+
+
+def test_find(taxonomy):
+    # точное совпадение без учета регистра и знаков препинания
+    assert taxonomy.find("area", "москва") == TaxonomyMatch("1", "Москва", False)
+    assert taxonomy.resolve("area", "Санкт Петербург") == "2"
+    # название, содержащее все слова из настройки
+    assert taxonomy.find("professional_role", "Программист") == TaxonomyMatch("96", "Программист, разработчик", False)
+    # идентификатор вместо названия
+    assert taxonomy.resolve("area", "113") == "113"
+    # опечатка
+    assert taxonomy.find("metro", "Поавелецкая") == TaxonomyMatch("5.76", "Павелецкая", True)
+    assert taxonomy.find("area", "Лондон") is None
+
+
+def test_find_ambiguous(taxonomy):
+    # одинаковые названия не выбираются наугад
+    match = taxonomy.find("area", "Ленинск")
+    assert match.id is None and match.ambiguous == ("Ленинск (1001)", "Ленинск (1002)")
+    assert taxonomy.resolve("area", "Ленинск") is None
+    # город ищется только по полному названию
+    assert taxonomy.find("area", "Новгород") is None
+    # часть названия специализации подходит к нескольким записям
+    assert taxonomy.resolve("professional_role", "данных") == "11"
+    taxonomy.update({"professional_role": {"12": "Аналитик данных, BI"}})
+    assert taxonomy.find("professional_role", "данных").ambiguous == ("Аналитик данных (11)", "Аналитик данных, BI (12)")
+    # полное название по-прежнему находится
+    assert taxonomy.resolve("professional_role", "Аналитик") == "10"
+
+
+def test_find_metro_by_area(taxonomy):
+    # станции с одинаковым названием в разных городах
+    assert taxonomy.find("metro", "Спортивная").ambiguous == ("Спортивная (1.26)", "Спортивная (2.40)")
+    assert taxonomy.resolve("metro", "Спортивная", ["2"]) == "2.40"
+    assert taxonomy.resolve("metro", "Спортивная", ["1", "113"]) == "1.26"
+    # станции другого города не подходят
+    assert taxonomy.resolve("metro", "Павелецкая", ["2"]) is None
+    # для выбранного региона станций в справочнике нет - ищем по всем
+    assert taxonomy.resolve("metro", "Павелецкая", ["113"]) == "5.76"
+    # переименованная запись больше не находится по старому названию
+    taxonomy.update({"metro": {"1.26": {"name": "Лужники", "area": "1"}}})
+    assert taxonomy.resolve("metro", "Спортивная") == "2.40"
+    assert taxonomy.to_dict()["metro"]["1.26"] == {"name": "Лужники", "area": "1"}
+
+
+def test_load_overrides_seed(tmp_path):
+    seed = tmp_path / "seed.json"
+    seed.write_text(json.dumps({"version": "seed", "area": {"1": "Москва"}}), encoding="utf-8")
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps({"version": "2026-10-01", "area": {"4": "Новосибирск"}}), encoding="utf-8")
+
+    taxonomy = TaxonomyIndex.load([seed, dump])
+
+    assert taxonomy.version == "2026-10-01"
+    assert taxonomy.resolve("area", "Москва") == "1"
+    assert taxonomy.resolve("area", "Новосибирск") == "4"
+    assert len(taxonomy) == 2
+
+
+def test_parse_hh_dump():
+    areas = [{"id": "113", "name": "Россия", "areas": [{"id": "1", "name": "Москва", "areas": []}]}]
+    roles = {"categories": [{"id": "11", "name": "IT", "roles": [{"id": "96", "name": "Программист, разработчик"}]}]}
+    industries = [{"id": "7", "name": "IT", "industries": [{"id": "7.540", "name": "Разработка ПО"}]}]
+    metro = [{"id": "1", "name": "Москва", "lines": [{"id": "5", "stations": [{"id": "5.76", "name": "Павелецкая"}]}]}]
+
+    assert parse_hh_dump(areas) == {"area": {"113": "Россия", "1": "Москва"}}
+    assert parse_hh_dump(roles) == {"professional_role": {"96": "Программист, разработчик"}}
+    assert parse_hh_dump(industries) == {"industry": {"7": "IT", "7.540": "Разработка ПО"}}
+    assert parse_hh_dump(metro) == {"metro": {"5.76": {"name": "Павелецкая", "area": "1"}}}
+    with pytest.raises(ValueError):
+        parse_hh_dump({"items": []})
+
+
+def test_fetch_and_save_taxonomy(tmp_path, monkeypatch):
+    responses = {
+        "/areas": [{"id": "113", "name": "Россия", "areas": [{"id": "4", "name": "Новосибирск", "areas": []}]}],
+        "/professional_roles": {"categories": [{"id": "11", "name": "IT", "roles": [{"id": "96", "name": "Программист"}]}]},
+        "/industries": [{"id": "7", "name": "IT", "industries": []}],
+        "/metro": [{"id": "4", "name": "Новосибирск", "lines": [{"id": "9", "stations": [{"id": "9.1", "name": "Площадь Ленина"}]}]}],
+        }
+    requests = []
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=responses[request.url.path])
+    monkeypatch.setattr(taxonomy_module, "taxonomy_paths", lambda: [])
+    path = tmp_path / "data_folder" / "hh_taxonomy.json"
+
+    taxonomy = save_taxonomy(fetch_hh_dumps(httpx.MockTransport(handler)), path)
+
+    assert all(request.headers["User-Agent"] for request in requests)
+    assert taxonomy.resolve("metro", "Площадь Ленина", ["4"]) == "9.1"
+    assert TaxonomyIndex.load([path]).resolve("area", "Новосибирск") == "4"
+
+
+def test_levenshtein():
+    assert levenshtein("москва", "масква", 2) == 1
+    assert levenshtein("москва", "санкт петербург", 2) == 3
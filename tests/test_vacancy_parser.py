@@ -0,0 +1,53 @@
+import pytest
+from src.vacancy_parser import parse_vacancy_html, parse_vacancy_files
+
+
+VACANCY_HTML = """
+<html><head><script>var x = 1;</script></head><body>
+<h1 data-qa="vacancy-title"><span>Python&nbsp;разработчик</span></h1>
+<div data-qa="vacancy-salary-compensation-type-net">от 200 000 ₽ на руки</div>
+<span data-qa="vacancy-company-name">ООО   Рога и копыта</span>
+<p data-qa="vacancy-view-location">Москва</p>
+<div data-qa="vacancy-description">
+    <p>Ищем разработчика.</p>
+    <ul><li>Python</li><li>Django<br>REST</li></ul>
+    <style>.a {color: red}</style>
+</div>
+<li data-qa="skills-element">Python</li>
+<li data-qa="skills-element">SQL</li>
+</body></html>
+"""
+
+
+def test_parse_vacancy_html():
+    job = parse_vacancy_html(VACANCY_HTML)
+
+    assert job == {
+        "title": "Python разработчик",
+        "salary": "от 200 000 ₽ на руки",
+        "experience": None,
+        "job_type": None,
+        "company_name": "ООО Рога и копыта",
+        "company_address": "Москва",
+        "description": "Ищем разработчика.\nPython\nDjango\nREST",
+        "skills": "Python, SQL",
+    }
+
+
+def test_parse_vacancy_html_branded_description():
+    job = parse_vacancy_html('<div data-qa="vacancy-branded">Брендированное описание</div>'
+                             '<div data-qa="vacancy-description">Описание</div>')
+
+    assert job["description"] == "Брендированное описание"
+    assert job["title"] is None
+    assert job["skills"] == ""
+
+
+def test_parse_vacancy_files(tmp_path):
+    good_file = tmp_path / "vacancy.html"
+    good_file.write_text(VACANCY_HTML, encoding="utf-8")
+
+    results = list(parse_vacancy_files([str(good_file), str(tmp_path / "missing.html")]))
+
+    assert len(results) == 1
+    assert results[0][1]["title"] == "Python разработчик"
@@ -0,0 +1,58 @@
+import pytest
+from src.vacancy_queue import VacancyQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return VacancyQueue(str(tmp_path / "vacancy_queue.db"))
+
+
+def make_vacancy(vacancy_id):
+    return {"vacancy_id": vacancy_id, "url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "title": f"job_{vacancy_id}", "company": "company"}
+
+
+def test_add_many_deduplicates(queue):
+    assert queue.add_many("login", "job", [make_vacancy("1"), make_vacancy("2"), make_vacancy("")]) == 2
+    assert queue.add_many("login", "job", [make_vacancy("2"), make_vacancy("3")]) == 1
+    # для другой должности очередь своя
+    assert queue.add_many("login", "other_job", [make_vacancy("1")]) == 1
+
+    assert [vacancy["vacancy_id"] for vacancy in queue.pending("login", "job")] == ["1", "2", "3"]
+
+
+def test_mark_done(queue):
+    queue.add_many("login", "job", [make_vacancy("1"), make_vacancy("2")])
+
+    queue.mark_done("login", "job", "1", "Success")
+
+    assert queue.pending("login", "job") == [make_vacancy("2")]
+    # обработанная вакансия не добавляется в очередь повторно
+    assert queue.add_many("login", "job", [make_vacancy("1")]) == 0
+
+
+def test_queue_persists(tmp_path, queue):
+    queue.add_many("login", "job", [make_vacancy("1")])
+    queue.close()
+
+    reopened = VacancyQueue(str(tmp_path / "vacancy_queue.db"))
+
+    assert reopened.pending("login", "job", limit=1) == [make_vacancy("1")]
+
+
+def test_claim_and_release(queue):
+    queue.add_many("login", "job", [make_vacancy(str(i)) for i in range(1, 6)])
+
+    first = queue.claim("login", "job", "worker_1", 2)
+    second = queue.claim("login", "job", "worker_2", 2)
+
+    # одна вакансия не достается двум браузерам
+    assert [vacancy["vacancy_id"] for vacancy in first] == ["1", "2"]
+    assert [vacancy["vacancy_id"] for vacancy in second] == ["3", "4"]
+    assert [vacancy["vacancy_id"] for vacancy in queue.pending("login", "job")] == ["5"]
+
+    queue.mark_done("login", "job", "1", "Success")
+    assert queue.release("login", "job", "worker_1") == 1
+    assert [vacancy["vacancy_id"] for vacancy in queue.pending("login", "job")] == ["2", "5"]
+    assert queue.release("login", "job") == 2
+    assert len(queue.pending("login", "job")) == 4
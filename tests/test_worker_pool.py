@@ -0,0 +1,106 @@
+import threading
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+from src.worker_pool import ApplyCoordinator, WorkerPool
+
+
+def test_coordinator_limit():
+    coordinator = ApplyCoordinator(max_applies_num=2, min_interval_sec=0)
+
+    assert coordinator.acquire()
+    coordinator.release(success=False)
+    assert coordinator.acquire()
+    coordinator.release(success=True)
+    assert coordinator.acquire()
+    coordinator.release(success=True)
+
+    assert coordinator.limit_reached()
+    assert not coordinator.acquire()
+    assert coordinator.applies_num == 2
+
+
+def test_coordinator_waits_for_busy_slots():
+    coordinator = ApplyCoordinator(max_applies_num=1, min_interval_sec=0)
+    assert coordinator.acquire()
+    results = []
+    # второй браузер ждет, пока первый не закончит обработку вакансии
+    thread = threading.Thread(target=lambda: results.append(coordinator.acquire()))
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    coordinator.release(success=True)
+    thread.join(1)
+
+    assert results == [False]
+
+
+def test_coordinator_reserve():
+    coordinator = ApplyCoordinator(max_applies_num=10, min_interval_sec=0)
+
+    assert coordinator.reserve("company", "python", once_at_company=True)
+    # другой браузер не откликается в ту же компанию, пока первый не закончил
+    assert not coordinator.reserve("company", "python", once_at_company=False)
+    assert not coordinator.reserve("company", "java", once_at_company=True)
+    assert coordinator.reserve("company", "java", once_at_company=False)
+
+    # отклик не удался - компания снова свободна
+    coordinator.unreserve("company", "python")
+    coordinator.unreserve("company", "java")
+    assert coordinator.reserve("company", "java", once_at_company=True)
+
+
+@patch("src.worker_pool.time.sleep")
+@patch("src.worker_pool.time.monotonic", return_value=100.0)
+def test_coordinator_wait_turn(mock_monotonic, mock_sleep):
+    coordinator = ApplyCoordinator(max_applies_num=10, min_interval_sec=10)
+
+    coordinator.wait_turn("login")
+    coordinator.wait_turn("login")
+    coordinator.wait_turn("other_login")
+    coordinator.wait_turn("login")
+
+    # отклики с одного аккаунта разнесены по времени, с разных аккаунтов - нет
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [10.0, 20.0]
+
+
+def make_job_manager():
+    job_manager = MagicMock(login="login", job_title="job", llm_prefetcher=None)
+    job_manager.vacancy_queue.release.return_value = 0
+    return job_manager
+
+
+def test_worker_pool_run():
+    job_manager = make_job_manager()
+    workers = [MagicMock(llm_prefetcher=None), MagicMock(llm_prefetcher=None)]
+    job_manager.create_worker.side_effect = workers
+    create_driver = Mock(side_effect=["driver_1", "driver_2"])
+    setup_worker = Mock()
+    pool = WorkerPool(3, create_driver, setup_worker, max_applies_num=10, min_interval_sec=0)
+
+    pool.run(job_manager)
+
+    create_driver.assert_any_call(1)
+    create_driver.assert_any_call(2)
+    job_manager.create_worker.assert_any_call("driver_1")
+    assert setup_worker.call_count == 2
+    # все браузеры используют одни и те же ограничения
+    coordinator = job_manager.set_apply_coordinator.call_args_list[0].args[0]
+    for worker_id, worker in enumerate([job_manager] + workers):
+        worker.apply_as_worker.assert_called_once_with(str(worker_id))
+    for worker in workers:
+        worker.set_apply_coordinator.assert_called_once_with(coordinator)
+        worker.driver.quit.assert_called_once()
+    job_manager.vacancy_queue.release.assert_called_once_with("login", "job")
+
+
+def test_worker_pool_driver_error():
+    job_manager = make_job_manager()
+    create_driver = Mock(side_effect=Exception("Browser init failed"))
+    pool = WorkerPool(2, create_driver, Mock(), max_applies_num=10, min_interval_sec=0)
+
+    pool.run(job_manager)
+
+    # если дополнительный браузер не запустился - откликаемся в основном браузере
+    job_manager.create_worker.assert_not_called()
+    job_manager.apply_as_worker.assert_called_once_with("0")